@@ -1,24 +1,136 @@
 from json import JSONDecodeError
-import json
+import bz2
+import contextlib
 import csv
+import gzip
 import io
+import shutil
+import tempfile
+import threading
+import time
 import zipfile
-from typing import Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Callable, Iterable, List, Optional, Union, Iterator, BinaryIO
 import requests
+from requests.adapters import HTTPAdapter
 import attr
 from typing_extensions import Literal
 from trapper_client import err
+from trapper_client.LazyLog import lazy, lazy_json, summary, payload_logger, dump_payloads_from_env
+from trapper_client.RateLimiter import RateLimiter, API
+from trapper_client.ResponseCache import ResponseCache, CacheSlot
+from trapper_client.RetryPolicy import RetryPolicy, RetryStats
+from trapper_client.Validation import FULL, check_mode
 import logging
 
 logger = logging.getLogger(__name__)
 
+CSV_START_CHARS = tuple("abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ")
+CSV_SNIFF_SIZE = 64
+ZIP_SPOOL_SIZE = 16 * 1024 * 1024
+
+
+def is_csv_response(content_type: str, body: Union[str, bytes]) -> bool:
+    """
+    Tell whether a successful response carries CSV data (plain or compressed).
+
+    Only the first bytes of ``body`` are inspected when the Content-Type does not
+    already say so, so the raw content can be passed without decoding it first.
+
+    :param content_type: Value of the Content-Type header
+    :type content_type: str
+    :param body: Response body, raw or decoded as text
+    :type body: str or bytes
+    :rtype: bool
+    """
+    if "text/csv" in content_type:
+        return True
+    head = body[:CSV_SNIFF_SIZE]
+    if isinstance(head, bytes):
+        head = head.decode("utf-8", errors="ignore")
+    return head.strip().startswith(CSV_START_CHARS)
+
+
+def decode_csv_text(content: bytes, content_type: str, text: str = None) -> str:
+    """
+    Return the CSV text of a response body, decompressing zip, gzip and bzip2 payloads.
+
+    :param content: Raw response body
+    :type content: bytes
+    :param content_type: Value of the Content-Type header
+    :type content_type: str
+    :param text: Response body already decoded as text, used when the payload is not compressed.
+        If omitted, ``content`` is decoded as UTF-8.
+    :type text: str, optional
+    :return: CSV text
+    :rtype: str
+    """
+    if content[:4] == b'PK\x03\x04' or "zip" in content_type:
+        with zipfile.ZipFile(io.BytesIO(content)) as zf:
+            csv_name = next((n for n in zf.namelist() if n.endswith(".csv")), None)
+            return zf.read(csv_name).decode("utf-8") if csv_name else ""
+    elif content[:2] == b'\x1f\x8b' or "gzip" in content_type:
+        return gzip.decompress(content).decode("utf-8")
+    elif content[:2] == b'BZ' or "bzip2" in content_type:
+        return bz2.decompress(content).decode("utf-8")
+    return text if text is not None else content.decode("utf-8-sig")
+
+
+def csv_rows(content: bytes, content_type: str) -> List[Dict[str, str]]:
+    """
+    Parse a (possibly compressed) CSV response body into a list of rows.
+    """
+    return list(csv.DictReader(io.StringIO(decode_csv_text(content, content_type))))
+
+
+def iter_csv_rows(raw: BinaryIO, content_type: str) -> Iterator[Dict[str, str]]:
+    """
+    Parse a (possibly compressed) CSV stream row by row, without reading it fully in memory.
+
+    gzip and bzip2 payloads are decompressed incrementally as they are read. Zip archives
+    need random access, so the stream is first spooled to a temporary file (kept in memory
+    up to :data:`ZIP_SPOOL_SIZE` bytes) and the CSV entry is then read incrementally.
+
+    :param raw: Binary stream with the response body, e.g. ``response.raw``
+    :type raw: BinaryIO
+    :param content_type: Value of the Content-Type header
+    :type content_type: str
+    :return: Generator of CSV rows
+    :rtype: Iterator[dict[str, str]]
+    """
+    stream = raw if hasattr(raw, "peek") else io.BufferedReader(raw)
+    magic = stream.peek(4)[:4]
+
+    with contextlib.ExitStack() as stack:
+        if magic == b'PK\x03\x04' or "zip" in content_type:
+            spool = stack.enter_context(tempfile.SpooledTemporaryFile(max_size=ZIP_SPOOL_SIZE))
+            shutil.copyfileobj(stream, spool)
+            spool.seek(0)
+            zf = stack.enter_context(zipfile.ZipFile(spool))
+            csv_name = next((n for n in zf.namelist() if n.endswith(".csv")), None)
+            if csv_name is None:
+                return
+            binary = stack.enter_context(zf.open(csv_name))
+        elif magic[:2] == b'\x1f\x8b' or "gzip" in content_type:
+            binary = stack.enter_context(gzip.GzipFile(fileobj=stream, mode="rb"))
+        elif magic[:2] == b'BZ' or "bzip2" in content_type:
+            binary = stack.enter_context(bz2.BZ2File(stream))
+        else:
+            binary = stream
+
+        text = io.TextIOWrapper(binary, encoding="utf-8-sig", newline="")
+        yield from csv.DictReader(text)
+
+
 @attr.s
-class APIClientBase:
+class APIClientCore:
     """
-    Base client for interacting with the Trapper API.
+    Configuration and transport-independent logic shared by the Trapper API clients.
 
-    Provides common functionality for authentication, sending HTTP requests,
-    handling pagination, and processing JSON or CSV responses.
+    Holds the settings, authentication, response cache lookup, page normalization and
+    error mapping used by :class:`APIClientBase` (``requests``) and
+    :class:`~trapper_client.AsyncAPIClientBase.AsyncAPIClientBase` (``httpx``). It sends
+    no request itself: each client implements its own I/O on top of it.
 
     :param access_token: Authentication token used for API requests (if available)
     :type access_token: str
@@ -30,16 +142,77 @@ class APIClientBase:
     :type verify_ssl: bool, optional
     :param base_url: Base URL of the Trapper API, defaults to "https://wildintel-trap.uhu.es"
     :type base_url: str, optional
+    :param pool_connections: Number of host connection pools kept by the HTTP session (synchronous client),
+        defaults to 10
+    :type pool_connections: int, optional
+    :param pool_maxsize: Maximum number of keep-alive connections kept per host, defaults to 10
+    :type pool_maxsize: int, optional
+    :param media_pool_maxsize: Maximum number of connections per host of the media download session (synchronous
+        client), defaults to 10. It grows to the number of download workers when a bulk download needs more
+    :type media_pool_maxsize: int, optional
+    :param page_workers: Maximum number of pages fetched concurrently by :meth:`get_all_pages`, defaults to 4.
+        Use 1 to fetch pages sequentially.
+    :type page_workers: int, optional
+    :param retry_policy: Policy used to retry transient failures (429/502/503/504 and connection errors),
+        defaults to :class:`RetryPolicy`. Use ``RetryPolicy(max_retries=0)`` to disable retries.
+    :type retry_policy: RetryPolicy, optional
+    :param rate_limiter: Token buckets shared by every component and thread using this client, with separate
+        budgets for API calls and media downloads, defaults to an unlimited :class:`RateLimiter`
+    :type rate_limiter: RateLimiter, optional
+    :param dump_payloads: Log every decoded response payload in full to the ``trapper_client.payloads`` logger
+        (DEBUG level), for troubleshooting. Defaults to the ``TRAPPER_DUMP_PAYLOADS`` environment variable
+    :type dump_payloads: bool, optional
+    :param validate: How components build schema instances from payloads: ``"full"`` Pydantic validation,
+        ``"light"`` coercion of scalars only or ``"none"`` (trusted server), defaults to ``"full"``
+    :type validate: str, optional
+    :param cache: Persistent cache of GET responses (see :class:`ResponseCache`), defaults to None (no cache)
+    :type cache: ResponseCache, optional
     """
     access_token: str = attr.ib(repr=False)
     user_name: str = attr.ib(repr=False)
     user_password: str = attr.ib(repr=False)
     verify_ssl: bool = attr.ib(repr=False, default=True)
     base_url: str = attr.ib(repr=False, default="https://wildintel-trap.uhu.es")
+    pool_connections: int = attr.ib(repr=False, default=10)
+    pool_maxsize: int = attr.ib(repr=False, default=10)
+    media_pool_maxsize: int = attr.ib(repr=False, default=10)
+    page_workers: int = attr.ib(repr=False, default=4)
+    retry_policy: RetryPolicy = attr.ib(repr=False, factory=RetryPolicy)
+    rate_limiter: RateLimiter = attr.ib(repr=False, factory=RateLimiter)
+    dump_payloads: bool = attr.ib(repr=False, factory=dump_payloads_from_env)
+    validate: str = attr.ib(repr=False, default=FULL, validator=lambda _, __, value: check_mode(value))
+    cache: ResponseCache = attr.ib(repr=False, default=None)
+
+    retry_stats: RetryStats = attr.ib(init=False, repr=False, factory=RetryStats)
+    _shared: Dict[str, Any] = attr.ib(init=False, repr=False, factory=dict)
+    _shared_lock: threading.Lock = attr.ib(init=False, repr=False, factory=threading.Lock)
 
     name = "trapper_api_client"
     user_id: str = "me"
 
+    def shared(self, key: str, factory: Callable[[], Any]) -> Any:
+        """
+        Return the object registered under ``key``, creating it with ``factory`` on first use.
+
+        Components are lightweight and often created on the fly, so state that must outlive
+        them (e.g. the :class:`CollectionIndex`) is registered here and shared by every
+        component and thread using this client.
+
+        :param key: Registry key
+        :type key: str
+        :param factory: Function creating the object
+        :type factory: Callable[[], Any]
+        :return: The shared object
+        :rtype: Any
+        """
+        obj = self._shared.get(key)
+        if obj is None:
+            with self._shared_lock:
+                obj = self._shared.get(key)
+                if obj is None:
+                    obj = self._shared[key] = factory()
+        return obj
+
     def _paginate(self, items, page: int, per_page: int = 10):
         """
         Return a specific page of results from a list.
@@ -77,6 +250,321 @@ class APIClientBase:
         else:
             raise ValueError("No se ha configurado ni token ni usuario/clave")
 
+    @staticmethod
+    def _raise_api_error(status_code: int, message: Any):
+        """
+        Raise the exception mapped to an HTTP status code.
+
+        :param status_code: HTTP status code of the failed response
+        :type status_code: int
+        :param message: Error message extracted from the response body
+        :type message: Any
+        :raises err.APIError: For general API errors
+        :raises err.HTTP_ERRORS_MAP: For specific HTTP error codes mapped to exceptions
+        """
+        if status_code in err.HTTP_ERRORS_MAP:
+            raise err.HTTP_ERRORS_MAP[status_code](message)
+        else:
+            raise err.APIError(message)
+
+    @staticmethod
+    def _check_method(method: str) -> None:
+        """
+        :raises ValueError: If ``method`` is not an HTTP method supported by the API
+        """
+        allowed_methods = "GET POST PATCH DELETE PUT".split()
+        if method not in allowed_methods:
+            raise ValueError(
+                f'Invalid method: {method}. Must be one of {", ".join(allowed_methods)}'
+            )
+
+    def _normalize(self, r, method: str, endpoint: str, url: str, query: Dict, only_json: bool) -> None:
+        """
+        Normalize the body of a successful response into a page (see :meth:`_attach_page`).
+
+        JSON payloads are always normalized and CSV ones when ``only_json`` is True. After a
+        write, the cached pages of the written resource are invalidated.
+        """
+        content_type = r.headers.get("Content-Type", "")
+        if "application/json" in content_type:
+            data = r.json()
+            logger.debug("Response JSON: %s", summary(data))
+            self._dump_payload(method, url, query, data)
+            self._attach_page(r, self._as_page(data))
+        elif only_json and is_csv_response(content_type, r.content):
+            rows = csv_rows(r.content, content_type)
+            logger.debug("Response CSV: %s", summary(rows))
+            self._dump_payload(method, url, query, rows)
+            self._attach_page(r, self._as_page(rows))
+        if method != "GET" and self.cache is not None:
+            self.cache.invalidate_resource(endpoint)
+
+    @staticmethod
+    def _error_message(r) -> (Any, Any):
+        """
+        Return the body of a failed response and the error message it carries.
+        """
+        try:
+            body = r.json()
+            try:
+                message = body["_error"]["message"]
+            except (KeyError, TypeError):
+                message = body
+        except JSONDecodeError:
+            body = r.text
+            message = body
+        return body, message
+
+    @staticmethod
+    def _merge_pages(first: Dict, next_pages: Iterable[Dict]) -> Dict:
+        """
+        Merge the pages of a listing, in order, into the first one.
+
+        List values (``results``) are concatenated and the pagination of the last page is kept.
+        """
+        pagination = first.get("pagination", {"page": 1, "pages": 1})
+        results = {k: (v[:] if isinstance(v, list) else v) for k, v in first.items()}
+        for next_page in next_pages:
+            for k, v in next_page.items():
+                if isinstance(v, list) and k in results:
+                    results[k].extend(v)
+                elif k not in results:
+                    results[k] = v
+
+            pagination = next_page.get("pagination", pagination)
+
+        results["pagination"] = pagination
+        return results
+
+    def _url(self, endpoint: str) -> str:
+        return self.base_url.rstrip("/") + "/" + endpoint.lstrip("/")
+
+    def _cache_slot(self, endpoint: str, query: Dict = None, use_cache: bool = True) -> Optional[CacheSlot]:
+        """
+        Return the cache state of a GET request, or None if it is not cached.
+
+        Cached pages belong to the configured token or user name, never shared between accounts.
+        """
+        if self.cache is None or not use_cache:
+            return None
+        return self.cache.slot(self.access_token or self.user_name or "", self._url(endpoint), endpoint, query)
+
+    def _dump_payload(self, method: str, url: str, query: Dict, payload: Any) -> None:
+        """
+        Log a full response payload when :attr:`dump_payloads` is enabled.
+        """
+        if self.dump_payloads:
+            payload_logger.debug("%s %s %s -> %s", method, url, lazy(query), lazy_json(payload, None, 4))
+
+    @staticmethod
+    def _attach_page(r, page: Dict) -> None:
+        """
+        Make ``r.json()`` return the already normalized page.
+
+        The page is built once from the decoded payload and handed out as is: the
+        response body is not re-encoded and later calls do not parse it again.
+        """
+        r.json = lambda **kwargs: page
+
+    @staticmethod
+    def _as_page(data: Any) -> Dict:
+        """
+        Wrap a non paginated payload into the ``{"pagination": ..., "results": ...}`` structure.
+
+        Payloads that already contain 'pagination' and 'results' are returned unchanged.
+
+        :param data: Decoded JSON payload or list of CSV rows
+        :type data: Any
+        :return: Paginated payload with a single page
+        :rtype: dict
+        """
+        if isinstance(data, dict) and "pagination" in data and "results" in data:
+            return data
+
+        paged_rows = data if isinstance(data, list) else [data]
+        return {
+            "pagination": {
+                "page": 1,
+                "page_size": len(paged_rows),
+                "pages": 1,
+                "count": len(paged_rows),
+            },
+            "results": paged_rows,
+        }
+
+
+@attr.s
+class APIClientBase(APIClientCore):
+    """
+    Base client for interacting with the Trapper API.
+
+    Provides common functionality for authentication, sending HTTP requests,
+    handling pagination, and processing JSON or CSV responses. Requests are sent with
+    ``requests`` through pooled keep-alive sessions; see :class:`APIClientCore` for the
+    parameters.
+    """
+    _session: requests.Session = attr.ib(init=False, repr=False, default=None)
+    _session_lock: threading.Lock = attr.ib(init=False, repr=False, factory=threading.Lock)
+    _media_session: requests.Session = attr.ib(init=False, repr=False, default=None)
+    _media_pool_size: int = attr.ib(init=False, repr=False, default=0)
+
+    @property
+    def session(self) -> requests.Session:
+        """
+        Return the HTTP session shared by every request made through this client.
+
+        The session is created lazily and keeps a pool of keep-alive connections per host,
+        so consecutive requests (e.g. the pages of :meth:`get_all_pages`) reuse the same
+        TCP/TLS connection instead of opening a new one each time.
+
+        :return: The client-owned session
+        :rtype: requests.Session
+        """
+        if self._session is None:
+            with self._session_lock:
+                if self._session is None:
+                    self._session = self._create_session(self.pool_connections, self.pool_maxsize)
+        return self._session
+
+    @property
+    def media_session(self) -> requests.Session:
+        """
+        Return the HTTP session used to download media files and packages.
+
+        It is kept apart from :attr:`session`: it sends no credentials (media files are
+        public URLs, possibly on another host) and its pool blocks instead of opening more
+        than ``media_pool_maxsize`` connections per host, so bulk downloads reuse keep-alive
+        connections instead of opening one per file.
+
+        :return: The client-owned media session
+        :rtype: requests.Session
+        """
+        return self.media_session_for()
+
+    def media_session_for(self, workers: int = None) -> requests.Session:
+        """
+        Return the media session, growing its pool so ``workers`` threads can download at once.
+
+        :param workers: Number of concurrent downloads
+        :type workers: int, optional
+        :return: The client-owned media session
+        :rtype: requests.Session
+        """
+        size = max(self.media_pool_maxsize, workers or 0)
+        if self._media_session is not None and size <= self._media_pool_size:
+            return self._media_session
+        with self._session_lock:
+            if self._media_session is None:
+                self._media_session = self._create_session(self.pool_connections, size, pool_block=True)
+                self._media_pool_size = size
+            elif size > self._media_pool_size:
+                logger.debug("Growing media connection pool to %d per host", size)
+                self._mount_pool(self._media_session, self.pool_connections, size, pool_block=True)
+                self._media_pool_size = size
+        return self._media_session
+
+    @staticmethod
+    def _create_session(pool_connections: int, pool_maxsize: int, pool_block: bool = False) -> requests.Session:
+        """
+        Build a :class:`requests.Session` with a pooled adapter mounted for http and https.
+
+        :param pool_connections: Number of host connection pools to cache
+        :type pool_connections: int
+        :param pool_maxsize: Maximum number of connections kept per host
+        :type pool_maxsize: int
+        :param pool_block: Wait for a free connection instead of opening more than ``pool_maxsize`` per host
+        :type pool_block: bool
+        :return: A new session
+        :rtype: requests.Session
+        """
+        session = requests.Session()
+        APIClientBase._mount_pool(session, pool_connections, pool_maxsize, pool_block)
+        session.headers["Connection"] = "keep-alive"
+        return session
+
+    @staticmethod
+    def _mount_pool(session: requests.Session, pool_connections: int, pool_maxsize: int,
+                    pool_block: bool = False) -> None:
+        replaced = {id(a): a for prefix, a in session.adapters.items() if prefix in ("https://", "http://")}
+        adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize, pool_block=pool_block)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        # Cierra las conexiones del pool sustituido; las que estén en uso se cierran al liberarse
+        for old in replaced.values():
+            old.close()
+
+    def close(self) -> None:
+        """
+        Close the HTTP sessions (API and media) and release their pooled connections.
+
+        The client can still be used afterwards; a new session is created on the next request.
+        The response cache database, if any, is closed too and reopened when needed.
+        """
+        with self._session_lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+            if self._media_session is not None:
+                self._media_session.close()
+                self._media_session = None
+                self._media_pool_size = 0
+        if self.cache is not None:
+            self.cache.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+    def _send(self, method: str, url: str, kind: str = API, **kwargs) -> requests.Response:
+        """
+        Send a request through the pooled session, retrying transient failures.
+
+        Every attempt first takes a token from the :attr:`rate_limiter` bucket of the given
+        kind of traffic. Retries are driven by :attr:`retry_policy`. The number of retries performed is
+        stored in the ``retries`` attribute of the returned response and accumulated in
+        :attr:`retry_stats`.
+
+        :param method: HTTP method
+        :type method: str
+        :param url: Absolute URL
+        :type url: str
+        :param kind: Kind of traffic used for rate limiting, ``"api"`` or ``"media"``, defaults to ``"api"``
+        :type kind: str, optional
+        :param kwargs: Extra arguments for :meth:`requests.Session.request`
+        :return: The last response received
+        :rtype: requests.Response
+        :raises requests.RequestException: If the last attempt fails with a connection error
+        """
+        reasons = []
+
+        while True:
+            self.rate_limiter.acquire(url, kind)
+            try:
+                r = self.session.request(method, url, **kwargs)
+            except Exception as e:
+                delay = self.retry_policy.next_delay(method, len(reasons) + 1, exception=e)
+                if delay is None:
+                    self.retry_stats.record(len(reasons), tuple(reasons))
+                    raise
+                reason = type(e).__name__
+            else:
+                delay = self.retry_policy.next_delay(
+                    method, len(reasons) + 1, status_code=r.status_code, retry_after=r.headers.get("Retry-After")
+                )
+                if delay is None:
+                    r.retries = len(reasons)
+                    self.retry_stats.record(len(reasons), tuple(reasons))
+                    return r
+                reason = str(r.status_code)
+                r.close()
+
+            reasons.append(reason)
+            logger.warning(f"{method} {url} failed ({reason}), retry {len(reasons)} in {delay:.2f}s")
+            time.sleep(delay)
+
     def make_request(
         self,
         endpoint: str,
@@ -85,6 +573,8 @@ class APIClientBase:
         body: Dict = None,
         raise_on_error=True,
         only_json: bool = True,
+        stream: bool = False,
+        headers: Dict[str, str] = None,
     ) -> requests.Response:
         """
         Make an HTTP request to the API with authentication and error handling.
@@ -104,6 +594,11 @@ class APIClientBase:
         :return: HTTP response object
         :param only_json: convert CSV responses to JSON format, defaults to True
         :type only_json: bool, optional
+        :param stream: Leave the body of successful responses unread, to be consumed from ``response.raw``.
+            No normalization is done and the caller must close the response, defaults to False
+        :type stream: bool, optional
+        :param headers: Extra request headers, e.g. conditional headers. A 304 response is returned as is
+        :type headers: dict[str, str], optional
 
         :rtype: requests.Response
         :raises ValueError: If an invalid HTTP method is provided
@@ -111,160 +606,108 @@ class APIClientBase:
         :raises err.HTTP_ERRORS_MAP: For specific HTTP error codes mapped to exceptions
         """
 
-        allowed_methods = "GET POST PATCH DELETE PUT".split()
-        if method not in allowed_methods:
-            raise ValueError(
-                f'Invalid method: {method}. Must be one of {", ".join(allowed_methods)}'
-            )
-
-        headers, auth = self._auth()
-        url = self.base_url.rstrip("/") + "/" + endpoint.lstrip("/")
-        logger.debug(f"Making {method} request to {endpoint}")
-        logger.debug("Query: " +   "&".join([f"{k}={v}" for k,v in query.items()]) if query else "None")
-        session = requests.Session()
+        self._check_method(method)
 
-        logger.debug(f"Request headers: {headers}")
-        logger.debug(f"Request auth: {auth}")
+        auth_headers, auth = self._auth()
+        headers = {**auth_headers, **headers} if headers else auth_headers
+        url = self._url(endpoint)
+        logger.debug("Making %s request to %s", method, endpoint)
+        logger.debug("Query: %s", lazy(query))
+        logger.debug("Request headers: %s", lazy(sorted(headers)))
+        logger.debug("Request auth: %s", "basic" if auth else "token")
 
-        r = session.request(method, url, headers=headers, auth=auth,params=query, json=body, verify=self.verify_ssl)
+        r = self._send(method, url, headers=headers, auth=auth, params=query, json=body, verify=self.verify_ssl,
+                       stream=stream)
 
         if 200 <= r.status_code < 300:
-            content_type = r.headers.get("Content-Type", "")
-            if "application/json" in content_type:
-                data = r.json()
-                logger.debug(f"Response JSON:  {json.dumps(data,indent=4)}")
-
-                if "pagination" not in data or "results" not in data:
-                    logger.debug(f"Add pagination to response")
-
-                    page = 1
-                    per_page = len(data) if isinstance(data, list) else 1
-                    pages = 1
-                    total = len(data) if isinstance(data, list) else 1
-                    paged_rows = data if isinstance(data, list) else [data]
-
-                    response_obj = {
-                        "pagination": {
-                            "page": page,
-                            "page_size": per_page,
-                            "pages": pages,
-                            "count": total,
-                        },
-                        "results": paged_rows,
-                    }
-
-                    r._content = json.dumps(response_obj).encode("utf-8")
-                    r.headers["Content-Type"] = "application/json"
-                    r.json = lambda: response_obj
-
-                return r
-            elif "text/csv" in content_type or r.text.strip().startswith(
-                    tuple("abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ")):
-
-                if only_json:
-                    if r.content[:4] == b'PK\x03\x04' or "zip" in content_type:
-                        with zipfile.ZipFile(io.BytesIO(r.content)) as zf:
-                            csv_name = next((n for n in zf.namelist() if n.endswith(".csv")), None)
-                            csv_text = zf.read(csv_name).decode("utf-8") if csv_name else ""
-                    elif r.content[:2] == b'\x1f\x8b' or "gzip" in content_type:
-                        import gzip
-                        csv_text = gzip.decompress(r.content).decode("utf-8")
-                    elif r.content[:2] == b'BZ' or "bzip2" in content_type:
-                        import bz2
-                        csv_text = bz2.decompress(r.content).decode("utf-8")
-                    else:
-                        csv_text = r.text
-
-                    reader = csv.DictReader(io.StringIO(csv_text))
-                    rows = list(reader)
-                    logger.debug(f"Response CSV: {rows[1]}...")
-                    total = len(rows)
-
-                    response_obj = {
-                        "pagination": {
-                            "page": 1,
-                            "page_size": total,
-                            "pages": 1,
-                            "count": total,
-                        },
-                        "results": rows,
-                    }
-
-                    r._content = json.dumps(response_obj).encode("utf-8")
-                    r.headers["Content-Type"] = "application/json"
-                    r.json = lambda: response_obj
-                    logger.debug(f"Results from csv {response_obj}")
-                    return r
-                return r
-            else:
-                return r
-        try:
-            body = r.json()
-            try:
-                message = body["_error"]["message"]
-            except (KeyError, TypeError):
-                message = body
-        except JSONDecodeError:
-            body = r.text
-            message = body
+            if not stream:
+                self._normalize(r, method, endpoint, url, query, only_json)
+            return r
+
+        if r.status_code == 304:
+            logger.debug("Not modified: %s", endpoint)
+            return r
 
-        logger.error(f"Unsuccessful request to {r.url}: [{r.status_code}] {message}")
-        logger.debug(f"Full response: {body}")
-        logger.debug(f"Headers: {r.headers}")
-        logger.debug(f"Params: {query}")
-        logger.debug(f"Body: {body}")
+        body, message = self._error_message(r)
+        logger.error("Unsuccessful request to %s: [%s] %s", r.url, r.status_code, lazy(message))
+        logger.debug("Full response: %s", lazy(body))
+        logger.debug("Headers: %s", lazy(r.headers))
+        logger.debug("Params: %s", lazy(query))
+        self._dump_payload(method, url, query, body)
         if not raise_on_error:
             logger.warning(
                 f"raise_on_error is False, ignoring API error and returning response"
             )
             return r
 
-        if r.status_code in err.HTTP_ERRORS_MAP:
-            raise err.HTTP_ERRORS_MAP[r.status_code](message)
-        else:
-            raise err.APIError(message)
+        self._raise_api_error(r.status_code, message)
+
+    def stream_csv(self, endpoint: str, query: Dict = None) -> Iterator[Dict[str, str]]:
+        """
+        Stream the rows of a CSV endpoint (plain, zip, gzip or bzip2) as they arrive.
+
+        Memory use does not depend on the size of the export. The request is sent when the
+        first row is requested and the connection is released once the generator is
+        exhausted or closed.
+
+        :param endpoint: API endpoint
+        :type endpoint: str
+        :param query: Dictionary of query parameters
+        :type query: dict, optional
+        :return: Generator of CSV rows
+        :rtype: Iterator[dict[str, str]]
+        """
+        r = self.make_request(endpoint, method="GET", query=query, raise_on_error=True, only_json=False, stream=True)
+        with contextlib.closing(r):
+            content_type = r.headers.get("Content-Type", "")
+            r.raw.decode_content = True
+            yield from iter_csv_rows(r.raw, content_type)
 
     def get(
-        self, endpoint: str, query: Dict = None, raise_on_error: bool = True
+        self, endpoint: str, query: Dict = None, raise_on_error: bool = True, use_cache: bool = True
     ) -> Dict:
         """
         Send a GET request to the API.
 
+        When a :attr:`cache` is configured and the endpoint has a TTL, fresh cached pages are
+        returned without contacting the server and expired ones are revalidated.
+
         :param endpoint: API endpoint
         :type endpoint: str
         :param query: Dictionary of query parameters
         :type query: dict, optional
         :param raise_on_error: Whether to raise an exception for non-2xx responses, defaults to True
         :type raise_on_error: bool, optional
+        :param use_cache: Use the response cache, if configured, defaults to True
+        :type use_cache: bool, optional
         :return: HTTP response
         :rtype: requests.Response
         """
-
-        r = self.make_request(endpoint, method="GET", query=query, raise_on_error=raise_on_error)
-        data = r.json()
-
-        # Normalizar si no hay paginación
-        if "pagination" not in data or "results" not in data:
-            paged_rows = data if isinstance(data, list) else [data]
-            data = {
-                "pagination": {
-                    "page": 1,
-                    "page_size": len(paged_rows),
-                    "pages": 1,
-                    "count": len(paged_rows),
-                },
-                "results": paged_rows,
-            }
-
-        return data
+        slot = self._cache_slot(endpoint, query, use_cache)
+        if slot is not None and slot.fresh:
+            return slot.page
+
+        r = self.make_request(endpoint, method="GET", query=query, raise_on_error=raise_on_error,
+                              headers=slot.conditional_headers() if slot is not None else None)
+        if r.status_code == 304 and slot is not None and slot.page is not None:
+            return slot.revalidated()
+        if 200 <= r.status_code < 300:
+            # make_request already normalized the page
+            page = r.json()
+            if slot is not None:
+                slot.store(page, r.headers)
+            return page
+        return self._as_page(r.json())
 
     def get_all_pages(
-            self, endpoint: str, query: Dict = None, raise_on_error: bool = True
+            self, endpoint: str, query: Dict = None, raise_on_error: bool = True, max_workers: int = None
     ) -> Dict:
         """
         Retrieve all paginated results from an endpoint.
 
-        Always returns a dictionary with 'pagination' and 'results'.
+        Always returns a dictionary with 'pagination' and 'results'. The first page is fetched
+        to learn the number of pages; the remaining pages are then fetched concurrently by a
+        bounded pool of workers and reassembled in page order.
 
         :param endpoint: API endpoint
         :type endpoint: str
@@ -272,6 +715,9 @@ class APIClientBase:
         :type query: dict, optional
         :param raise_on_error: Whether to raise exceptions for non-2xx responses, defaults to True
         :type raise_on_error: bool, optional
+        :param max_workers: Maximum number of pages fetched at the same time, defaults to ``page_workers``.
+            Use 1 to fetch pages sequentially.
+        :type max_workers: int, optional
         :return: Dictionary with combined 'results' and updated 'pagination'
         :rtype: dict
         """
@@ -284,24 +730,23 @@ class APIClientBase:
         page = pagination.get("page", 1)
         pages = pagination.get("pages", 1)
 
-        results = {k: (v[:] if isinstance(v, list) else v) for k, v in data.items()}
+        def fetch_page(n: int) -> Dict:
+            page_query = query.copy()
+            page_query["page"] = n
+            return self.get(endpoint, query=page_query, raise_on_error=raise_on_error)
 
         # Obtener siguientes páginas
-        while page < pages:
-            page += 1
-            query["page"] = page
-            next_page = self.get(endpoint, query=query, raise_on_error=raise_on_error)
+        remaining = range(page + 1, pages + 1)
+        workers = min(max_workers or self.page_workers or 1, len(remaining))
 
-            for k, v in next_page.items():
-                if isinstance(v, list) and k in results:
-                    results[k].extend(v)
-                elif k not in results:
-                    results[k] = v
-
-            pagination = next_page.get("pagination", pagination)
+        if workers > 1:
+            logger.debug("Fetching %d pages of %s with %d workers", len(remaining), endpoint, workers)
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                next_pages = list(executor.map(fetch_page, remaining))
+        else:
+            next_pages = map(fetch_page, remaining)
 
-        results["pagination"] = pagination
-        return results
+        return self._merge_pages(data, next_pages)
 
     def post(
         self,
@@ -1,18 +1,91 @@
 import logging
+import queue
 import re
+import threading
+import traceback
+import weakref
 from typing import Dict, Any, Type, Callable, Iterator
 from pydantic import BaseModel
 
+from trapper_client.LazyLog import Sampler
+from trapper_client.Validation import FULL, check_mode, results_builder
+
 logger = logging.getLogger(__name__)
 
+PREFETCH_POLL_INTERVAL = 0.1
+PREFETCH_JOIN_TIMEOUT = 5.0
+_END = object()
+
+
+def _put(q: queue.Queue, stop: threading.Event, item) -> bool:
+    """
+    Hand an item to the consumer, waiting for room in the queue unless the cursor is closed.
+    """
+    while not stop.is_set():
+        try:
+            q.put(item, timeout=PREFETCH_POLL_INTERVAL)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def _prefetch_pages(cursor_ref: "weakref.ref[APIQuery]", stop: threading.Event, q: queue.Queue,
+                    page: int, pages: int):
+    """
+    Background loop fetching the pages after ``page`` until the last one or until stopped.
+
+    The thread only holds a weak reference to the cursor while it waits for room in the
+    queue, so an abandoned cursor is collected and its finalizer sets ``stop``.
+    """
+    try:
+        while page < pages and not stop.is_set():
+            cursor = cursor_ref()
+            if cursor is None:
+                return
+            response = cursor._fetch_page(page + 1)
+            cursor = None
+            if not _put(q, stop, response) or len(response["results"]) == 0:
+                return
+            page = int(response["pagination"].get("page", -1))
+            pages = int(response["pagination"].get("pages", 1))
+        _put(q, stop, _END)
+    except Exception as e:
+        # Los frames del traceback retendrían el cursor
+        cursor = None
+        traceback.clear_frames(e.__traceback__)
+        _put(q, stop, e)
+
+
 class APIQuery:
+    """
+    Cursor over the results of an endpoint, loaded page by page.
+
+    With ``prefetch`` > 0 a background thread requests the upcoming pages (and validates
+    them) while the caller processes the current one. At most ``prefetch`` pages are kept
+    ahead of the caller; :meth:`close` (or leaving the ``with`` block) stops the thread, and
+    so does dropping the last reference to an unfinished cursor.
+
+    ``validate`` selects how items are built from the payload (``"full"``, ``"light"`` or
+    ``"none"``, see :mod:`trapper_client.Validation`).
+
+    Examples
+    --------
+    with client.media.where(cp=33, prefetch=2) as q:
+        for media in q:
+            print(media.mediaID)
+    """
+
     def __init__(self, client, endpoint, query=None, schema=None
-                 ,filter_fn: Callable[[BaseModel], bool] = None, page_size: int = 50):
+                 ,filter_fn: Callable[[BaseModel], bool] = None, page_size: int = 50, prefetch: int = 0,
+                 validate: str = FULL):
         self.client = client
         self.endpoint = endpoint
         self.query = {} if query is None else query.copy()
         self.schema = schema
         self.filter_fn = filter_fn
+        self.prefetch = prefetch
+        self.validate = check_mode(validate)
 
         self._page_size = page_size
         self._page =-1
@@ -21,68 +94,92 @@ class APIQuery:
         self._last_results = []
         self._last_index=0
         self.exhausted = self._exhausted = False
+        self._log_sampler = Sampler()
+
+        self._queue: queue.Queue | None = None
+        self._worker: threading.Thread | None = None
+        self._stop = threading.Event()
 
     def __iter__(self):
         return self
 
-    def __next__(self):
-
-        if self._last_index >= len(self._last_results) and self._page < self._pages:
-            # cargar página desde la API
-            page_query = self.query.copy()
-            page_query["page"] = self._page+1
-            page_query["page_size"] = self._page_size
+    def _fetch_page(self, page: int) -> Dict[str, Any]:
+        """
+        Request one page and validate its results.
+        """
+        page_query = self.query.copy()
+        page_query["page"] = page
+        page_query["page_size"] = self._page_size
+
+        # Resolver placeholders en el endpoint usando valores de la query
+        endpoint_resolved = self.endpoint
+        for key in re.findall(r"\{([^}]+)\}", self.endpoint):
+            if key in page_query:
+                endpoint_resolved = endpoint_resolved.replace("{" + key + "}", str(page_query.pop(key)))
+
+        logger.debug("Cargando página %s del endpoint %s", page_query["page"], endpoint_resolved)
+        response = self.client.get(endpoint_resolved, page_query, raise_on_error=True)
+
+        results = response.get("results", [])
+        if self.schema and results:
+            # Validar la página completa de una vez
+            results = results_builder(self.schema, self.validate)(results)
+
+        return {"pagination": response.get("pagination", {"page": -1, "pages": 1}), "results": results}
+
+    def _next_page(self) -> Dict[str, Any]:
+        if self.prefetch <= 0:
+            return self._fetch_page(self._page + 1)
+
+        if self._worker is None:
+            self._queue = queue.Queue(maxsize=self.prefetch)
+            self._worker = threading.Thread(
+                target=_prefetch_pages, args=(weakref.ref(self), self._stop, self._queue, self._page, self._pages),
+                name="APIQuery-prefetch", daemon=True,
+            )
+            weakref.finalize(self, self._stop.set)
+            self._worker.start()
+
+        item = self._queue.get()
+        if item is _END:
+            return {"pagination": {"page": self._pages, "pages": self._pages}, "results": []}
+        if isinstance(item, BaseException):
+            raise item
+        return item
 
-            # Resolver placeholders en el endpoint usando valores de la query
-            endpoint_resolved = self.endpoint
-            for key in re.findall(r"\{([^}]+)\}", self.endpoint):
-                if key in page_query:
-                    endpoint_resolved = endpoint_resolved.replace("{" + key + "}", str(page_query.pop(key)))
+    def __next__(self):
+        while True:
+            if self._exhausted:
+                raise StopIteration
 
-            logger.debug(f"Cargando página {page_query["page"]} del endpoint {endpoint_resolved}")
-            response = self.client.get(endpoint_resolved, page_query, raise_on_error=True)
+            if self._last_index >= len(self._last_results) and self._page < self._pages:
+                # cargar página desde la API
+                response = self._next_page()
+                self._last_results = response["results"]
 
-            self._last_results = response.get("results", [])
+                if len(self._last_results) == 0:
+                    self._exhausted = True
+                    raise StopIteration
 
-            if len(self._last_results) == 0:
+                pagination = response["pagination"]
+                self._page = int(pagination.get("page", -1))
+                self._pages = int(pagination.get("pages", 1))
+                self._last_index=0
+            elif self._last_index >= len(self._last_results) and self._page >= self._pages:
                 self._exhausted = True
                 raise StopIteration
 
-            pagination = response.get("pagination", {"page": -1, "pages": 1})
-            self._page = int(pagination.get("page", -1))
-            self._pages = int(pagination.get("pages", 1))
-            self._last_index=0
-        elif self._last_index >= len(self._last_results) and self._page >= self._pages:
-            self._exhausted = True
-            raise StopIteration
-
-        logger.debug(f"Devolviendo el elemento {self._last_index} de la página {self._page} que tiene {len(self._last_results)} elementos")
-
-        # Tomar el siguiente item
-        raw_item = self._last_results[self._last_index]
-        self._last_index += 1
-
-        # Convertir a objeto concreto del schema
-        data = {
-            "pagination": {
-                "page": 1,
-                "page_size": 10,
-                "pages": 1,
-                "count": 1,
-            },
-            "results": [raw_item],
-        }
-
-        item_obj = self.schema(**data).results[0] if self.schema else raw_item
-
-        # Aplicar filtro local si existe
-        if self.filter_fn:
-            if self.filter_fn(item_obj):
+            if logger.isEnabledFor(logging.DEBUG) and self._log_sampler():
+                logger.debug("Devolviendo el elemento %d de la página %d que tiene %d elementos",
+                             self._last_index, self._page, len(self._last_results))
+
+            # Tomar el siguiente item
+            item_obj = self._last_results[self._last_index]
+            self._last_index += 1
+
+            # Aplicar filtro local si existe (los elementos filtrados se saltan)
+            if self.filter_fn is None or self.filter_fn(item_obj):
                 return item_obj
-            else:
-                return self.__next__()  # Saltar item filtrado
-        else:
-            return item_obj
 
     def close(self):
         # limpieza sencilla: marcar agotado y vaciar buffers
@@ -92,6 +189,17 @@ class APIQuery:
         self._pages = 0
         self._page = -1
 
+        # detener la precarga: el hilo termina en cuanto acaba la petición en curso
+        self._stop.set()
+        if self._worker is not None:
+            while True:
+                try:
+                    self._queue.get_nowait()
+                except queue.Empty:
+                    break
+            self._worker.join(timeout=PREFETCH_JOIN_TIMEOUT)
+            self._worker = None
+
     def __enter__(self):
         # Permite "with APIQuery(...)" y devuelve el propio iterable
         return self
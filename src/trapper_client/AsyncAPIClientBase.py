@@ -0,0 +1,325 @@
+import asyncio
+import tempfile
+from typing import Dict, Any, AsyncIterator
+
+import attr
+from typing_extensions import Literal
+
+from trapper_client.APIClientBase import APIClientCore, ZIP_SPOOL_SIZE, iter_csv_rows
+from trapper_client.LazyLog import lazy
+from trapper_client.RateLimiter import API
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def _import_httpx():
+    try:
+        import httpx
+    except ImportError as e:
+        raise ImportError(
+            "The asynchronous client requires 'httpx'. Install it with: pip install 'trapper-client[async]'"
+        ) from e
+    return httpx
+
+
+def _as_params(query: Dict[str, Any] | None) -> Dict[str, Any] | None:
+    """
+    Encode query parameters the way ``requests`` does: drop ``None`` and keep ``str(bool)``.
+    """
+    if not query:
+        return query
+    return {k: (str(v) if isinstance(v, bool) else v) for k, v in query.items() if v is not None}
+
+
+@attr.s
+class AsyncAPIClientBase(APIClientCore):
+    """
+    Asynchronous counterpart of :class:`APIClientBase` built on ``httpx.AsyncClient``.
+
+    Both clients derive from :class:`APIClientCore`, so they share the configuration,
+    authentication, response cache and response normalization, but this one has no
+    synchronous I/O: every request method is a coroutine. The underlying
+    ``httpx.AsyncClient`` keeps a pool of keep-alive connections sized with
+    ``pool_maxsize`` and must be released with :meth:`aclose` (or ``async with``).
+    ``pool_connections`` and ``media_pool_maxsize`` are not used.
+    """
+
+    _async_session = attr.ib(init=False, repr=False, default=None)
+
+    @property
+    def async_session(self):
+        """
+        Return the ``httpx.AsyncClient`` shared by every request made through this client.
+
+        :return: The client-owned asynchronous HTTP client
+        :rtype: httpx.AsyncClient
+        """
+        if self._async_session is None or self._async_session.is_closed:
+            httpx = _import_httpx()
+            limits = httpx.Limits(max_connections=self.pool_maxsize, max_keepalive_connections=self.pool_maxsize)
+            self._async_session = httpx.AsyncClient(limits=limits, verify=self.verify_ssl, timeout=60)
+        return self._async_session
+
+    async def aclose(self) -> None:
+        """
+        Close the asynchronous HTTP client and release its pooled connections.
+
+        The client can still be used afterwards; a new HTTP client is created on the next request.
+        The response cache database, if any, is closed too and reopened when needed.
+        """
+        if self._async_session is not None:
+            await self._async_session.aclose()
+            self._async_session = None
+        if self.cache is not None:
+            self.cache.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.aclose()
+        return False
+
+    async def throttle(self, url: str, kind: str = API) -> None:
+        """
+        Wait, without blocking the event loop, until the rate limiter allows a request to ``url``.
+        """
+        delay = self.rate_limiter.reserve(url, kind)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    async def _asend(self, method: str, url: str, kind: str = API, stream: bool = False, auth=None, **kwargs):
+        """
+        Send a request through the pooled asynchronous client, retrying transient failures.
+
+        Counterpart of :meth:`APIClientBase._send`, waiting with :func:`asyncio.sleep`.
+        With ``stream`` the body is left unread and the caller must close the response.
+        """
+        reasons = []
+
+        while True:
+            await self.throttle(url, kind)
+            try:
+                request = self.async_session.build_request(method, url, **kwargs)
+                r = await self.async_session.send(request, auth=auth, stream=stream)
+            except Exception as e:
+                delay = self.retry_policy.next_delay(method, len(reasons) + 1, exception=e)
+                if delay is None:
+                    self.retry_stats.record(len(reasons), tuple(reasons))
+                    raise
+                reason = type(e).__name__
+            else:
+                delay = self.retry_policy.next_delay(
+                    method, len(reasons) + 1, status_code=r.status_code, retry_after=r.headers.get("Retry-After")
+                )
+                if delay is None:
+                    r.retries = len(reasons)
+                    self.retry_stats.record(len(reasons), tuple(reasons))
+                    return r
+                reason = str(r.status_code)
+                await r.aclose()
+
+            reasons.append(reason)
+            logger.warning(f"{method} {url} failed ({reason}), retry {len(reasons)} in {delay:.2f}s")
+            await asyncio.sleep(delay)
+
+    async def make_request(
+        self,
+        endpoint: str,
+        method: Literal["GET", "POST", "PATCH", "DELETE", "PUT"],
+        query: Dict[str, Any] = None,
+        body: Dict = None,
+        raise_on_error=True,
+        only_json: bool = True,
+        stream: bool = False,
+        headers: Dict[str, str] = None,
+    ):
+        """
+        Make an asynchronous HTTP request to the API with authentication and error handling.
+
+        Behaves like :meth:`APIClientBase.make_request`: JSON responses without pagination and
+        CSV responses (when ``only_json`` is True) are normalized to a single page, available
+        through ``response.json()``.
+
+        :param endpoint: API endpoint to call
+        :type endpoint: str
+        :param method: HTTP method, one of "GET", "POST", "PATCH", "DELETE", "PUT"
+        :type method: str
+        :param query: Dictionary of query parameters
+        :type query: dict[str, Any], optional
+        :param body: Request body for POST, PATCH, PUT
+        :type body: dict, optional
+        :param raise_on_error: Whether to raise exceptions for non-2xx responses, defaults to True
+        :type raise_on_error: bool, optional
+        :param only_json: convert CSV responses to JSON format, defaults to True
+        :type only_json: bool, optional
+        :param stream: Leave the body of successful responses unread, to be consumed with ``response.aiter_bytes()``.
+            No normalization is done and the caller must close the response, defaults to False
+        :type stream: bool, optional
+        :param headers: Extra request headers, e.g. conditional headers. A 304 response is returned as is
+        :type headers: dict[str, str], optional
+        :return: HTTP response object
+        :rtype: httpx.Response
+        :raises ValueError: If an invalid HTTP method is provided
+        :raises err.APIError: For general API errors
+        :raises err.HTTP_ERRORS_MAP: For specific HTTP error codes mapped to exceptions
+        """
+        self._check_method(method)
+
+        auth_headers, auth = self._auth()
+        headers = {**auth_headers, **headers} if headers else auth_headers
+        url = self._url(endpoint)
+        logger.debug("Making async %s request to %s", method, endpoint)
+        logger.debug("Query: %s", lazy(query))
+
+        r = await self._asend(method, url, headers=headers, auth=auth, params=_as_params(query), json=body,
+                              stream=stream)
+
+        if 200 <= r.status_code < 300:
+            if not stream:
+                self._normalize(r, method, endpoint, url, query, only_json)
+            return r
+
+        if r.status_code == 304:
+            logger.debug("Not modified: %s", endpoint)
+            return r
+
+        if stream:
+            # El cuerpo del error es pequeño: se lee para extraer el mensaje
+            await r.aread()
+            await r.aclose()
+        body, message = self._error_message(r)
+        logger.error("Unsuccessful request to %s: [%s] %s", r.url, r.status_code, lazy(message))
+        self._dump_payload(method, url, query, body)
+        if not raise_on_error:
+            logger.warning("raise_on_error is False, ignoring API error and returning response")
+            return r
+
+        self._raise_api_error(r.status_code, message)
+
+    async def stream_csv(self, endpoint: str, query: Dict = None) -> AsyncIterator[Dict[str, str]]:
+        """
+        Asynchronous counterpart of :meth:`APIClientBase.stream_csv`.
+
+        The body is received without blocking the event loop into a temporary file (kept in
+        memory up to :data:`~trapper_client.APIClientBase.ZIP_SPOOL_SIZE` bytes) and then parsed
+        row by row with :func:`~trapper_client.APIClientBase.iter_csv_rows`, so memory use does
+        not depend on the size of the export.
+
+        :param endpoint: API endpoint
+        :type endpoint: str
+        :param query: Dictionary of query parameters
+        :type query: dict, optional
+        :return: Asynchronous generator of CSV rows
+        :rtype: AsyncIterator[dict[str, str]]
+        """
+        r = await self.make_request(endpoint, method="GET", query=query, raise_on_error=True, only_json=False,
+                                    stream=True)
+        with tempfile.SpooledTemporaryFile(max_size=ZIP_SPOOL_SIZE) as spool:
+            try:
+                async for chunk in r.aiter_bytes():
+                    spool.write(chunk)
+            finally:
+                await r.aclose()
+            spool.seek(0)
+            for row in iter_csv_rows(spool, r.headers.get("Content-Type", "")):
+                yield row
+
+    async def get(self, endpoint: str, query: Dict = None, raise_on_error: bool = True,
+                  use_cache: bool = True) -> Dict:
+        """
+        Send an asynchronous GET request to the API.
+
+        Uses the response :attr:`cache` like :meth:`APIClientBase.get`.
+
+        :param endpoint: API endpoint
+        :type endpoint: str
+        :param query: Dictionary of query parameters
+        :type query: dict, optional
+        :param raise_on_error: Whether to raise an exception for non-2xx responses, defaults to True
+        :type raise_on_error: bool, optional
+        :param use_cache: Use the response cache, if configured, defaults to True
+        :type use_cache: bool, optional
+        :return: Dictionary with 'pagination' and 'results'
+        :rtype: dict
+        """
+        slot = self._cache_slot(endpoint, query, use_cache)
+        if slot is not None and slot.fresh:
+            return slot.page
+
+        r = await self.make_request(endpoint, method="GET", query=query, raise_on_error=raise_on_error,
+                                    headers=slot.conditional_headers() if slot is not None else None)
+        if r.status_code == 304 and slot is not None and slot.page is not None:
+            return slot.revalidated()
+        if 200 <= r.status_code < 300:
+            page = r.json()
+            if slot is not None:
+                slot.store(page, r.headers)
+            return page
+        return self._as_page(r.json())
+
+    async def get_all_pages(
+            self, endpoint: str, query: Dict = None, raise_on_error: bool = True, max_workers: int = None
+    ) -> Dict:
+        """
+        Retrieve all paginated results from an endpoint.
+
+        The first page is awaited to learn the number of pages; the remaining pages are
+        requested concurrently (at most ``max_workers`` at a time) and merged in page order.
+
+        :param endpoint: API endpoint
+        :type endpoint: str
+        :param query: Dictionary of query parameters (the 'page' key is ignored)
+        :type query: dict, optional
+        :param raise_on_error: Whether to raise exceptions for non-2xx responses, defaults to True
+        :type raise_on_error: bool, optional
+        :param max_workers: Maximum number of pages requested at the same time, defaults to ``page_workers``
+        :type max_workers: int, optional
+        :return: Dictionary with combined 'results' and updated 'pagination'
+        :rtype: dict
+        """
+        query = {} if query is None else query.copy()
+        query.pop("page", None)
+
+        data = await self.get(endpoint, query=query, raise_on_error=raise_on_error)
+        pagination = data.get("pagination", {"page": 1, "pages": 1})
+        page = pagination.get("page", 1)
+        pages = pagination.get("pages", 1)
+
+        semaphore = asyncio.Semaphore(max(max_workers or self.page_workers or 1, 1))
+
+        async def fetch_page(n: int) -> Dict:
+            page_query = query.copy()
+            page_query["page"] = n
+            async with semaphore:
+                return await self.get(endpoint, query=page_query, raise_on_error=raise_on_error)
+
+        next_pages = await asyncio.gather(*(fetch_page(n) for n in range(page + 1, pages + 1)))
+        return self._merge_pages(data, next_pages)
+
+    async def post(self, endpoint: str, query: Dict = None, body: Dict = None, raise_on_error: bool = True):
+        """
+        Send an asynchronous POST request to the API.
+        """
+        return await self.make_request(endpoint, method="POST", query=query, body=body, raise_on_error=raise_on_error)
+
+    async def patch(self, endpoint: str, query: Dict = None, body: Dict = None, raise_on_error: bool = True):
+        """
+        Send an asynchronous PATCH request to the API.
+        """
+        return await self.make_request(endpoint, method="PATCH", query=query, body=body, raise_on_error=raise_on_error)
+
+    async def put(self, endpoint: str, query: Dict = None, body: Dict = None, raise_on_error: bool = True):
+        """
+        Send an asynchronous PUT request to the API.
+        """
+        return await self.make_request(endpoint, method="PUT", query=query, body=body, raise_on_error=raise_on_error)
+
+    async def delete(self, endpoint: str, query: Dict = None, body: Dict = None, raise_on_error: bool = True):
+        """
+        Send an asynchronous DELETE request to the API.
+        """
+        return await self.make_request(
+            endpoint, method="DELETE", query=query, body=body, raise_on_error=raise_on_error
+        )
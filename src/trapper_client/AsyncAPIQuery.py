@@ -0,0 +1,95 @@
+import logging
+import re
+from typing import Callable
+
+from pydantic import BaseModel
+
+from trapper_client.Validation import FULL, check_mode, results_builder
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncAPIQuery:
+    """
+    Asynchronous cursor over the results of an endpoint, loaded page by page.
+
+    It is the ``async for`` counterpart of :class:`trapper_client.APIQuery.APIQuery`::
+
+        async for media in client.media.where(cp=33):
+            print(media.mediaID)
+    """
+
+    def __init__(self, client, endpoint, query=None, schema=None,
+                 filter_fn: Callable[[BaseModel], bool] = None, page_size: int = 50, validate: str = FULL):
+        self.client = client
+        self.endpoint = endpoint
+        self.query = {} if query is None else query.copy()
+        self.schema = schema
+        self.filter_fn = filter_fn
+        self.validate = check_mode(validate)
+
+        self._page_size = page_size
+        self._page = 0
+        self._pages = 1
+        self._last_results = []
+        self._last_index = 0
+        self._exhausted = False
+
+    def __aiter__(self):
+        return self
+
+    async def _load_next_page(self):
+        page_query = self.query.copy()
+        page_query["page"] = self._page + 1
+        page_query["page_size"] = self._page_size
+
+        # Resolver placeholders en el endpoint usando valores de la query
+        endpoint_resolved = self.endpoint
+        for key in re.findall(r"\{([^}]+)\}", self.endpoint):
+            if key in page_query:
+                endpoint_resolved = endpoint_resolved.replace("{" + key + "}", str(page_query.pop(key)))
+
+        response = await self.client.get(endpoint_resolved, page_query, raise_on_error=True)
+        results = response.get("results", [])
+
+        if self.schema and results:
+            results = results_builder(self.schema, self.validate)(results)
+
+        pagination = response.get("pagination", {"page": page_query["page"], "pages": 1})
+        self._page = int(pagination.get("page", page_query["page"]))
+        self._pages = int(pagination.get("pages", 1))
+        self._last_results = results
+        self._last_index = 0
+
+    async def __anext__(self):
+        while True:
+            if self._exhausted:
+                raise StopAsyncIteration
+
+            if self._last_index >= len(self._last_results):
+                if self._page >= self._pages:
+                    self._exhausted = True
+                    raise StopAsyncIteration
+
+                await self._load_next_page()
+                if len(self._last_results) == 0:
+                    self._exhausted = True
+                    raise StopAsyncIteration
+
+            item = self._last_results[self._last_index]
+            self._last_index += 1
+
+            if self.filter_fn is None or self.filter_fn(item):
+                return item
+
+    async def aclose(self):
+        self._exhausted = True
+        self._last_results = []
+        self._last_index = 0
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.aclose()
+        return False
@@ -0,0 +1,336 @@
+"""
+Asynchronous engine for bulk media downloads.
+
+Defines:
+    - DownloadJob: one file to download (key, URL and destination path).
+    - AdaptiveLimit: concurrency limit adjusted to the observed throughput and error rate
+      (slow start, then additive increase / multiplicative decrease).
+    - AsyncDownloader: asyncio engine streaming hundreds of files at once with per-host
+      connection limits and bounded memory.
+
+Memory is bounded by the number of streams times ``chunk_size``: each stream holds one chunk
+at a time and does not read the next one until the previous one has been written to disk by
+a small I/O thread pool, so a slow disk slows the network reads down (backpressure) instead
+of piling chunks up in memory. Jobs are pulled lazily from the iterable, so millions of them
+can be queued without creating one task per file.
+"""
+import asyncio
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Optional
+from urllib.parse import urlparse
+
+import attr
+
+from trapper_client.DownloadManifest import part_path
+from trapper_client.RateLimiter import MEDIA, RateLimiter
+from trapper_client.Reports import Report
+from trapper_client.RetryPolicy import RetryPolicy
+import logging
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+
+def _import_httpx():
+    try:
+        import httpx
+    except ImportError as e:
+        raise ImportError(
+            "The asynchronous downloader requires 'httpx'. Install it with: pip install 'trapper-client[async]'"
+        ) from e
+    return httpx
+
+
+class DownloadStatusError(Exception):
+    """
+    The server answered a media download with an error status.
+    """
+
+    def __init__(self, url: str, status_code: int, retry_after: str = None):
+        super().__init__(f"HTTP {status_code} downloading {url}")
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+@attr.s(slots=True, frozen=True)
+class DownloadJob:
+    """
+    File to download with :class:`AsyncDownloader`.
+
+    :param key: Identifier used in the report and the callbacks (e.g. the mediaID)
+    :type key: str
+    :param url: URL of the file
+    :type url: str
+    :param path: Destination path
+    :type path: Path
+    """
+    key: str = attr.ib(converter=str)
+    url: str = attr.ib(converter=str)
+    path: Path = attr.ib(converter=Path)
+
+
+@attr.s
+class AdaptiveLimit:
+    """
+    Concurrency limit that adapts to the throughput and the error rate of the downloads.
+
+    The limit is re-evaluated every time as many downloads as the current limit have
+    finished (a "window"):
+
+    - more than ``error_threshold`` failed: the limit is halved;
+    - the throughput (bytes per second) did not drop by more than ``tolerance`` from the best
+      one seen: the limit doubles until the first decrease and then grows by one;
+    - otherwise more streams did not help and the limit shrinks by one.
+
+    :param initial: Initial limit, defaults to 16
+    :type initial: int, optional
+    :param minimum: Lowest limit, defaults to 2
+    :type minimum: int, optional
+    :param maximum: Highest limit, defaults to 256
+    :type maximum: int, optional
+    :param error_threshold: Error rate of a window above which the limit is halved, defaults to 0.05
+    :type error_threshold: float, optional
+    :param tolerance: Relative throughput drop tolerated before shrinking the limit, defaults to 0.1
+    :type tolerance: float, optional
+    """
+    initial: int = attr.ib(default=16)
+    minimum: int = attr.ib(default=2)
+    maximum: int = attr.ib(default=256)
+    error_threshold: float = attr.ib(default=0.05)
+    tolerance: float = attr.ib(default=0.1)
+
+    _limit: int = attr.ib(init=False)
+    _active: int = attr.ib(init=False, default=0)
+    _slow_start: bool = attr.ib(init=False, default=True)
+    _best: float = attr.ib(init=False, default=0.0)
+    _done: int = attr.ib(init=False, default=0)
+    _errors: int = attr.ib(init=False, default=0)
+    _bytes: int = attr.ib(init=False, default=0)
+    _window_start: float = attr.ib(init=False, factory=time.monotonic)
+    _condition: Optional[asyncio.Condition] = attr.ib(init=False, repr=False, default=None)
+
+    def __attrs_post_init__(self):
+        self._limit = max(self.minimum, min(self.initial, self.maximum))
+
+    @property
+    def limit(self) -> int:
+        return self._limit
+
+    @property
+    def active(self) -> int:
+        return self._active
+
+    def bind(self) -> None:
+        """
+        Prepare the limit for a new event loop (the learned limit is kept).
+        """
+        self._condition = asyncio.Condition()
+        self._active = 0
+
+    async def acquire(self) -> None:
+        if self._condition is None:
+            self.bind()
+        async with self._condition:
+            await self._condition.wait_for(lambda: self._active < self._limit)
+            self._active += 1
+
+    async def release(self) -> None:
+        async with self._condition:
+            self._active -= 1
+            self._condition.notify_all()
+
+    def record(self, ok: bool, nbytes: int = 0) -> None:
+        """
+        Account a finished download and re-evaluate the limit at the end of a window.
+        """
+        self._done += 1
+        self._errors += not ok
+        self._bytes += nbytes
+        if self._done >= self._limit:
+            self._adjust(time.monotonic())
+
+    def _adjust(self, now: float) -> None:
+        throughput = self._bytes / max(now - self._window_start, 1e-6)
+        previous = self._limit
+        if self._errors / self._done > self.error_threshold:
+            self._limit = max(self.minimum, self._limit // 2)
+            self._slow_start = False
+        elif throughput >= self._best * (1 - self.tolerance):
+            self._limit = min(self.maximum, self._limit * 2 if self._slow_start else self._limit + 1)
+            self._best = max(self._best, throughput)
+        else:
+            self._limit = max(self.minimum, self._limit - 1)
+            self._slow_start = False
+        if self._limit != previous:
+            logger.debug("Download concurrency %d -> %d (%.0f B/s, %d/%d errors)",
+                         previous, self._limit, throughput, self._errors, self._done)
+        self._done = self._errors = self._bytes = 0
+        self._window_start = now
+
+
+@attr.s
+class AsyncDownloader:
+    """
+    asyncio engine for downloading many files concurrently.
+
+    Each file is streamed to ``<path>.part`` and renamed when complete. Failed downloads are
+    retried according to ``retry_policy`` and reported; they never stop the other ones.
+
+    Examples
+    --------
+    downloader = AsyncDownloader(max_concurrency=200, per_host=64)
+    jobs = (DownloadJob(m.mediaID, m.filePath, folder / m.fileName) for m in medias)
+    report = asyncio.run(downloader.run(jobs))
+
+    :param max_concurrency: Maximum number of simultaneous downloads, defaults to 256
+    :type max_concurrency: int, optional
+    :param per_host: Maximum number of simultaneous downloads from the same host, defaults to 64
+    :type per_host: int, optional
+    :param initial_concurrency: Starting point of the adaptive limit, defaults to 16
+    :type initial_concurrency: int, optional
+    :param chunk_size: Bytes read from the network and written to disk at a time, defaults to 64 KiB
+    :type chunk_size: int, optional
+    :param io_workers: Threads writing chunks to disk, defaults to 4
+    :type io_workers: int, optional
+    :param rate_limiter: Rate limiter of media downloads, defaults to an unlimited :class:`RateLimiter`
+    :type rate_limiter: RateLimiter, optional
+    :param retry_policy: Policy used to retry failed downloads, defaults to :class:`RetryPolicy`
+    :type retry_policy: RetryPolicy, optional
+    :param timeout: Timeout in seconds of each network operation, defaults to 60
+    :type timeout: float, optional
+    :param session: ``httpx.AsyncClient`` to use; by default one sized to ``max_concurrency`` is created
+        for each :meth:`run` and closed afterwards
+    :type session: httpx.AsyncClient, optional
+    """
+    max_concurrency: int = attr.ib(default=256)
+    per_host: int = attr.ib(default=64)
+    initial_concurrency: int = attr.ib(default=16)
+    chunk_size: int = attr.ib(default=DEFAULT_CHUNK_SIZE)
+    io_workers: int = attr.ib(default=4)
+    rate_limiter: RateLimiter = attr.ib(repr=False, factory=RateLimiter)
+    retry_policy: RetryPolicy = attr.ib(repr=False, factory=RetryPolicy)
+    timeout: float = attr.ib(default=60)
+    session = attr.ib(repr=False, default=None)
+
+    limiter: AdaptiveLimit = attr.ib(init=False, repr=False)
+    _hosts: Dict[str, asyncio.Semaphore] = attr.ib(init=False, repr=False, factory=dict)
+
+    def __attrs_post_init__(self):
+        self.limiter = AdaptiveLimit(
+            initial=self.initial_concurrency, minimum=min(2, self.max_concurrency), maximum=self.max_concurrency
+        )
+
+    async def run(self, jobs: Iterable[DownloadJob], callback: Callable = None, report: Report = None) -> Report:
+        """
+        Download every job and return a report with a ``download`` entry per job.
+
+        :param jobs: Files to download; consumed lazily
+        :type jobs: Iterable[DownloadJob]
+        :param callback: Called as ``callback(event, key, name, total, step)`` with ``"start"``,
+            ``"end"`` or ``"fail"`` events, like the other download methods
+        :type callback: Callable, optional
+        :param report: Report to add the results to, defaults to a new one
+        :type report: Report, optional
+        :rtype: Report
+        """
+        httpx = _import_httpx()
+        report = report if report is not None else Report(title="Downloading media(s)")
+        self.limiter.bind()
+        self._hosts = {}
+        session = self.session
+        if session is None:
+            limits = httpx.Limits(max_connections=self.max_concurrency,
+                                  max_keepalive_connections=self.max_concurrency)
+            session = httpx.AsyncClient(limits=limits, timeout=self.timeout, follow_redirects=True)
+        iterator = iter(jobs)
+        executor = ThreadPoolExecutor(self.io_workers, thread_name_prefix="trapper-download-io")
+
+        def _notify(event, key, name, total=None, step=None):
+            if callback:
+                callback(event, key, name, total, step)
+
+        async def _worker():
+            for job in iterator:
+                _notify("start", job.key, "Downloading file", total=None, step=0)
+                try:
+                    await self._download(session, executor, job)
+                except Exception as e:
+                    _notify("fail", job.key, "Downloading file", total=None, step=1)
+                    report.add_error(job.key, "download", str(e))
+                else:
+                    report.add_success(job.key, "download", str(job.path))
+                    _notify("end", job.key, "Downloading file", total=None, step=1)
+
+        try:
+            # Hay tantos workers como el máximo; el límite adaptativo decide cuántos descargan a la vez
+            await asyncio.gather(*(_worker() for _ in range(self.max_concurrency)))
+        finally:
+            executor.shutdown(wait=True)
+            if self.session is None:
+                await session.aclose()
+        report.finish()
+        return report
+
+    def host_semaphore(self, url: str) -> asyncio.Semaphore:
+        host = urlparse(url).netloc
+        semaphore = self._hosts.get(host)
+        if semaphore is None:
+            semaphore = self._hosts[host] = asyncio.Semaphore(self.per_host)
+        return semaphore
+
+    async def _download(self, session, executor: ThreadPoolExecutor, job: DownloadJob) -> None:
+        attempt = 0
+        while True:
+            async with self.host_semaphore(job.url):
+                await self.limiter.acquire()
+                nbytes, error = 0, None
+                try:
+                    nbytes = await self._fetch(session, executor, job)
+                except Exception as e:
+                    error = e
+                except BaseException:
+                    # Cancelada (CancelledError): se libera el hueco sin contarla como éxito ni fallo
+                    await self.limiter.release()
+                    raise
+                self.limiter.record(error is None, nbytes)
+                await self.limiter.release()
+            if error is None:
+                return
+
+            attempt += 1
+            if isinstance(error, DownloadStatusError):
+                delay = self.retry_policy.next_delay("GET", attempt, status_code=error.status_code,
+                                                     retry_after=error.retry_after)
+            else:
+                delay = self.retry_policy.next_delay("GET", attempt, exception=error)
+            if delay is None:
+                raise error
+            logger.warning(f"GET {job.url} failed ({error}), retry {attempt} in {delay:.2f}s")
+            await asyncio.sleep(delay)
+
+    async def _fetch(self, session, executor: ThreadPoolExecutor, job: DownloadJob) -> int:
+        delay = self.rate_limiter.reserve(job.url, MEDIA)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        loop = asyncio.get_running_loop()
+        partial = part_path(job.path)
+        nbytes = 0
+        async with session.stream("GET", job.url) as resp:
+            if resp.status_code >= 400:
+                raise DownloadStatusError(job.url, resp.status_code, resp.headers.get("Retry-After"))
+            await loop.run_in_executor(executor, lambda: job.path.parent.mkdir(parents=True, exist_ok=True))
+            f = await loop.run_in_executor(executor, open, partial, "wb")
+            try:
+                async for chunk in resp.aiter_bytes(self.chunk_size):
+                    # No se lee el siguiente trozo hasta escribir este: contrapresión hacia la red
+                    await loop.run_in_executor(executor, f.write, chunk)
+                    nbytes += len(chunk)
+            finally:
+                await loop.run_in_executor(executor, f.close)
+        await loop.run_in_executor(executor, os.replace, partial, job.path)
+        return nbytes
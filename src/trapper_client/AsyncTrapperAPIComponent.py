@@ -0,0 +1,269 @@
+import csv
+import io
+import re
+from typing import Dict, Any, AsyncIterator, Callable, Type
+
+import attr
+from pydantic import BaseModel
+
+from trapper_client.APIClientBase import is_csv_response, decode_csv_text
+from trapper_client.AsyncAPIClientBase import AsyncAPIClientBase
+from trapper_client.AsyncAPIQuery import AsyncAPIQuery
+from trapper_client.Columns import COLUMNS, ColumnarResults, check_container
+from trapper_client.TrapperAPIComponent import TrapperAPIComponent, T
+from trapper_client.Validation import FULL, build_page
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@attr.s
+class AsyncTrapperAPIComponent:
+    """
+    Asynchronous mirror of a :class:`TrapperAPIComponent`.
+
+    The endpoint, schema, default query and ``explicit_fields`` are read from the
+    synchronous component it mirrors, so both clients share the same endpoint
+    definitions and Pydantic schemas. Every query method is a coroutine and
+    :meth:`where` returns an :class:`AsyncAPIQuery` usable with ``async for``.
+
+    The ``get_by_<field>`` and ``get_all_by_<field>`` helpers of the synchronous
+    component are available too, as coroutines with the same signature.
+
+    Attributes
+    ----------
+    _client : AsyncAPIClientBase
+        The asynchronous API client used for making HTTP requests.
+    _component_class : Type[TrapperAPIComponent]
+        The synchronous component class to mirror.
+    """
+
+    _client: AsyncAPIClientBase = attr.ib(repr=False)
+    _component_class: Type[TrapperAPIComponent] = attr.ib(repr=False)
+    _component: TrapperAPIComponent = attr.ib(init=False, repr=False)
+
+    def __attrs_post_init__(self):
+        # La instancia síncrona solo se usa para leer endpoint, schema y query por defecto
+        self._component = self._component_class(self._client)
+
+    @property
+    def _endpoint(self) -> str:
+        return self._component._endpoint
+
+    @property
+    def _schema(self) -> Type[BaseModel]:
+        return self._component._schema
+
+    @property
+    def _default_query(self) -> Dict[str, Any]:
+        return getattr(self._component, "_default_query", {}) or {}
+
+    @property
+    def explicit_fields(self):
+        return self._component.explicit_fields
+
+    def _validation_mode(self, validate: str = None) -> str:
+        """
+        Validation mode of a call: the one requested or, by default, the one of the client.
+        """
+        return validate or getattr(self._client, "validate", FULL)
+
+    def _resolve_endpoint(self, endpoint: str, query: dict | None):
+        return self._component._resolve_endpoint(endpoint, query)
+
+    def __getattr__(self, name: str):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        for prefix, all_results in (("get_all_by_", True), ("get_by_", False)):
+            if name.startswith(prefix) and name[len(prefix):] in self.explicit_fields:
+                return self._make_getter(name[len(prefix):], all_results)
+        raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
+
+    def _make_getter(self, field: str, all_results: bool):
+        endpoint_vars = re.findall(r"{(\w+)}", self._endpoint or "")
+
+        async def getter(*args, query=None, filter_fn=None, endpoint=None):
+            # Igual que en TrapperAPIComponent: las variables del endpoint van antes del valor
+            *var_values, value = args
+            combined_query = {**self._default_query, **(query or {})}
+
+            if isinstance(value, list):
+                value = ",".join(map(str, value))
+            combined_query[field] = value
+
+            actual_endpoint = endpoint or self._endpoint
+            for var, val in zip(endpoint_vars, var_values):
+                actual_endpoint = actual_endpoint.replace(f"{{{var}}}", str(val))
+
+            if all_results:
+                return await self.get_all(query=combined_query, filter_fn=filter_fn, endpoint=actual_endpoint)
+            return await self.get(query=combined_query, filter_fn=filter_fn, endpoint=actual_endpoint)
+
+        getter.__name__ = f"{'get_all_by_' if all_results else 'get_by_'}{field}"
+        getter.__doc__ = f"Auto-generated asynchronous getter for field '{field}'."
+        return getter
+
+    async def get_all(
+        self,
+        query: Dict[str, Any] = None,
+        filter_fn: Callable[[T], bool] = None,
+        endpoint: str = None,
+        schema: type[BaseModel] = None,
+        validate: str = None,
+        as_: str = None,
+    ) -> T:
+        """
+        Retrieve all results (all pages) from the endpoint.
+
+        Parameters
+        ----------
+        query : dict[str, Any], optional
+            Dictionary of query parameters to send with the request.
+        filter_fn : Callable[[T], bool], optional
+            Optional function to filter results locally.
+        endpoint : str, optional
+            Optional endpoint override.
+        schema : type[BaseModel], optional
+            Optional schema override.
+        validate : str, optional
+            Validation mode (``"full"``, ``"light"`` or ``"none"``), defaults to the client setting.
+        as_ : str, optional
+            ``"columns"`` stores the results column-wise in a :class:`ColumnarResults` instead of
+            building one model per row. ``filter_fn`` then receives row views.
+
+        Returns
+        -------
+        T
+            Pydantic model containing all retrieved results (or ColumnarResults with ``as_="columns"``).
+        """
+        actual_endpoint = self._resolve_endpoint(endpoint or self._endpoint, query)
+        actual_schema = schema or self._schema
+        container = check_container(as_)
+        res = await self._client.get_all_pages(actual_endpoint, query)
+        if container == COLUMNS:
+            return ColumnarResults.from_page(actual_schema, res, filter_fn)
+        parsed = build_page(actual_schema, res, self._validation_mode(validate))
+        if filter_fn:
+            parsed.results = [r for r in parsed.results if filter_fn(r)]
+        return parsed
+
+    async def get(
+        self,
+        query: Dict[str, Any] = None,
+        filter_fn: Callable[[T], bool] = None,
+        endpoint: str = None,
+        schema: type[BaseModel] = None,
+        validate: str = None,
+    ) -> T:
+        """
+        Retrieve results from the endpoint (single page).
+
+        Parameters
+        ----------
+        query : dict[str, Any], optional
+            Dictionary of query parameters to send with the request.
+        filter_fn : Callable[[T], bool], optional
+            Optional function to filter results locally.
+        endpoint : str, optional
+            Optional endpoint override.
+        schema : type[BaseModel], optional
+            Optional schema override.
+        validate : str, optional
+            Validation mode (``"full"``, ``"light"`` or ``"none"``), defaults to the client setting.
+
+        Returns
+        -------
+        T
+            Pydantic model containing retrieved results.
+        """
+        actual_endpoint = self._resolve_endpoint(endpoint or self._endpoint, query)
+        actual_schema = schema or self._schema
+        res = await self._client.get(actual_endpoint, query)
+        parsed = build_page(actual_schema, res, self._validation_mode(validate))
+        if filter_fn:
+            parsed.results = [r for r in parsed.results if filter_fn(r)]
+        return parsed
+
+    def where(self, filter_fn: Callable[[T], bool] = None, validate: str = None, **query) -> AsyncAPIQuery:
+        """
+        Return an asynchronous cursor that loads the results page by page.
+
+        Examples
+        --------
+        async for media in client.media.where(cp=33):
+            print(media.mediaID)
+        """
+        return AsyncAPIQuery(
+            client=self._client,
+            endpoint=self._endpoint,
+            query={**self._default_query, **query},
+            schema=self._schema,
+            filter_fn=filter_fn,
+            validate=self._validation_mode(validate),
+        )
+
+    async def first(self, **filters):
+        async for item in self.where(**filters):
+            return item
+        return None
+
+    async def last(self, **filters):
+        last_item = None
+        async for item in self.where(**filters):
+            last_item = item
+        return last_item
+
+    async def get_all_filtered(self, *, filter_fn: Callable[[T], bool] = None, endpoint: str = None, **filters) -> T:
+        """
+        Retrieve results applying the given filters to all pages.
+        """
+        return await self.get_all(filters, filter_fn=filter_fn, endpoint=endpoint)
+
+    async def get_filtered(self, *, filter_fn: Callable[[T], bool] = None, endpoint: str = None, **filters) -> T:
+        """
+        Retrieve results applying the given filters (single page).
+        """
+        return await self.get(filters, filter_fn=filter_fn, endpoint=endpoint)
+
+    async def export(self, query: Dict[str, Any] = None, endpoint: str = None,
+                     stream: bool = False) -> None | csv.DictReader | AsyncIterator[Dict[str, str]]:
+        """
+        Download a CSV export (plain, zip, gzip or bzip2) from the API.
+
+        Asynchronous counterpart of :meth:`TrapperAPIComponent.export`.
+
+        Parameters
+        ----------
+        query : dict, optional
+            Optional query parameters.
+        endpoint : str, optional
+            Export endpoint.
+        stream : bool, optional
+            If True, return an asynchronous generator of rows (see :meth:`iter_export`). Defaults to False.
+
+        Returns
+        -------
+        csv.DictReader or AsyncIterator[dict] or None
+            Rows of the export, or None if the response is not CSV.
+        """
+        if stream:
+            return self.iter_export(query, endpoint)
+
+        a = await self._client.make_request(endpoint=endpoint, method="GET", query=query, only_json=False)
+        content_type = a.headers.get("Content-Type", "")
+
+        if is_csv_response(content_type, a.content):
+            return csv.DictReader(io.StringIO(decode_csv_text(a.content, content_type, a.text)))
+        return None
+
+    def iter_export(self, query: Dict[str, Any] = None, endpoint: str = None) -> AsyncIterator[Dict[str, str]]:
+        """
+        Stream the rows of a CSV export, see :meth:`AsyncAPIClientBase.stream_csv`.
+
+        Examples
+        --------
+        async for row in client.deployments.iter_export():
+            print(row["deploymentID"])
+        """
+        actual_endpoint = self._resolve_endpoint(endpoint or self._endpoint, query)
+        return self._client.stream_csv(actual_endpoint, query)
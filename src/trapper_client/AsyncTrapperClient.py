@@ -0,0 +1,132 @@
+import os
+
+import attr
+import logging
+
+from trapper_client.AsyncAPIClientBase import AsyncAPIClientBase
+from trapper_client.RateLimiter import RateLimiter
+from trapper_client.ResponseCache import ResponseCache
+from trapper_client.RetryPolicy import RetryPolicy
+from trapper_client.TrapperClient import parse_url
+from trapper_client.components.AsyncComponents import AsyncLocationsComponent, AsyncDeploymentsComponent, \
+    AsyncClassificationProjectsComponent, AsyncResearchProjectsComponent, AsyncResourcesComponent, \
+    AsyncMediaComponent, AsyncObservationsComponent, AsyncAIObservationsComponent, AsyncUserObservationsComponent, \
+    AsyncClassificatorsComponent, AsyncCollectionsComponent, AsyncPackagesComponent
+
+logger = logging.getLogger(__name__)
+
+
+@attr.s(auto_attribs=True)
+class AsyncTrapperClient:
+    """
+    Asynchronous client for interacting with the Trapper API.
+
+    Mirrors :class:`trapper_client.TrapperClient.TrapperClient`: it exposes the same
+    components, endpoints and Pydantic schemas, but every request is a coroutine and
+    ``where()`` cursors are consumed with ``async for``. Requires the ``async`` extra
+    (``httpx``).
+
+    Examples
+    --------
+    async with AsyncTrapperClient.from_environment() as client:
+        projects = await client.classification_projects.get_all()
+        async for media in client.media.where(cp=33):
+            print(media.mediaID)
+
+    Attributes
+    ----------
+    access_token : str
+        Authentication token for API access.
+    base_url : str
+        Base URL of the Trapper API server.
+    user_name : str
+        Username for authentication.
+    user_password : str
+        Password for authentication.
+    pool_maxsize : int
+        Maximum number of keep-alive connections kept by the HTTP client.
+    page_workers : int
+        Maximum number of pages requested concurrently when retrieving all pages of an endpoint.
+    retry_policy : RetryPolicy
+        Policy used to retry transient failures (throttling, gateway errors, connection resets).
+    api_rate_limit : float, optional
+        Maximum API requests per second sent to the server, shared by all components and threads (None = unlimited).
+    media_rate_limit : float, optional
+        Maximum media downloads per second, budgeted separately from API requests (None = unlimited).
+    validate : str
+        How results are built: "full" Pydantic validation, "light" scalar coercion only or "none"
+        (trusted server, no validation). Can be overridden per call.
+    cache : ResponseCache, optional
+        Persistent cache of GET responses for rarely changing listings (None = no cache).
+    raw : AsyncAPIClientBase
+        Raw asynchronous API client instance.
+    """
+    access_token: str
+    base_url: str = attr.ib(default="https://wildintel-trap.uhu.es", converter=parse_url)
+    user_name: str = attr.ib(repr=False, default="me")
+    user_password: str = attr.ib(repr=False, default="")
+    pool_maxsize: int = attr.ib(repr=False, default=10)
+    page_workers: int = attr.ib(repr=False, default=4)
+    retry_policy: RetryPolicy = attr.ib(repr=False, factory=RetryPolicy)
+    api_rate_limit: float = attr.ib(repr=False, default=None)
+    media_rate_limit: float = attr.ib(repr=False, default=None)
+    validate: str = attr.ib(repr=False, default="full")
+    cache: ResponseCache = attr.ib(repr=False, default=None)
+
+    raw: AsyncAPIClientBase = attr.ib(init=False, repr=False)
+
+    def __attrs_post_init__(self):
+        self.raw: AsyncAPIClientBase = AsyncAPIClientBase(
+            access_token=self.access_token,
+            user_name=self.user_name,
+            user_password=self.user_password,
+            base_url=self.base_url,
+            pool_maxsize=self.pool_maxsize,
+            page_workers=self.page_workers,
+            retry_policy=self.retry_policy,
+            rate_limiter=RateLimiter(api_rate=self.api_rate_limit, media_rate=self.media_rate_limit),
+            validate=self.validate,
+            cache=self.cache,
+        )
+
+        self.locations = AsyncLocationsComponent(self.raw)
+        self.deployments = AsyncDeploymentsComponent(self.raw)
+        self.classification_projects = AsyncClassificationProjectsComponent(self.raw)
+        self.research_projects = AsyncResearchProjectsComponent(self.raw)
+        self.resources = AsyncResourcesComponent(self.raw)
+        self.media = AsyncMediaComponent(self.raw)
+        self.observations = AsyncObservationsComponent(self.raw)
+        self.aiobservations = AsyncAIObservationsComponent(self.raw)
+        self.userobservations = AsyncUserObservationsComponent(self.raw)
+
+        self.classificators = AsyncClassificatorsComponent(self.raw)
+        self.collections = AsyncCollectionsComponent(self.raw)
+        self.packages = AsyncPackagesComponent(self.raw)
+
+    async def aclose(self) -> None:
+        """
+        Close the underlying HTTP client and release its pooled connections.
+        """
+        await self.raw.aclose()
+
+    async def __aenter__(self) -> "AsyncTrapperClient":
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.aclose()
+        return False
+
+    @classmethod
+    def from_environment(cls) -> "AsyncTrapperClient":
+        """
+        Create an AsyncTrapperClient instance using the same environment variables as
+        :meth:`TrapperClient.from_environment`.
+        """
+        env = os.environ
+
+        return cls(
+            access_token=env.get("TRAPPER_ACCESS_TOKEN", None),
+            base_url=env.get("TRAPPER_URL", "https://wildintel-trap.uhu.es"),
+            user_name=env.get("TRAPPER_USER_NAME", None),
+            user_password=env.get("TRAPPER_USER_PASSWORD", None),
+        )
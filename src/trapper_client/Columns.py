@@ -0,0 +1,447 @@
+"""
+Compact column-wise container for large result lists.
+
+Defines:
+    - Column: one column stored in a typed :mod:`array` buffer (numbers, booleans, datetimes)
+      or dictionary-encoded (strings), with a validity mask for missing values.
+    - ColumnarResults: the columns of a result list, with row views built on demand and
+      conversions to NumPy, pandas and Arrow.
+    - RowView: read-only view of one row.
+
+Rows are not kept as Pydantic objects or dicts: numbers take 8 bytes per value and repeated
+strings (deployment, species, observation type...) are stored once. NumPy, pandas and
+pyarrow are optional (``columns`` extra) and only imported by the conversion methods.
+"""
+import logging
+from array import array
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Type, get_args
+
+import attr
+from pydantic import BaseModel
+
+from trapper_client.Validation import results_validator, scalar_coercer, strip_optional
+
+logger = logging.getLogger(__name__)
+
+INT = "int"
+FLOAT = "float"
+BOOL = "bool"
+DATETIME = "datetime"
+STRING = "string"
+OBJECT = "object"
+
+COLUMNS = "columns"
+CONTAINERS = (COLUMNS,)
+
+_KINDS = {bool: BOOL, int: INT, float: FLOAT, datetime: DATETIME, str: STRING}
+_TYPES = {kind: tp for tp, kind in _KINDS.items()}
+_TYPECODES = {INT: "q", FLOAT: "d", BOOL: "b", DATETIME: "q", STRING: "q"}
+_NUMPY_DTYPES = {INT: "int64", FLOAT: "float64", BOOL: "bool", DATETIME: "datetime64[us]"}
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def _import(module: str):
+    try:
+        return __import__(module)
+    except ImportError as e:
+        raise ImportError(
+            f"{module} is required for this conversion. Install it with: pip install trapper-client[columns]"
+        ) from e
+
+
+def check_container(as_: Optional[str]) -> Optional[str]:
+    """
+    Return ``as_`` if it is None (list schema instance) or a supported result container.
+
+    :raises ValueError: If the container is unknown
+    """
+    if as_ is not None and as_ not in CONTAINERS:
+        raise ValueError(f"Invalid result container: {as_}. Must be one of {', '.join(CONTAINERS)}")
+    return as_
+
+
+def _to_micros(value: datetime) -> int:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    delta = value - _EPOCH
+    return (delta.days * 86400 + delta.seconds) * 1_000_000 + delta.microseconds
+
+
+@attr.s(slots=True)
+class Column:
+    """
+    One column of a :class:`ColumnarResults`.
+
+    Integers, floats, booleans and datetimes (microseconds since the epoch; naive values are
+    taken as UTC) are stored in an :class:`array.array`. Strings are dictionary-encoded as
+    integer codes into ``categories``. Any other value (nested objects, lists) is kept in a list.
+    Values that do not fit the type of the column are stored as missing.
+
+    :param name: Column name
+    :type name: str
+    :param kind: One of "int", "float", "bool", "datetime", "string" or "object"
+    :type kind: str
+    """
+    name: str = attr.ib()
+    kind: str = attr.ib()
+
+    values: Any = attr.ib(init=False, repr=False)
+    valid: bytearray = attr.ib(init=False, repr=False, factory=bytearray)
+    categories: List[str] = attr.ib(init=False, repr=False, factory=list)
+    _codes: Dict[str, int] = attr.ib(init=False, repr=False, factory=dict)
+    _coerce: Optional[Callable[[Any], Any]] = attr.ib(init=False, repr=False, default=None)
+
+    def __attrs_post_init__(self):
+        typecode = _TYPECODES.get(self.kind)
+        self.values = array(typecode) if typecode else []
+        self._coerce = scalar_coercer(_TYPES.get(self.kind))
+
+    def __len__(self) -> int:
+        return len(self.valid)
+
+    def append(self, value: Any) -> None:
+        """
+        Append a value. Strings (as parsed from CSV exports) are converted to the type of the column.
+        """
+        if self.kind == STRING:
+            if value is not None:
+                value = str(value)
+                code = self._codes.get(value)
+                if code is None:
+                    code = self._codes[value] = len(self.categories)
+                    self.categories.append(value)
+                self.values.append(code)
+            else:
+                self.values.append(-1)
+        elif self.kind == OBJECT:
+            self.values.append(value)
+        else:
+            if isinstance(value, str):
+                value = self._coerce(value) if value else None
+            try:
+                self.values.append(0 if value is None else _to_micros(value) if self.kind == DATETIME else value)
+            except (TypeError, ValueError, OverflowError, AttributeError):
+                # El valor no encaja en el tipo de la columna: se guarda como ausente
+                self.values.append(0)
+                value = None
+        self.valid.append(value is not None)
+
+    def pad(self, n: int) -> None:
+        """
+        Append ``n`` missing values.
+        """
+        self.valid.extend(bytes(n))
+        if self.kind == OBJECT:
+            self.values.extend([None] * n)
+        else:
+            self.values.extend([-1 if self.kind == STRING else 0] * n)
+
+    def get(self, i: int) -> Any:
+        """
+        Return the value of row ``i`` as a Python object (None if missing).
+        """
+        if not self.valid[i]:
+            return None
+        v = self.values[i]
+        if self.kind == STRING:
+            return self.categories[v]
+        if self.kind == DATETIME:
+            return _EPOCH + timedelta(microseconds=v)
+        if self.kind == BOOL:
+            return bool(v)
+        return v
+
+    def take(self, indices: Sequence[int]) -> "Column":
+        """
+        Return a new column with the rows at ``indices``. String categories are shared.
+        """
+        column = Column(self.name, self.kind)
+        if self.kind == STRING:
+            column.categories = self.categories
+            column._codes = self._codes
+        values = self.values
+        column.values.extend([values[i] for i in indices])
+        valid = self.valid
+        column.valid.extend([valid[i] for i in indices])
+        return column
+
+    def mask(self):
+        """
+        Return a NumPy boolean array, True where the value is missing.
+        """
+        np = _import("numpy")
+        return np.frombuffer(self.valid, dtype="uint8") == 0
+
+    def codes(self):
+        """
+        Return the dictionary codes of a string column as a NumPy array (-1 for missing values), without copy.
+        """
+        np = _import("numpy")
+        return np.frombuffer(self.values, dtype="int64")
+
+    def to_numpy(self):
+        """
+        Return the column as a NumPy array.
+
+        Integer, float, boolean and datetime columns are zero-copy views of the underlying
+        buffer, where missing values hold 0 (see :meth:`mask`). String and object columns
+        are copied into an object array with None for missing values.
+        """
+        np = _import("numpy")
+        if self.kind in _NUMPY_DTYPES:
+            raw = np.frombuffer(self.values, dtype="int8" if self.kind == BOOL else self.values.typecode)
+            return raw.view(_NUMPY_DTYPES[self.kind])
+        return np.array([self.get(i) for i in range(len(self))], dtype=object)
+
+
+@attr.s(slots=True, repr=False)
+class RowView:
+    """
+    Read-only view of one row of a :class:`ColumnarResults`. Values are read from the columns on access.
+    """
+    _results: "ColumnarResults" = attr.ib()
+    _index: int = attr.ib()
+
+    def __getattr__(self, name: str) -> Any:
+        try:
+            column = self._results.columns[name]
+        except KeyError:
+            raise AttributeError(name) from None
+        return column.get(self._index)
+
+    def __getitem__(self, name: str) -> Any:
+        return self._results.columns[name].get(self._index)
+
+    def keys(self):
+        return self._results.columns.keys()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return self._results.row(self._index)
+
+    def to_model(self) -> BaseModel:
+        return self._results.model(self._index)
+
+    def __repr__(self) -> str:
+        return f"RowView({self.to_dict()!r})"
+
+
+@attr.s
+class ColumnarResults:
+    """
+    Results of a list endpoint stored column by column.
+
+    Build it with ``get_all(..., as_="columns")`` or :meth:`from_rows` (any iterable of raw
+    rows, e.g. a streamed CSV export). Iterating yields :class:`RowView` objects; a Pydantic
+    model is only built when :meth:`model` (or ``RowView.to_model``) is called.
+
+    Examples
+    --------
+    cols = client.deployments.get_all(as_="columns")
+    df = cols.to_pandas()
+    for row in cols:
+        print(row.deploymentID, row.locationID)
+
+    :param schema: Paginated list schema of the rows, used for the column types and :meth:`model`
+    :type schema: Type[BaseModel], optional
+    :param pagination: Pagination of the response, if any
+    :type pagination: Any, optional
+    """
+    schema: Optional[Type[BaseModel]] = attr.ib(default=None)
+    pagination: Any = attr.ib(default=None, repr=False)
+
+    columns: Dict[str, Column] = attr.ib(init=False, factory=dict, repr=lambda c: repr(list(c)))
+    _keys: Dict[str, str] = attr.ib(init=False, factory=dict, repr=False)
+    _length: int = attr.ib(init=False, default=0)
+
+    def __attrs_post_init__(self):
+        for name, key, kind in _schema_columns(self.schema):
+            self._add_column(name, key, kind)
+
+    def _add_column(self, name: str, key: str, kind: str) -> Column:
+        column = self.columns[name] = Column(name, kind)
+        column.pad(self._length)
+        self._keys[key] = name
+        return column
+
+    @classmethod
+    def from_rows(cls, schema: Optional[Type[BaseModel]], rows: Iterable[Any],
+                  pagination: Any = None) -> "ColumnarResults":
+        """
+        Build the columns from rows (raw dicts from the JSON or CSV endpoints, or schema items).
+
+        :param schema: Paginated list schema of the rows
+        :type schema: Type[BaseModel], optional
+        :param rows: Rows, consumed one at a time
+        :type rows: Iterable[dict | BaseModel]
+        :param pagination: Pagination of the response, if any
+        :type pagination: Any, optional
+        :rtype: ColumnarResults
+        """
+        results = cls(schema, pagination)
+        results.extend(rows)
+        return results
+
+    @classmethod
+    def from_page(cls, schema: Optional[Type[BaseModel]], data: Dict[str, Any],
+                  filter_fn: Callable[[RowView], bool] = None) -> "ColumnarResults":
+        """
+        Build the columns from a normalized page (``{"pagination": ..., "results": ...}``).
+
+        :param schema: Paginated list schema of the rows
+        :type schema: Type[BaseModel], optional
+        :param data: Page returned by the API client
+        :type data: dict
+        :param filter_fn: Optional function keeping the rows whose view it accepts
+        :type filter_fn: Callable[[RowView], bool], optional
+        :rtype: ColumnarResults
+        """
+        results = cls.from_rows(schema, data.get("results") or [], data.get("pagination"))
+        return results.filter(filter_fn) if filter_fn else results
+
+    def extend(self, rows: Iterable[Any]) -> None:
+        """
+        Append rows. Keys not declared by the schema become new object columns.
+        """
+        keys = self._keys
+        columns = [(key, self.columns[name]) for key, name in keys.items()]
+        for row in rows:
+            if isinstance(row, BaseModel):
+                row = row.model_dump(by_alias=True)
+            if not row.keys() <= keys.keys():
+                for key in row.keys() - keys.keys():
+                    columns.append((key, self._add_column(key, key, OBJECT)))
+            for key, column in columns:
+                column.append(row.get(key))
+            self._length += 1
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __getitem__(self, i: int) -> RowView:
+        if i < 0:
+            i += self._length
+        if not 0 <= i < self._length:
+            raise IndexError(i)
+        return RowView(self, i)
+
+    def __iter__(self) -> Iterator[RowView]:
+        return (RowView(self, i) for i in range(self._length))
+
+    @property
+    def results(self) -> List[RowView]:
+        """
+        Row views of every row, for code written against the ``results`` of list schemas.
+        """
+        return list(self)
+
+    def row(self, i: int) -> Dict[str, Any]:
+        """
+        Return row ``i`` as a dict keyed by column name.
+        """
+        return {name: column.get(i) for name, column in self.columns.items()}
+
+    def model(self, i: int) -> BaseModel:
+        """
+        Build and validate the schema item of row ``i``.
+        """
+        if self.schema is None:
+            raise ValueError("ColumnarResults has no schema to build models from")
+        row = {key: self.columns[name].get(i) for key, name in self._keys.items()}
+        return results_validator(self.schema)([row])[0]
+
+    def take(self, indices: Sequence[int]) -> "ColumnarResults":
+        """
+        Return a new container with the rows at ``indices``.
+        """
+        indices = list(indices)
+        results = ColumnarResults(None, self.pagination)
+        results.schema = self.schema
+        results.columns = {name: column.take(indices) for name, column in self.columns.items()}
+        results._keys = dict(self._keys)
+        results._length = len(indices)
+        return results
+
+    def filter(self, fn: Callable[[RowView], bool]) -> "ColumnarResults":
+        """
+        Return a new container with the rows for which ``fn(row_view)`` is true.
+        """
+        return self.take([i for i in range(self._length) if fn(RowView(self, i))])
+
+    def to_numpy(self) -> Dict[str, Any]:
+        """
+        Return a dict of NumPy arrays, one per column (zero-copy for typed columns, see :meth:`Column.to_numpy`).
+        """
+        return {name: column.to_numpy() for name, column in self.columns.items()}
+
+    def to_pandas(self):
+        """
+        Return a pandas DataFrame.
+
+        Typed columns without missing values wrap the underlying buffers; columns with missing
+        values use the nullable pandas dtypes. String columns become categoricals built from
+        the dictionary codes.
+        """
+        pd = _import("pandas")
+        nullable = {INT: pd.arrays.IntegerArray, FLOAT: pd.arrays.FloatingArray, BOOL: pd.arrays.BooleanArray}
+        data = {}
+        for name, column in self.columns.items():
+            complete = all(column.valid)
+            if column.kind == STRING:
+                data[name] = pd.Categorical.from_codes(column.codes(), categories=column.categories)
+            elif column.kind in nullable and not complete:
+                data[name] = nullable[column.kind](column.to_numpy(), column.mask())
+            elif column.kind == DATETIME:
+                values = pd.Series(column.to_numpy(), copy=False).dt.tz_localize("UTC")
+                data[name] = values if complete else values.mask(column.mask())
+            else:
+                data[name] = column.to_numpy()
+        return pd.DataFrame(data, copy=False)
+
+    def to_arrow(self):
+        """
+        Return a pyarrow Table. String columns become dictionary arrays.
+        """
+        pa = _import("pyarrow")
+        arrays = {}
+        for name, column in self.columns.items():
+            mask = None if all(column.valid) else column.mask()
+            if column.kind == STRING:
+                indices = pa.array(column.codes(), mask=mask)
+                arrays[name] = pa.DictionaryArray.from_arrays(indices, pa.array(column.categories, pa.string()))
+            elif column.kind == DATETIME:
+                arrays[name] = pa.array(column.to_numpy(), type=pa.timestamp("us", tz="UTC"), mask=mask)
+            elif column.kind == OBJECT:
+                arrays[name] = pa.array([column.get(i) for i in range(len(column))])
+            else:
+                arrays[name] = pa.array(column.to_numpy(), mask=mask)
+        return pa.table(arrays)
+
+
+def _item_models(schema: Optional[Type[BaseModel]]) -> List[Type[BaseModel]]:
+    """
+    Item models of the ``results`` of a list schema (every member of a union).
+    """
+    if schema is None or "results" not in getattr(schema, "model_fields", {}):
+        return []
+
+    def members(tp):
+        if isinstance(tp, type) and issubclass(tp, BaseModel):
+            return [tp]
+        return [m for arg in get_args(tp) for m in members(arg)]
+
+    tp, _ = strip_optional(schema.model_fields["results"].annotation)
+    return members(tp)
+
+
+def _schema_columns(schema: Optional[Type[BaseModel]]) -> List[Tuple[str, str, str]]:
+    """
+    Columns (name, input key, kind) declared by the item models of ``schema``, in declaration order.
+    """
+    columns = {}
+    for model in _item_models(schema):
+        for name, field in model.model_fields.items():
+            if name not in columns:
+                tp, _ = strip_optional(field.annotation)
+                columns[name] = (name, field.alias or name, _KINDS.get(tp, OBJECT))
+    return list(columns.values())
@@ -0,0 +1,280 @@
+"""
+Checkpoint of bulk media downloads.
+
+Defines:
+    - ManifestEntry: one completed download (mediaID, relative path, size and SHA-256).
+    - DownloadManifest: append-only JSONL manifest kept in the download folder, used to
+      skip completed files when a download is resumed or a mirror is synchronized.
+    - part_path, sha256_file: helpers for partially written (``.part``) files.
+    - PartFile: a media being written to its ``.part`` file, renamed into place and recorded
+      in the manifest once complete.
+
+Each completed file is appended as one JSON line as soon as it is renamed into place, so
+the manifest survives the process being killed; a truncated last line is ignored when it
+is loaded.
+"""
+import hashlib
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, Optional, Union
+
+import attr
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = ".trapper_manifest.jsonl"
+PART_SUFFIX = ".part"
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def part_path(path: Union[str, Path]) -> Path:
+    """
+    Return the path where ``path`` is written until its download is complete.
+    """
+    path = Path(path)
+    return path.with_name(path.name + PART_SUFFIX)
+
+
+def sha256_file(path: Union[str, Path], digest: "hashlib._Hash" = None) -> "hashlib._Hash":
+    """
+    Feed the content of a file to a SHA-256 digest (a new one by default) and return it.
+    """
+    digest = digest or hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest
+
+
+@attr.s(slots=True, frozen=True)
+class ManifestEntry:
+    """
+    Completed download recorded in a :class:`DownloadManifest`.
+
+    :param mediaID: ID of the media
+    :type mediaID: str
+    :param path: Path of the file, relative to the download folder
+    :type path: str
+    :param size: Size of the file in bytes
+    :type size: int
+    :param sha256: SHA-256 of the file (hex)
+    :type sha256: str
+    :param fingerprint: Remote version of the media (file name and timestamp) when it was downloaded
+    :type fingerprint: str, optional
+    """
+    mediaID: str = attr.ib(converter=str)
+    path: str = attr.ib()
+    size: int = attr.ib()
+    sha256: str = attr.ib()
+    fingerprint: Optional[str] = attr.ib(default=None)
+
+
+@attr.s
+class DownloadManifest:
+    """
+    JSONL manifest of the media already downloaded into a folder.
+
+    Examples
+    --------
+    manifest = DownloadManifest(Path("downloads/trapper_download_media_33"))
+    if manifest.completed(media.mediaID) is None:
+        ...
+        manifest.record(media.mediaID, path, size, sha256)
+
+    :param folder: Download folder; the manifest file is kept inside it
+    :type folder: Path
+    :param name: File name of the manifest, defaults to ``.trapper_manifest.jsonl``
+    :type name: str, optional
+    """
+    folder: Path = attr.ib(converter=Path)
+    name: str = attr.ib(default=MANIFEST_NAME)
+
+    _entries: Dict[str, ManifestEntry] = attr.ib(init=False, repr=False, factory=dict)
+    _needs_newline: bool = attr.ib(init=False, repr=False, default=False)
+    _lock: threading.Lock = attr.ib(init=False, repr=False, eq=False, factory=threading.Lock)
+
+    def __attrs_post_init__(self):
+        self.load()
+
+    @property
+    def path(self) -> Path:
+        return self.folder / self.name
+
+    def load(self) -> None:
+        """
+        (Re)load the entries of the manifest file, if it exists.
+        """
+        entries = {}
+        line = "\n"
+        if self.path.exists():
+            with open(self.path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = ManifestEntry(**json.loads(line))
+                    except (ValueError, TypeError):
+                        # Última línea incompleta si el proceso murió mientras se escribía
+                        logger.debug("Ignoring invalid manifest line: %r", line)
+                        continue
+                    entries[entry.mediaID] = entry
+        self._entries = entries
+        self._needs_newline = not line.endswith("\n")
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, media_id: Any) -> bool:
+        return str(media_id) in self._entries
+
+    def __iter__(self) -> Iterator[ManifestEntry]:
+        return iter(list(self._entries.values()))
+
+    def get(self, media_id: Any) -> Optional[ManifestEntry]:
+        return self._entries.get(str(media_id))
+
+    def completed(self, media_id: Any, verify: bool = False) -> Optional[Path]:
+        """
+        Return the path of a completed download, or None if it must be downloaded (again).
+
+        A download is completed when it is recorded and the file still exists with the
+        recorded size; with ``verify`` its SHA-256 is checked too.
+
+        :param media_id: ID of the media
+        :type media_id: Any
+        :param verify: Also check the checksum (reads the whole file), defaults to False
+        :type verify: bool, optional
+        :rtype: Path, optional
+        """
+        entry = self.get(media_id)
+        if entry is None:
+            return None
+        path = self.folder / entry.path
+        try:
+            if path.stat().st_size != entry.size:
+                return None
+        except OSError:
+            return None
+        if verify and sha256_file(path).hexdigest() != entry.sha256:
+            return None
+        return path
+
+    def record(self, media_id: Any, path: Union[str, Path], size: int, sha256: str,
+               fingerprint: str = None) -> ManifestEntry:
+        """
+        Record a completed download and append it to the manifest file.
+        """
+        relative = Path(os.path.relpath(Path(path).resolve(), self.folder.resolve())).as_posix()
+        entry = ManifestEntry(media_id, relative, size, sha256, fingerprint)
+        line = json.dumps(attr.asdict(entry)) + "\n"
+        with self._lock:
+            self.folder.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                if self._needs_newline:
+                    f.write("\n")
+                    self._needs_newline = False
+                f.write(line)
+            self._entries[entry.mediaID] = entry
+        return entry
+
+    def discard(self, media_ids: Iterable[Any]) -> int:
+        """
+        Remove entries and rewrite the manifest file without them.
+
+        The file is written to a temporary file and renamed, so it is never left half written.
+
+        :return: Number of entries removed
+        :rtype: int
+        """
+        with self._lock:
+            removed = [self._entries.pop(str(m)) for m in media_ids if str(m) in self._entries]
+            if not removed:
+                return 0
+            tmp = self.path.with_name(self.path.name + ".tmp")
+            with open(tmp, "w", encoding="utf-8") as f:
+                for entry in self._entries.values():
+                    f.write(json.dumps(attr.asdict(entry)) + "\n")
+            os.replace(tmp, self.path)
+            self._needs_newline = False
+        return len(removed)
+
+
+@attr.s
+class PartFile:
+    """
+    Media file being downloaded to its ``.part`` file, with its size and SHA-256 so far.
+
+    Used by the synchronous and asynchronous media downloads: the caller asks the server for
+    the bytes from :attr:`offset`, calls :meth:`open` with the offset the response actually
+    starts at, feeds the chunks to :meth:`write` and renames the file into place with :meth:`commit`.
+
+    Examples
+    --------
+    part = PartFile(path, resume=True, manifest=manifest)
+    resp = get(url, offset=part.offset)
+    with part.open(offset_of(resp)):
+        for chunk in resp.iter_content(8192):
+            part.write(chunk)
+    part.commit(media.mediaID, fingerprint)
+
+    :param path: Final path of the file
+    :type path: Path
+    :param resume: Continue an existing ``.part`` file, defaults to False
+    :type resume: bool, optional
+    :param manifest: Manifest where the completed file is recorded; the SHA-256 is only computed with one
+    :type manifest: DownloadManifest, optional
+    """
+    path: Path = attr.ib(converter=Path)
+    resume: bool = attr.ib(default=False)
+    manifest: Optional[DownloadManifest] = attr.ib(default=None)
+
+    partial: Path = attr.ib(init=False)
+    offset: int = attr.ib(init=False)
+    size: int = attr.ib(init=False, default=0)
+    _digest: Optional["hashlib._Hash"] = attr.ib(init=False, repr=False, default=None)
+    _file: Optional[BinaryIO] = attr.ib(init=False, repr=False, default=None)
+
+    def __attrs_post_init__(self):
+        self.partial = part_path(self.path)
+        self.offset = self.partial.stat().st_size if self.resume and self.partial.exists() else 0
+
+    def open(self, offset: int) -> "PartFile":
+        """
+        Start writing at ``offset``: the size of the ``.part`` file to append to, or 0 to start over.
+        """
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.offset = self.size = offset
+        if self.manifest is not None:
+            self._digest = sha256_file(self.partial) if offset else hashlib.sha256()
+        self._file = open(self.partial, "ab" if offset else "wb")
+        return self
+
+    def write(self, chunk: bytes) -> None:
+        if chunk:
+            self._file.write(chunk)
+            self.size += len(chunk)
+            if self._digest is not None:
+                self._digest.update(chunk)
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self) -> "PartFile":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+    def commit(self, media_id: Any, fingerprint: str = None) -> Path:
+        """
+        Rename the complete file into place and record it in the manifest, if any.
+        """
+        self.close()
+        os.replace(self.partial, self.path)
+        if self.manifest is not None:
+            self.manifest.record(media_id, self.path, self.size, self._digest.hexdigest(), fingerprint)
+        return self.path
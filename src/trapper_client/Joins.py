@@ -0,0 +1,240 @@
+"""
+Hash joins between media and observation results.
+
+Defines:
+    - HashIndex: rows grouped by a key (``mediaID`` and ``deploymentID`` by default).
+    - inner_join, left_join: join a stream of rows with an index.
+    - group_by_media: each media with the list of its observations.
+    - label_sets: each media with the set of values of one observation field (e.g. species),
+      as used to build per-image labels for training.
+
+Rows can be schema items (``TrapperMedia``, ``TrapperObservationResults*``), raw dicts from
+the JSON or CSV endpoints (``mediaID`` as a string is fine), or a :class:`ColumnarResults`,
+whose key columns are read directly from the column buffers. One side is indexed once and
+the other is streamed, so every join is linear in the number of rows.
+"""
+import logging
+from typing import Any, Dict, FrozenSet, Hashable, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+import attr
+
+from trapper_client.Columns import STRING, ColumnarResults
+
+logger = logging.getLogger(__name__)
+
+MEDIA_KEY = ("mediaID", "deploymentID")
+
+# Tipos de las claves: los CSV devuelven todo como texto
+_KEY_TYPES = {"mediaID": int}
+
+
+def _normalize(name: str, value: Any) -> Any:
+    if value is None or value == "":
+        return None
+    try:
+        return _KEY_TYPES.get(name, str)(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _field(row: Any, name: str) -> Any:
+    return row.get(name) if isinstance(row, Mapping) else getattr(row, name, None)
+
+
+def row_key(row: Any, key: Sequence[str] = MEDIA_KEY) -> Optional[Tuple[Hashable, ...]]:
+    """
+    Return the key of a row, or None if any of its fields is missing.
+    """
+    values = tuple(_normalize(name, _field(row, name)) for name in key)
+    return None if None in values else values
+
+
+def _column_keys(results: ColumnarResults, key: Sequence[str]) -> Iterator[Optional[Tuple[Hashable, ...]]]:
+    """
+    Keys of every row of a columnar container, read from the column buffers.
+    """
+    columns = []
+    for name in key:
+        column = results.columns.get(name)
+        if column is None:
+            raise KeyError(f"Column {name} not found")
+        if column.kind == STRING:
+            categories = column.categories
+            values = [_normalize(name, categories[c]) if ok else None for c, ok in zip(column.values, column.valid)]
+        else:
+            values = [_normalize(name, v) if ok else None for v, ok in zip(column.values, column.valid)]
+        columns.append(values)
+    for values in zip(*columns):
+        yield None if None in values else values
+
+
+def _keyed(rows: Iterable[Any], key: Sequence[str]) -> Iterator[Tuple[Optional[Tuple[Hashable, ...]], Any]]:
+    if isinstance(rows, ColumnarResults):
+        return zip(_column_keys(rows, key), rows)
+    return ((row_key(row, key), row) for row in rows)
+
+
+@attr.s
+class HashIndex:
+    """
+    Rows grouped by key.
+
+    Examples
+    --------
+    observations = HashIndex.build(client.observations_results.iter_by_classification_project(33))
+    for media in client.media.where(cp=33):
+        print(media.fileName, len(observations.get(media)))
+
+    :param key: Fields of the key, defaults to ``("mediaID", "deploymentID")``
+    :type key: Sequence[str], optional
+    """
+    key: Tuple[str, ...] = attr.ib(default=MEDIA_KEY, converter=tuple)
+
+    _buckets: Dict[Tuple[Hashable, ...], List[Any]] = attr.ib(init=False, repr=False, factory=dict)
+    _size: int = attr.ib(init=False, default=0)
+
+    @classmethod
+    def build(cls, rows: Iterable[Any], key: Sequence[str] = MEDIA_KEY) -> "HashIndex":
+        """
+        Index rows (consumed one at a time). Rows with a missing key field are skipped.
+
+        :param rows: Rows, or a columnar container
+        :type rows: Iterable[Any] | ColumnarResults
+        :param key: Fields of the key
+        :type key: Sequence[str], optional
+        :rtype: HashIndex
+        """
+        index = cls(key)
+        index.extend(rows)
+        return index
+
+    def extend(self, rows: Iterable[Any]) -> None:
+        """
+        Add rows to the index.
+        """
+        buckets = self._buckets
+        skipped = 0
+        for k, row in _keyed(rows, self.key):
+            if k is None:
+                skipped += 1
+                continue
+            bucket = buckets.get(k)
+            if bucket is None:
+                buckets[k] = [row]
+            else:
+                bucket.append(row)
+            self._size += 1
+        if skipped:
+            logger.debug("Skipped %d rows without %s", skipped, "/".join(self.key))
+
+    def get(self, row_or_key: Any) -> List[Any]:
+        """
+        Return the rows with the key of ``row_or_key`` (a row or a key tuple), or an empty list.
+        """
+        k = row_or_key if isinstance(row_or_key, tuple) else row_key(row_or_key, self.key)
+        return self._buckets.get(k, []) if k is not None else []
+
+    def keys(self):
+        return self._buckets.keys()
+
+    def items(self):
+        return self._buckets.items()
+
+    def __contains__(self, row_or_key: Any) -> bool:
+        return bool(self.get(row_or_key))
+
+    def __len__(self) -> int:
+        """
+        Number of indexed rows (see :meth:`keys` for the number of distinct keys).
+        """
+        return self._size
+
+
+def _index(rows: Any, key: Sequence[str]) -> HashIndex:
+    if isinstance(rows, HashIndex):
+        if rows.key != tuple(key):
+            raise ValueError(f"Index key {rows.key} does not match the join key {tuple(key)}")
+        return rows
+    return HashIndex.build(rows, key)
+
+
+def inner_join(left: Iterable[Any], right: Any, key: Sequence[str] = MEDIA_KEY) -> Iterator[Tuple[Any, Any]]:
+    """
+    Yield ``(left_row, right_row)`` for every pair of rows with the same key.
+
+    ``left`` is streamed; ``right`` is indexed first (or used as is if it is a :class:`HashIndex`).
+
+    Examples
+    --------
+    for media, observation in inner_join(client.media.where(cp=33), observations):
+        print(media.filePath, observation["scientificName"])
+
+    :param left: Rows streamed in order (e.g. media)
+    :type left: Iterable[Any] | ColumnarResults
+    :param right: Rows to index (e.g. observations) or a prebuilt index
+    :type right: Iterable[Any] | ColumnarResults | HashIndex
+    :param key: Fields of the key
+    :type key: Sequence[str], optional
+    :rtype: Iterator[Tuple[Any, Any]]
+    """
+    index = _index(right, key)
+    for k, row in _keyed(left, index.key):
+        for match in index.get(k) if k is not None else ():
+            yield row, match
+
+
+def left_join(left: Iterable[Any], right: Any, key: Sequence[str] = MEDIA_KEY) -> Iterator[Tuple[Any, Any]]:
+    """
+    Like :func:`inner_join`, but rows of ``left`` without matches are yielded once as ``(left_row, None)``.
+    """
+    index = _index(right, key)
+    for k, row in _keyed(left, index.key):
+        matches = index.get(k) if k is not None else None
+        if matches:
+            for match in matches:
+                yield row, match
+        else:
+            yield row, None
+
+
+def group_by_media(media: Iterable[Any], observations: Any,
+                   key: Sequence[str] = MEDIA_KEY) -> Iterator[Tuple[Any, List[Any]]]:
+    """
+    Yield ``(media, observations_of_media)`` for every media, with an empty list if it has none.
+
+    :param media: Media rows, streamed in order
+    :type media: Iterable[Any] | ColumnarResults
+    :param observations: Observation rows or a prebuilt index
+    :type observations: Iterable[Any] | ColumnarResults | HashIndex
+    :param key: Fields of the key
+    :type key: Sequence[str], optional
+    :rtype: Iterator[Tuple[Any, List[Any]]]
+    """
+    index = _index(observations, key)
+    for k, row in _keyed(media, index.key):
+        yield row, index.get(k) if k is not None else []
+
+
+def label_sets(media: Iterable[Any], observations: Any, field: str = "scientificName",
+               key: Sequence[str] = MEDIA_KEY) -> Iterator[Tuple[Any, FrozenSet[Any]]]:
+    """
+    Yield ``(media, labels)`` for every media, where ``labels`` are the distinct non-empty
+    values of ``field`` in its observations.
+
+    Examples
+    --------
+    for media, species in label_sets(client.media.where(cp=33), observations):
+        writer.writerow([media.fileName, ";".join(sorted(species))])
+
+    :param media: Media rows, streamed in order
+    :type media: Iterable[Any] | ColumnarResults
+    :param observations: Observation rows or a prebuilt index
+    :type observations: Iterable[Any] | ColumnarResults | HashIndex
+    :param field: Observation field used as label, defaults to ``scientificName``
+    :type field: str, optional
+    :param key: Fields of the key
+    :type key: Sequence[str], optional
+    :rtype: Iterator[Tuple[Any, FrozenSet[Any]]]
+    """
+    for row, matches in group_by_media(media, observations, key):
+        yield row, frozenset(v for v in (_field(m, field) for m in matches) if v not in (None, ""))
@@ -0,0 +1,108 @@
+"""
+Helpers to keep logging cheap on the request hot path.
+
+Defines:
+    - LazyRepr: defers formatting an object until a log record is actually emitted,
+      truncating the result.
+    - Sampler: thread-safe "one in N" sampler for per-item debug messages.
+    - payload_logger: logger used by the opt-in payload dump mode.
+
+Messages must use ``%`` placeholders (``logger.debug("Page %s", lazy(page))``) so that
+nothing is formatted when the level is disabled.
+"""
+import itertools
+import json
+import logging
+import os
+import threading
+from typing import Any, Callable
+
+import attr
+
+MAX_LENGTH = 500
+DUMP_PAYLOADS_ENV = "TRAPPER_DUMP_PAYLOADS"
+
+payload_logger = logging.getLogger("trapper_client.payloads")
+
+
+def dump_payloads_from_env() -> bool:
+    """
+    Tell whether the payload dump mode is enabled with the ``TRAPPER_DUMP_PAYLOADS`` environment variable.
+    """
+    return os.environ.get(DUMP_PAYLOADS_ENV, "").strip().lower() in ("1", "true", "yes", "on")
+
+
+def _truncate(text: str, max_length: int) -> str:
+    if max_length is None or len(text) <= max_length:
+        return text
+    return f"{text[:max_length]}... [{len(text) - max_length} more chars]"
+
+
+@attr.s(slots=True, repr=False)
+class LazyRepr:
+    """
+    Object whose string form is computed only when a log record is formatted.
+
+    :param obj: Object to format
+    :type obj: Any
+    :param formatter: Function turning ``obj`` into a string, defaults to :func:`repr`
+    :type formatter: Callable[[Any], str], optional
+    :param max_length: Maximum number of characters kept (None = no limit), defaults to 500
+    :type max_length: int, optional
+    """
+    obj: Any = attr.ib()
+    formatter: Callable[[Any], str] = attr.ib(default=repr)
+    max_length: int = attr.ib(default=MAX_LENGTH)
+
+    def __str__(self) -> str:
+        return _truncate(self.formatter(self.obj), self.max_length)
+
+    __repr__ = __str__
+
+
+def lazy(obj: Any, max_length: int = MAX_LENGTH) -> LazyRepr:
+    """
+    Defer and truncate the ``repr`` of ``obj``.
+    """
+    return LazyRepr(obj, repr, max_length)
+
+
+def lazy_json(obj: Any, max_length: int = MAX_LENGTH, indent: int = None) -> LazyRepr:
+    """
+    Defer and truncate the JSON serialization of ``obj``.
+    """
+    return LazyRepr(obj, lambda o: json.dumps(o, indent=indent, default=str), max_length)
+
+
+def summary(data: Any) -> LazyRepr:
+    """
+    Describe a decoded payload by its shape (pagination and number of results) instead of its content.
+    """
+    def describe(d: Any) -> str:
+        if isinstance(d, dict) and "results" in d:
+            return f"{len(d.get('results') or [])} results, pagination={d.get('pagination')}"
+        if hasattr(d, "results") and hasattr(d, "pagination"):
+            return f"{type(d).__name__} with {len(d.results or [])} results, pagination={d.pagination!r}"
+        if isinstance(d, (list, tuple)):
+            return f"{len(d)} items"
+        return type(d).__name__
+    return LazyRepr(data, describe, None)
+
+
+@attr.s
+class Sampler:
+    """
+    Thread-safe sampler letting through the first call and then one call in ``every``.
+
+    :param every: Sampling period, 1 lets every call through, defaults to 100
+    :type every: int, optional
+    """
+    every: int = attr.ib(default=100)
+
+    _counter: itertools.count = attr.ib(init=False, repr=False, factory=itertools.count)
+    _lock: threading.Lock = attr.ib(init=False, repr=False, eq=False, factory=threading.Lock)
+
+    def __call__(self) -> bool:
+        with self._lock:
+            n = next(self._counter)
+        return n % max(self.every, 1) == 0
@@ -0,0 +1,261 @@
+"""
+Per-media predicates over the observations of a classification project.
+
+Defines:
+    - MediaPredicate: tells whether all (or any) of the observations of a media satisfy a test.
+    - ONLY_ANIMALS, ANY_HUMAN, BLANK_ONLY, species(): ready-made predicates.
+    - MediaFlags: compact per-media state folded from a stream of observation rows, that can
+      evaluate several predicates in a single pass.
+
+Observation rows are the raw rows of the results export (``mediaID``, ``observationType``,
+``scientificName``...) or any mapping with the same keys, so they are folded without being
+validated or kept in memory: only two bits per media and predicate are stored.
+"""
+import contextlib
+import threading
+from typing import Any, AsyncIterable, Callable, Dict, Iterable, Mapping, Optional, Tuple
+
+import attr
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+ALL = "all"
+ANY = "any"
+
+# Bits de estado por predicado: alguna observación cumple / alguna no cumple
+_SEEN_TRUE = 1
+_SEEN_FALSE = 2
+
+
+def _field(row: Any, name: str) -> Any:
+    return row.get(name) if isinstance(row, Mapping) else getattr(row, name, None)
+
+
+def _media_id(value: Any) -> Optional[int]:
+    if value is None or value == "":
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+@attr.s(frozen=True)
+class MediaPredicate:
+    """
+    Condition on the observations of a media.
+
+    With ``mode="all"`` a media matches when it has observations and all of them pass
+    ``test``; with ``mode="any"`` when at least one does.
+
+    Examples
+    --------
+    deer = MediaPredicate("deer", lambda row: row["scientificName"] == "Cervus elaphus", mode="any")
+
+    :param name: Name of the predicate (used in logs)
+    :type name: str
+    :param test: Test applied to each observation row
+    :type test: Callable[[Mapping], bool]
+    :param mode: ``"all"`` or ``"any"``, defaults to ``"all"``
+    :type mode: str, optional
+    """
+    name: str = attr.ib()
+    test: Callable[[Any], bool] = attr.ib(repr=False)
+    mode: str = attr.ib(default=ALL, validator=attr.validators.in_((ALL, ANY)))
+
+    def decided(self, state: int) -> Optional[bool]:
+        """
+        Return the result implied by a partial state, or None while more observations may change it.
+
+        An "any" predicate is decided as soon as one observation passes, an "all" predicate
+        as soon as one fails.
+        """
+        if self.mode == ANY and state & _SEEN_TRUE:
+            return True
+        if self.mode == ALL and state & _SEEN_FALSE:
+            return False
+        return None
+
+    def result(self, state: int) -> bool:
+        """
+        Return the result once every observation has been folded.
+        """
+        if self.mode == ANY:
+            return bool(state & _SEEN_TRUE)
+        return state == _SEEN_TRUE
+
+
+def observation_type(value: str, mode: str = ALL) -> MediaPredicate:
+    """
+    Predicate on the ``observationType`` of the observations (``animal``, ``human``, ``blank``...).
+    """
+    return MediaPredicate(f"{mode}:{value}", lambda row: _field(row, "observationType") == value, mode)
+
+
+def species(*names: str) -> MediaPredicate:
+    """
+    Predicate matching media with at least one observation of any of the given scientific names.
+    """
+    wanted = frozenset(names)
+    return MediaPredicate(f"species:{','.join(sorted(wanted))}",
+                          lambda row: _field(row, "scientificName") in wanted, ANY)
+
+
+ONLY_ANIMALS = observation_type("animal", ALL)
+ANY_HUMAN = observation_type("human", ANY)
+BLANK_ONLY = observation_type("blank", ALL)
+
+
+@attr.s
+class MediaFlags:
+    """
+    Per-media state of one or more predicates, folded from a stream of observation rows.
+
+    Each media takes one integer holding two bits per predicate, so the observations are
+    never kept. :meth:`fold` can run in a background thread (or :meth:`afold` in an asyncio
+    task) while the media are streamed:
+    the bits only ever get set, so :meth:`decided` answers safely with partial data. If the
+    fold fails or is cancelled, :meth:`decided`, :meth:`matches` and :meth:`wait` raise
+    instead of answering from incomplete flags.
+
+    Examples
+    --------
+    flags = MediaFlags([ONLY_ANIMALS, ANY_HUMAN])
+    flags.fold(trapper_client.observations_results.iter_by_classification_project(33))
+    flags.matches(1234, ONLY_ANIMALS)
+
+    :param predicates: Predicates to evaluate
+    :type predicates: Sequence[MediaPredicate]
+    """
+    predicates: Tuple[MediaPredicate, ...] = attr.ib(converter=tuple)
+
+    _states: Dict[int, int] = attr.ib(init=False, repr=False, factory=dict)
+    _complete: threading.Event = attr.ib(init=False, repr=False, eq=False, factory=threading.Event)
+    _finished: threading.Event = attr.ib(init=False, repr=False, eq=False, factory=threading.Event)
+    _cancelled: threading.Event = attr.ib(init=False, repr=False, eq=False, factory=threading.Event)
+    _error: Optional[BaseException] = attr.ib(init=False, repr=False, eq=False, default=None)
+    _skipped: int = attr.ib(init=False, repr=False, eq=False, default=0)
+
+    def __len__(self) -> int:
+        return len(self._states)
+
+    @property
+    def complete(self) -> bool:
+        """
+        Whether :meth:`fold` consumed every observation (False if it failed or was cancelled).
+        """
+        return self._complete.is_set()
+
+    def wait(self, timeout: float = None) -> bool:
+        """
+        Wait until :meth:`fold` has consumed every observation.
+
+        :return: False if the timeout expired first
+        :raises: The error of the fold, or RuntimeError if it was cancelled
+        """
+        if not self._finished.wait(timeout):
+            return False
+        self._check()
+        return True
+
+    def add(self, row: Any) -> bool:
+        """
+        Fold one observation row. Rows without a valid ``mediaID`` are skipped.
+
+        :return: Whether the row was folded
+        """
+        media_id = _media_id(_field(row, "mediaID"))
+        if media_id is None:
+            self._skipped += 1
+            return False
+        state = self._states.get(media_id, 0)
+        for i, predicate in enumerate(self.predicates):
+            state |= (_SEEN_TRUE if predicate.test(row) else _SEEN_FALSE) << (2 * i)
+        self._states[media_id] = state
+        return True
+
+    def fold(self, rows: Iterable[Any]) -> "MediaFlags":
+        """
+        Fold every observation row and mark the flags as complete.
+
+        An error while reading the rows is kept (see :meth:`decided`) and raised.
+        """
+        with self._folding():
+            for row in rows:
+                if self._cancelled.is_set():
+                    logger.debug("Folding of observations cancelled")
+                    return self
+                self.add(row)
+            self._complete.set()
+        return self
+
+    async def afold(self, rows: AsyncIterable[Any]) -> "MediaFlags":
+        """
+        Like :meth:`fold`, for an asynchronous stream of rows.
+        """
+        with self._folding():
+            async for row in rows:
+                if self._cancelled.is_set():
+                    logger.debug("Folding of observations cancelled")
+                    return self
+                self.add(row)
+            self._complete.set()
+        return self
+
+    @contextlib.contextmanager
+    def _folding(self):
+        # Guarda el error de la lectura y marca el final, termine como termine
+        try:
+            yield
+        except BaseException as e:
+            self._error = e
+            raise
+        finally:
+            self._finished.set()
+        if self._skipped:
+            logger.debug("Skipped %d observation rows without mediaID", self._skipped)
+        if self.complete:
+            logger.debug("Folded observations of %d media", len(self._states))
+
+    def cancel(self) -> None:
+        """
+        Stop a :meth:`fold` running in another thread.
+        """
+        self._cancelled.set()
+
+    def _check(self) -> None:
+        if self._error is not None:
+            raise self._error
+        if self._cancelled.is_set() and not self.complete:
+            raise RuntimeError("Folding of observations was cancelled")
+
+    def _state(self, media_id: int, predicate: MediaPredicate) -> int:
+        i = self.predicates.index(predicate)
+        return (self._states.get(int(media_id), 0) >> (2 * i)) & 3
+
+    def decided(self, media_id: int, predicate: MediaPredicate = None) -> Optional[bool]:
+        """
+        Return whether a media matches, or None if it cannot be known until the fold is complete.
+
+        :raises: The error of the fold, or RuntimeError if it was cancelled
+        """
+        self._check()
+        if self.complete:
+            return self.matches(media_id, predicate)
+        predicates = [predicate] if predicate is not None else self.predicates
+        results = [p.decided(self._state(media_id, p)) for p in predicates]
+        if False in results:
+            return False
+        return True if all(results) else None
+
+    def matches(self, media_id: int, predicate: MediaPredicate = None) -> bool:
+        """
+        Return whether a media matches ``predicate`` (all the predicates by default).
+
+        :raises: The error of the fold, or RuntimeError if it was cancelled
+        """
+        self._check()
+        predicates = [predicate] if predicate is not None else self.predicates
+        return all(p.result(self._state(media_id, p)) for p in predicates)
@@ -0,0 +1,401 @@
+"""
+Local SQLite mirror of a classification project.
+
+Defines:
+    - ProjectMirror: materializes the deployments, locations, collections, media and
+      observation results of a classification project into an indexed SQLite database,
+      refreshes it incrementally and answers queries locally.
+    - TableRefresh: outcome of the refresh of one table.
+
+Usually created with ``TrapperClient.mirror(cp_id, path)``. Every table keeps the key
+fields of its rows as indexed columns and the whole row as JSON in ``data`` (use
+``json_extract`` for the other fields). A refresh streams each listing once and only
+writes the rows whose content changed; rows no longer listed by the server are removed.
+Rows are downloaded in batches into a temporary staging table, and the table is only
+updated from it once the listing is complete, in a single transaction: queries are not
+blocked during the download and an interrupted refresh leaves the previous content in place.
+"""
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import attr
+
+from trapper_client.APIQuery import APIQuery
+from trapper_client.SQLiteStore import batches, open_database
+from trapper_client.Schemas import Coordinates
+from trapper_client.components.CollectionsComponent import CollectionIndex
+from trapper_client.components.MediaComponent import MediaComponent
+from trapper_client.components.ObservationsComponent import ObservationsResultsComponent
+
+logger = logging.getLogger(__name__)
+
+DEPLOYMENTS = "deployments"
+LOCATIONS = "locations"
+COLLECTIONS = "collections"
+MEDIA = "media"
+OBSERVATIONS = "observations"
+
+# Orden de refresco: las localizaciones se filtran por los deployments del proyecto
+TABLES = (DEPLOYMENTS, LOCATIONS, COLLECTIONS, MEDIA, OBSERVATIONS)
+
+BATCH_SIZE = 500
+
+
+def _get(name: str) -> Callable[[Dict[str, Any]], Any]:
+    def getter(row: Dict[str, Any]) -> Any:
+        value = row.get(name)
+        return None if value == "" else value
+    return getter
+
+
+def _coordinate(name: str) -> Callable[[Dict[str, Any]], Optional[float]]:
+    def getter(row: Dict[str, Any]) -> Optional[float]:
+        value = row.get("coordinates")
+        try:
+            if isinstance(value, str):
+                value = Coordinates.from_string(value).model_dump()
+            return float(value[name]) if value else None
+        except (ValueError, TypeError, KeyError):
+            return None
+    return getter
+
+
+@attr.s(frozen=True)
+class _Table:
+    name: str = attr.ib()
+    # (columna, tipo SQL, extractor); la primera es la clave primaria
+    columns: Tuple[Tuple[str, str, Callable[[Dict[str, Any]], Any]], ...] = attr.ib()
+    indexes: Tuple[Tuple[str, ...], ...] = attr.ib(default=())
+
+    @property
+    def key(self) -> str:
+        return self.columns[0][0]
+
+    def ddl(self) -> str:
+        columns = ", ".join(f"{name} {sql_type}" for name, sql_type, _ in self.columns)
+        statements = [
+            f"CREATE TABLE IF NOT EXISTS {self.name} ({columns}, data TEXT NOT NULL, digest TEXT NOT NULL, "
+            f"seen INTEGER NOT NULL, PRIMARY KEY ({self.key}))"
+        ]
+        for index in self.indexes:
+            statements.append(
+                f"CREATE INDEX IF NOT EXISTS {self.name}_{'_'.join(index)} ON {self.name} ({', '.join(index)})"
+            )
+        return ";\n".join(statements) + ";"
+
+    def values(self, row: Dict[str, Any]) -> List[Any]:
+        return [extract(row) for _, _, extract in self.columns]
+
+
+_TABLES = {
+    DEPLOYMENTS: _Table(DEPLOYMENTS, (
+        ("pk", "INTEGER", _get("pk")),
+        ("deployment_id", "TEXT", _get("deployment_id")),
+        ("deployment_code", "TEXT", _get("deployment_code")),
+        ("location_pk", "INTEGER", _get("location")),
+        ("location_id", "TEXT", _get("location_id")),
+        ("start_date", "TEXT", _get("start_date")),
+        ("end_date", "TEXT", _get("end_date")),
+    ), (("deployment_id",), ("location_pk",))),
+    LOCATIONS: _Table(LOCATIONS, (
+        ("pk", "INTEGER", _get("pk")),
+        ("location_id", "TEXT", _get("location_id")),
+        ("name", "TEXT", _get("name")),
+        ("latitude", "REAL", _coordinate("latitude")),
+        ("longitude", "REAL", _coordinate("longitude")),
+    ), (("location_id",),)),
+    COLLECTIONS: _Table(COLLECTIONS, (
+        ("pk", "INTEGER", _get("pk")),
+        ("collection_pk", "INTEGER", _get("collection_pk")),
+        ("name", "TEXT", _get("name")),
+        ("status", "TEXT", _get("status")),
+    ), (("collection_pk",),)),
+    MEDIA: _Table(MEDIA, (
+        ("media_id", "INTEGER", _get("mediaID")),
+        ("deployment_id", "TEXT", _get("deploymentID")),
+        ("timestamp", "TEXT", _get("timestamp")),
+        ("file_name", "TEXT", _get("fileName")),
+        ("file_path", "TEXT", _get("filePath")),
+        ("file_mediatype", "TEXT", _get("fileMediatype")),
+    ), (("deployment_id", "timestamp"), ("timestamp",))),
+    OBSERVATIONS: _Table(OBSERVATIONS, (
+        ("observation_id", "INTEGER", _get("observationID")),
+        ("media_id", "INTEGER", _get("mediaID")),
+        ("deployment_id", "TEXT", _get("deploymentID")),
+        ("event_id", "TEXT", _get("eventID")),
+        ("event_start", "TEXT", _get("eventStart")),
+        ("observation_type", "TEXT", _get("observationType")),
+        ("scientific_name", "TEXT", _get("scientificName")),
+        ("count", "INTEGER", _get("count")),
+        ("classification_timestamp", "TEXT", _get("classificationTimestamp")),
+    ), (("media_id",), ("deployment_id", "scientific_name"), ("scientific_name", "event_start"), ("event_start",))),
+}
+
+_META = "CREATE TABLE IF NOT EXISTS mirror_meta (name TEXT PRIMARY KEY, value TEXT);"
+
+
+@attr.s
+class TableRefresh:
+    """
+    Outcome of the refresh of one table of a :class:`ProjectMirror`.
+    """
+    table: str = attr.ib()
+    fetched: int = attr.ib(default=0)
+    inserted: int = attr.ib(default=0)
+    updated: int = attr.ib(default=0)
+    deleted: int = attr.ib(default=0)
+    skipped: bool = attr.ib(default=False)
+
+
+@attr.s
+class ProjectMirror:
+    """
+    Indexed SQLite mirror of a classification project.
+
+    Tables: ``deployments``, ``locations`` (those of the deployments of the project),
+    ``collections``, ``media`` and ``observations`` (the results export). Besides
+    :meth:`query`, a few common aggregations are provided.
+
+    Examples
+    --------
+    mirror = trapper_client.mirror(33, "project_33.sqlite")
+    mirror.species_per_deployment()
+    mirror.query("SELECT COUNT(*) AS n FROM media WHERE deployment_id = ?", ("dep_01",))
+    mirror.refresh(max_age=3600)
+
+    :param client: API client
+    :type client: APIClientBase
+    :param cp_id: ID of the classification project
+    :type cp_id: int
+    :param path: SQLite database file
+    :type path: str
+    """
+    client: Any = attr.ib(repr=False)
+    cp_id: int = attr.ib()
+    path: str = attr.ib(converter=str)
+
+    _conn: sqlite3.Connection = attr.ib(init=False, repr=False, default=None)
+    _lock: threading.RLock = attr.ib(init=False, repr=False, eq=False, factory=threading.RLock)
+    _refresh_lock: threading.Lock = attr.ib(init=False, repr=False, eq=False, factory=threading.Lock)
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        """
+        Return the SQLite connection, opening the database (and creating it) on first use.
+        """
+        if self._conn is None:
+            with self._lock:
+                if self._conn is None:
+                    conn = open_database(self.path, _META + "".join(table.ddl() for table in _TABLES.values()))
+                    self._check_project(conn)
+                    self._conn = conn
+        return self._conn
+
+    def _check_project(self, conn: sqlite3.Connection) -> None:
+        row = conn.execute("SELECT value FROM mirror_meta WHERE name = 'cp_id'").fetchone()
+        if row is None:
+            conn.execute("INSERT INTO mirror_meta VALUES ('cp_id', ?)", (str(self.cp_id),))
+        elif row[0] != str(self.cp_id):
+            conn.close()
+            raise ValueError(f"{self.path} is a mirror of classification project {row[0]}, not {self.cp_id}")
+
+    def close(self) -> None:
+        """
+        Close the database. It is opened again on the next use.
+        """
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def __enter__(self) -> "ProjectMirror":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    # ----------------------------------------------------------------------------------------------
+    # Refresh
+    # ----------------------------------------------------------------------------------------------
+
+    def refreshed_at(self, table: str) -> Optional[float]:
+        """
+        Return the time (epoch seconds) of the last completed refresh of a table, or None.
+        """
+        with self._lock:
+            row = self.connection.execute(
+                "SELECT value FROM mirror_meta WHERE name = ?", (f"refreshed_at:{table}",)
+            ).fetchone()
+        return float(row[0]) if row else None
+
+    def refresh(self, tables: Sequence[str] = None, max_age: float = None) -> Dict[str, TableRefresh]:
+        """
+        Bring the mirror up to date with the server.
+
+        :param tables: Tables to refresh, defaults to all of them
+        :type tables: Sequence[str], optional
+        :param max_age: Skip the tables refreshed less than ``max_age`` seconds ago, defaults to None (refresh all)
+        :type max_age: float, optional
+        :return: Outcome of the refresh by table
+        :rtype: dict[str, TableRefresh]
+        """
+        wanted = TABLES if tables is None else tables
+        unknown = set(wanted) - set(TABLES)
+        if unknown:
+            raise ValueError(f"Unknown tables: {', '.join(sorted(unknown))}. Must be in {', '.join(TABLES)}")
+
+        results = {}
+        for name in TABLES:
+            if name not in wanted:
+                continue
+            refreshed_at = self.refreshed_at(name)
+            if max_age is not None and refreshed_at is not None and time.time() - refreshed_at < max_age:
+                results[name] = TableRefresh(name, skipped=True)
+                continue
+            results[name] = self._load(_TABLES[name], self._rows(name))
+            logger.debug("Mirror of project %s: %s", self.cp_id, results[name])
+        return results
+
+    def _rows(self, name: str) -> Iterable[Dict[str, Any]]:
+        client, cp_id = self.client, self.cp_id
+        if name == DEPLOYMENTS:
+            return APIQuery(client, "/geomap/api/deployments", {"classification_project": cp_id})
+        if name == LOCATIONS:
+            with self._lock:
+                used = {pk for (pk,) in self.connection.execute("SELECT DISTINCT location_pk FROM deployments")}
+            return (row for row in APIQuery(client, "/geomap/api/locations") if row.get("pk") in used)
+        if name == COLLECTIONS:
+            return APIQuery(client, CollectionIndex.endpoint(cp_id))
+        if name == MEDIA:
+            return APIQuery(client, MediaComponent._endpoint, {"cp": cp_id})
+        return ObservationsResultsComponent(client).iter_by_classification_project(cp_id)
+
+    def _load(self, table: _Table, rows: Iterable[Dict[str, Any]]) -> TableRefresh:
+        # Las filas se descargan por lotes a una tabla temporal sin bloquear las consultas;
+        # el bloqueo solo se mantiene en cada lote y en el intercambio final
+        result = TableRefresh(table.name)
+        staging = f"staging_{table.name}"
+        names = [name for name, _, _ in table.columns]
+        columns = ", ".join(names + ["data", "digest"])
+        key = table.key
+
+        with self._refresh_lock:
+            with self._lock:
+                conn = self.connection
+                conn.execute(f"DROP TABLE IF EXISTS temp.{staging}")
+                conn.execute(
+                    f"CREATE TEMP TABLE {staging} ("
+                    + ", ".join(f"{name} {sql_type}" for name, sql_type, _ in table.columns)
+                    + f", data TEXT NOT NULL, digest TEXT NOT NULL, PRIMARY KEY ({key}))"
+                )
+            try:
+                insert = f"INSERT OR REPLACE INTO {staging} ({columns}) VALUES ({', '.join('?' * (len(names) + 2))})"
+                for batch in batches(rows, BATCH_SIZE):
+                    result.fetched += len(batch)
+                    values = []
+                    for row in batch:
+                        row_values = table.values(row)
+                        if row_values[0] is None:
+                            continue
+                        data = json.dumps(row, sort_keys=True, default=str)
+                        values.append(row_values + [data, hashlib.sha256(data.encode("utf-8")).hexdigest()])
+                    with self._lock:
+                        self._transaction(lambda c: c.executemany(insert, values))
+                with self._lock:
+                    self._transaction(lambda c: self._swap(c, table, staging, columns, result))
+            finally:
+                with self._lock:
+                    if self._conn is not None:
+                        self._conn.execute(f"DROP TABLE IF EXISTS temp.{staging}")
+        return result
+
+    def _transaction(self, body: Callable[[sqlite3.Connection], Any]) -> None:
+        conn = self.connection
+        conn.execute("BEGIN")
+        try:
+            body(conn)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    @staticmethod
+    def _swap(conn: sqlite3.Connection, table: _Table, staging: str, columns: str, result: TableRefresh) -> None:
+        key = table.key
+        row = conn.execute("SELECT value FROM mirror_meta WHERE name = 'generation'").fetchone()
+        generation = int(row[0]) + 1 if row else 1
+        result.inserted, result.updated = conn.execute(
+            f"SELECT COALESCE(SUM(t.{key} IS NULL), 0), COALESCE(SUM(t.{key} IS NOT NULL AND t.digest != s.digest), 0) "
+            f"FROM {staging} s LEFT JOIN {table.name} t ON t.{key} = s.{key}"
+        ).fetchone()
+        result.deleted = conn.execute(
+            f"DELETE FROM {table.name} WHERE {key} NOT IN (SELECT {key} FROM {staging})"
+        ).rowcount
+        conn.execute(
+            f"INSERT OR REPLACE INTO {table.name} ({columns}, seen) SELECT {columns}, ? FROM {staging} s "
+            f"WHERE NOT EXISTS (SELECT 1 FROM {table.name} t WHERE t.{key} = s.{key} AND t.digest = s.digest)",
+            (generation,)
+        )
+        conn.executemany("INSERT OR REPLACE INTO mirror_meta VALUES (?, ?)", [
+            ("generation", str(generation)),
+            (f"refreshed_at:{table.name}", repr(time.time())),
+        ])
+
+    # ----------------------------------------------------------------------------------------------
+    # Queries
+    # ----------------------------------------------------------------------------------------------
+
+    def query(self, sql: str, params: Sequence[Any] = ()) -> List[Dict[str, Any]]:
+        """
+        Run a SQL query on the mirror and return its rows as dicts.
+
+        :param sql: SQL statement, with ``?`` placeholders
+        :type sql: str
+        :param params: Values of the placeholders
+        :type params: Sequence[Any], optional
+        :rtype: list[dict]
+        """
+        with self._lock:
+            cursor = self.connection.execute(sql, params)
+            names = [d[0] for d in cursor.description or ()]
+            return [dict(zip(names, row)) for row in cursor.fetchall()]
+
+    def species_per_deployment(self) -> List[Dict[str, Any]]:
+        """
+        Number of observations and of individuals of each species by deployment.
+        """
+        return self.query(
+            "SELECT deployment_id, scientific_name, COUNT(*) AS observations, "
+            "COALESCE(SUM(count), 0) AS individuals FROM observations "
+            "WHERE scientific_name IS NOT NULL GROUP BY deployment_id, scientific_name "
+            "ORDER BY deployment_id, scientific_name"
+        )
+
+    def counts_per_day(self, scientific_name: str = None) -> List[Dict[str, Any]]:
+        """
+        Number of observations and of individuals by day (local date of ``event_start``), optionally of one species.
+        """
+        where, params = ("WHERE scientific_name = ? ", (scientific_name,)) if scientific_name else ("", ())
+        return self.query(
+            "SELECT substr(event_start, 1, 10) AS day, COUNT(*) AS observations, "
+            f"COALESCE(SUM(count), 0) AS individuals FROM observations {where}"
+            "GROUP BY day ORDER BY day", params
+        )
+
+    def media(self, deployment_id: str = None, start: str = None, end: str = None) -> List[Dict[str, Any]]:
+        """
+        Media rows (as returned by the API), optionally of one deployment and between two ISO timestamps.
+        """
+        clauses, params = [], []
+        for clause, value in (("deployment_id = ?", deployment_id), ("timestamp >= ?", start), ("timestamp < ?", end)):
+            if value is not None:
+                clauses.append(clause)
+                params.append(value)
+        where = f"WHERE {' AND '.join(clauses)} " if clauses else ""
+        rows = self.query(f"SELECT data FROM media {where}ORDER BY timestamp", params)
+        return [json.loads(row["data"]) for row in rows]
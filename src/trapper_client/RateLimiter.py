@@ -0,0 +1,134 @@
+"""
+Client-side rate limiting for the API clients.
+
+Defines:
+    - TokenBucket: thread-safe token bucket with a sustained rate and a burst capacity.
+    - RateLimiter: registry of token buckets per host and traffic kind ("api" or "media").
+"""
+import threading
+import time
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlparse
+
+import attr
+
+API = "api"
+MEDIA = "media"
+
+
+@attr.s
+class TokenBucket:
+    """
+    Thread-safe token bucket.
+
+    Tokens are refilled continuously at ``rate`` tokens per second up to ``capacity``.
+    Taking a token when the bucket is empty reserves it in advance, so concurrent callers
+    are queued fairly instead of busy-waiting.
+
+    :param rate: Sustained number of tokens per second
+    :type rate: float
+    :param capacity: Maximum burst size, defaults to ``max(1, rate)``
+    :type capacity: float, optional
+    """
+    rate: float = attr.ib()
+    capacity: float = attr.ib(default=None)
+
+    _tokens: float = attr.ib(init=False, repr=False)
+    _updated: float = attr.ib(init=False, repr=False)
+    _lock: threading.Lock = attr.ib(init=False, repr=False, eq=False, factory=threading.Lock)
+
+    def __attrs_post_init__(self):
+        if self.rate <= 0:
+            raise ValueError(f"Rate must be positive: {self.rate}")
+        if self.capacity is None:
+            self.capacity = max(1.0, float(self.rate))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+
+    def reserve(self, tokens: float = 1) -> float:
+        """
+        Take ``tokens`` from the bucket and return how long the caller must wait to use them.
+
+        :param tokens: Number of tokens to take, defaults to 1
+        :type tokens: float, optional
+        :return: Seconds to wait (0 if the tokens are available now)
+        :rtype: float
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= tokens
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    def acquire(self, tokens: float = 1) -> None:
+        """
+        Block until ``tokens`` are available.
+        """
+        delay = self.reserve(tokens)
+        if delay > 0:
+            time.sleep(delay)
+
+
+@attr.s
+class RateLimiter:
+    """
+    Token buckets shared by every component and thread of a client.
+
+    A bucket is created per host of the requested URL and per kind of traffic, so API
+    JSON calls (``"api"``) and media file downloads (``"media"``) have separate budgets.
+    A rate of ``None`` disables limiting for that kind.
+
+    :param api_rate: Maximum sustained API requests per second and host, defaults to None (unlimited)
+    :type api_rate: float, optional
+    :param api_burst: Maximum burst of API requests, defaults to ``api_rate``
+    :type api_burst: float, optional
+    :param media_rate: Maximum sustained media downloads per second and host, defaults to None (unlimited)
+    :type media_rate: float, optional
+    :param media_burst: Maximum burst of media downloads, defaults to ``media_rate``
+    :type media_burst: float, optional
+    """
+    api_rate: Optional[float] = attr.ib(default=None)
+    api_burst: Optional[float] = attr.ib(default=None)
+    media_rate: Optional[float] = attr.ib(default=None)
+    media_burst: Optional[float] = attr.ib(default=None)
+
+    _buckets: Dict[Tuple[str, str], TokenBucket] = attr.ib(init=False, repr=False, factory=dict)
+    _lock: threading.Lock = attr.ib(init=False, repr=False, eq=False, factory=threading.Lock)
+
+    def bucket(self, url: str, kind: str = API) -> Optional[TokenBucket]:
+        """
+        Return the bucket for the host of ``url`` and the given kind of traffic.
+
+        :param url: Requested URL
+        :type url: str
+        :param kind: ``"api"`` or ``"media"``, defaults to ``"api"``
+        :type kind: str, optional
+        :return: The shared bucket, or None if that kind of traffic is not limited
+        :rtype: TokenBucket, optional
+        """
+        rate, burst = (self.media_rate, self.media_burst) if kind == MEDIA else (self.api_rate, self.api_burst)
+        if not rate:
+            return None
+
+        key = (urlparse(url).netloc, kind)
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = TokenBucket(rate, burst)
+        return bucket
+
+    def reserve(self, url: str, kind: str = API) -> float:
+        """
+        Take a token for a request to ``url`` and return the seconds to wait before sending it.
+        """
+        bucket = self.bucket(url, kind)
+        return bucket.reserve() if bucket else 0.0
+
+    def acquire(self, url: str, kind: str = API) -> None:
+        """
+        Block until a request to ``url`` is allowed.
+        """
+        delay = self.reserve(url, kind)
+        if delay > 0:
+            time.sleep(delay)
@@ -0,0 +1,345 @@
+"""
+Persistent cache of API responses.
+
+Defines:
+    - ResponseCache: SQLite store of normalized GET pages keyed by user, URL and query,
+      with per-endpoint TTLs, size-bounded LRU eviction and a bypass switch.
+    - CacheSlot: cache state of one request, used by the clients to serve, revalidate
+      (``ETag`` / ``Last-Modified``) or store a response.
+
+Only endpoints with a TTL are cached. By default those are the listings that rarely change
+(projects, collections, classificators, deployments and locations); media and observation
+listings are always requested from the server.
+"""
+import contextlib
+import fnmatch
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Any, Dict, Iterator, Mapping, Optional
+
+import attr
+
+from trapper_client.SQLiteStore import open_database
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PATH = os.path.join(os.path.expanduser("~"), ".cache", "trapper_client", "responses.sqlite")
+DEFAULT_MAX_SIZE = 256 * 1024 * 1024
+
+# Patrones (fnmatch sobre el endpoint sin "/" inicial) -> segundos de validez
+DEFAULT_TTLS = {
+    "media_classification/api/projects*": 3600,
+    "media_classification/api/project/*/collections*": 3600,
+    "media_classification/api/classificators*": 3600,
+    "research/api/projects*": 3600,
+    "research/api/project/*/collections*": 3600,
+    "storage/api/collections*": 3600,
+    "geomap/api/deployments*": 600,
+    "geomap/api/locations*": 600,
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    endpoint TEXT NOT NULL,
+    payload BLOB NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    expires_at REAL NOT NULL,
+    accessed_at REAL NOT NULL,
+    size INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at);
+"""
+
+
+def _endpoint_path(endpoint: str) -> str:
+    return endpoint.strip("/")
+
+
+def _collection_path(endpoint: str) -> str:
+    """
+    Path of the resource collection an endpoint belongs to: ``x/<pk>`` and ``x/<pk>/<action>`` belong to ``x``.
+    """
+    segments = _endpoint_path(endpoint).split("/")
+    for i in (len(segments) - 1, len(segments) - 2):
+        if i > 0 and segments[i].isdigit():
+            return "/".join(segments[:i])
+    return "/".join(segments)
+
+
+@attr.s(slots=True)
+class CacheSlot:
+    """
+    Cache state of one GET request.
+
+    :param cache: Cache the slot belongs to
+    :type cache: ResponseCache
+    :param key: Cache key of the request
+    :type key: str
+    :param endpoint: Endpoint of the request
+    :type endpoint: str
+    :param ttl: Seconds a stored response is served without asking the server
+    :type ttl: float
+    :param page: Cached page, if any
+    :type page: dict, optional
+    :param etag: ``ETag`` of the cached page, if the server sent one
+    :type etag: str, optional
+    :param last_modified: ``Last-Modified`` of the cached page, if the server sent one
+    :type last_modified: str, optional
+    :param expires_at: Time (epoch seconds) until which the cached page is fresh
+    :type expires_at: float, optional
+    """
+    cache: "ResponseCache" = attr.ib(repr=False)
+    key: str = attr.ib()
+    endpoint: str = attr.ib()
+    ttl: float = attr.ib()
+    page: Optional[Dict[str, Any]] = attr.ib(default=None, repr=False)
+    etag: Optional[str] = attr.ib(default=None)
+    last_modified: Optional[str] = attr.ib(default=None)
+    expires_at: Optional[float] = attr.ib(default=None)
+
+    @property
+    def fresh(self) -> bool:
+        """
+        Tell whether the cached page can be served without contacting the server.
+        """
+        return self.page is not None and time.time() < self.expires_at
+
+    def conditional_headers(self) -> Dict[str, str]:
+        """
+        Return the headers asking the server to answer 304 if the cached page is still valid.
+        """
+        headers = {}
+        if self.page is not None:
+            if self.etag:
+                headers["If-None-Match"] = self.etag
+            if self.last_modified:
+                headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+    def revalidated(self) -> Dict[str, Any]:
+        """
+        Mark the cached page as confirmed by the server (304 Not Modified) and return it.
+        """
+        self.cache.touch(self.key, self.ttl)
+        return self.page
+
+    def store(self, page: Dict[str, Any], headers: Mapping[str, str]) -> None:
+        """
+        Store a page received from the server, with its validators.
+        """
+        self.cache.store(self.key, self.endpoint, page, headers.get("ETag"), headers.get("Last-Modified"), self.ttl)
+
+
+@attr.s
+class ResponseCache:
+    """
+    SQLite-backed cache of GET responses shared by every component of a client.
+
+    Entries are keyed by a SHA-256 digest of the user, the URL and the query, so cached
+    pages are never served to another account and credentials are not stored. Pages are
+    kept zlib-compressed. A page is served from disk while its TTL has not expired; after
+    that it is revalidated with ``If-None-Match`` / ``If-Modified-Since`` when the server
+    sent an ``ETag`` or ``Last-Modified`` header, and downloaded again otherwise. When the
+    database grows over ``max_size`` bytes the least recently used pages are evicted.
+
+    Examples
+    --------
+    cache = ResponseCache(ttls={**DEFAULT_TTLS, "geomap/api/deployments*": 60})
+    trapper_client = TrapperClient.from_environment()
+    trapper_client.raw.cache = cache
+    with cache.bypassed():
+        projects = trapper_client.classification_projects.get_all()
+
+    :param path: SQLite database file, defaults to ``~/.cache/trapper_client/responses.sqlite``
+    :type path: str, optional
+    :param ttls: TTL in seconds by endpoint pattern (fnmatch, without the leading "/"); the first
+        matching pattern wins. Defaults to :data:`DEFAULT_TTLS`
+    :type ttls: dict[str, float], optional
+    :param default_ttl: TTL of endpoints matching no pattern, None to not cache them, defaults to None
+    :type default_ttl: float, optional
+    :param max_size: Maximum total size in bytes of the cached pages, defaults to 256 MiB
+    :type max_size: int, optional
+    :param bypass: Ignore cached pages (fresh responses are still stored), defaults to False
+    :type bypass: bool, optional
+    """
+    path: str = attr.ib(default=DEFAULT_PATH, converter=str)
+    ttls: Dict[str, float] = attr.ib(factory=lambda: dict(DEFAULT_TTLS))
+    default_ttl: Optional[float] = attr.ib(default=None)
+    max_size: int = attr.ib(default=DEFAULT_MAX_SIZE)
+    bypass: bool = attr.ib(default=False)
+
+    _conn: sqlite3.Connection = attr.ib(init=False, repr=False, default=None)
+    _lock: threading.RLock = attr.ib(init=False, repr=False, eq=False, factory=threading.RLock)
+    _bypassing: int = attr.ib(init=False, repr=False, default=0)
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        """
+        Return the SQLite connection, opening the database (and creating it) on first use.
+        """
+        if self._conn is None:
+            with self._lock:
+                if self._conn is None:
+                    self._conn = open_database(self.path, _SCHEMA)
+        return self._conn
+
+    def close(self) -> None:
+        """
+        Close the database. It is opened again on the next use.
+        """
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def ttl(self, endpoint: str) -> Optional[float]:
+        """
+        Return the TTL of an endpoint, or None if its responses are not cached.
+        """
+        path = _endpoint_path(endpoint)
+        for pattern, ttl in self.ttls.items():
+            if fnmatch.fnmatchcase(path, pattern):
+                return ttl
+        return self.default_ttl
+
+    @staticmethod
+    def key(user: str, url: str, query: Dict[str, Any] = None) -> str:
+        """
+        Return the cache key of a request.
+        """
+        material = json.dumps([user, url, query or {}], sort_keys=True, default=str)
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def slot(self, user: str, url: str, endpoint: str, query: Dict[str, Any] = None) -> Optional[CacheSlot]:
+        """
+        Return the cache state of a GET request, or None if the endpoint is not cached.
+
+        :param user: Identity the response belongs to (only its digest is stored)
+        :type user: str
+        :param url: Absolute URL of the request
+        :type url: str
+        :param endpoint: Endpoint of the request, matched against :attr:`ttls`
+        :type endpoint: str
+        :param query: Query parameters of the request
+        :type query: dict, optional
+        :rtype: CacheSlot
+        """
+        ttl = self.ttl(endpoint)
+        if ttl is None:
+            return None
+        slot = CacheSlot(self, self.key(user, url, query), _endpoint_path(endpoint), ttl)
+        if self.bypass or self._bypassing:
+            return slot
+
+        with self._lock:
+            conn = self.connection
+            row = conn.execute(
+                "SELECT payload, etag, last_modified, expires_at FROM responses WHERE key = ?", (slot.key,)
+            ).fetchone()
+            if row is not None:
+                conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (time.time(), slot.key))
+        if row is not None:
+            payload, slot.etag, slot.last_modified, slot.expires_at = row
+            slot.page = json.loads(zlib.decompress(payload))
+        logger.debug("Cache %s for %s", "hit" if slot.fresh else "stale" if row else "miss", endpoint)
+        return slot
+
+    def store(self, key: str, endpoint: str, page: Dict[str, Any], etag: str = None, last_modified: str = None,
+              ttl: float = 0) -> None:
+        """
+        Store a page and evict the least recently used pages if the cache is over :attr:`max_size`.
+        """
+        payload = zlib.compress(json.dumps(page, default=str).encode("utf-8"))
+        now = time.time()
+        with self._lock:
+            conn = self.connection
+            conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, endpoint, payload, etag, last_modified, now + ttl, now, len(payload)),
+            )
+            self._evict(conn)
+
+    def touch(self, key: str, ttl: float) -> None:
+        """
+        Extend the validity of a page confirmed by the server.
+        """
+        now = time.time()
+        with self._lock:
+            self.connection.execute(
+                "UPDATE responses SET expires_at = ?, accessed_at = ? WHERE key = ?", (now + ttl, now, key)
+            )
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_size:
+            return
+        evicted = 0
+        for key, size in conn.execute("SELECT key, size FROM responses ORDER BY accessed_at").fetchall():
+            if total <= self.max_size:
+                break
+            conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            total -= size
+            evicted += 1
+        logger.debug("Cache evicted %d pages", evicted)
+
+    def invalidate(self, pattern: str = "*") -> int:
+        """
+        Remove the pages of the endpoints matching a pattern (fnmatch, without the leading "/").
+
+        :return: Number of pages removed
+        :rtype: int
+        """
+        pattern = _endpoint_path(pattern) or "*"
+        with self._lock:
+            conn = self.connection
+            keys = [k for k, endpoint in conn.execute("SELECT key, endpoint FROM responses")
+                    if fnmatch.fnmatchcase(endpoint, pattern)]
+            conn.executemany("DELETE FROM responses WHERE key = ?", [(k,) for k in keys])
+        return len(keys)
+
+    def invalidate_resource(self, endpoint: str) -> int:
+        """
+        Remove the pages made stale by a write to ``endpoint``.
+
+        A write to ``x/<pk>/`` (or ``x/<pk>/<action>/``, or a create on ``x/``) changes the
+        listing ``x/`` as well as the item, so every page of the collection ``x`` and of the
+        endpoints under it is removed.
+
+        :return: Number of pages removed
+        :rtype: int
+        """
+        collection = _collection_path(endpoint)
+        return self.invalidate(collection) + self.invalidate(collection + "/*")
+
+    def clear(self) -> None:
+        """
+        Remove every cached page.
+        """
+        with self._lock:
+            self.connection.execute("DELETE FROM responses")
+
+    @contextlib.contextmanager
+    def bypassed(self) -> Iterator["ResponseCache"]:
+        """
+        Ignore cached pages while the block runs.
+
+        The switch is process-wide: it applies to every thread using this cache, including the
+        workers fetching the pages of ``get_all_pages`` on behalf of the block, and to requests
+        of other threads running at the same time. Blocks can be nested or overlap between threads;
+        cached pages are served again when the last one exits.
+        """
+        with self._lock:
+            self._bypassing += 1
+        try:
+            yield self
+        finally:
+            with self._lock:
+                self._bypassing -= 1
@@ -0,0 +1,204 @@
+"""
+Retry policy used by the API clients to recover from transient failures.
+
+Defines:
+    - RetryPolicy: decides whether a failed request is retried and how long to wait,
+      using exponential backoff with jitter and honoring ``Retry-After`` headers.
+    - RetryStats: thread-safe counters of the retries performed by a client.
+"""
+import random
+import threading
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Optional, FrozenSet, Tuple, Dict
+
+import attr
+import requests
+
+
+def _transport_errors() -> Tuple[type, ...]:
+    """
+    Return the exception types raised by the HTTP stacks when a connection fails or times out.
+    """
+    errors = (
+        ConnectionError,
+        TimeoutError,
+        requests.exceptions.ConnectionError,
+        requests.exceptions.Timeout,
+        requests.exceptions.ChunkedEncodingError,
+    )
+    try:
+        import httpx
+        errors += (httpx.TransportError,)
+    except ImportError:
+        pass
+    return errors
+
+
+@attr.s(frozen=True)
+class RetryPolicy:
+    """
+    Decide whether a request is retried and how long to wait before the next attempt.
+
+    Only idempotent methods are retried unless ``retry_non_idempotent`` is set. The wait
+    before attempt ``n`` is ``backoff_factor * 2 ** (n - 1)`` seconds, capped at
+    ``max_backoff`` and randomized by ``jitter``. When the server sends a ``Retry-After``
+    header (seconds or HTTP date) it takes precedence over the computed backoff.
+
+    Subclass it and override :meth:`next_delay` to plug a different strategy.
+
+    :param max_retries: Maximum number of retries per request (0 disables retries), defaults to 3
+    :type max_retries: int, optional
+    :param backoff_factor: Base delay in seconds, defaults to 0.5
+    :type backoff_factor: float, optional
+    :param max_backoff: Upper bound of the computed delay in seconds, defaults to 30
+    :type max_backoff: float, optional
+    :param jitter: Fraction of the delay that is randomized (0 = no jitter, 1 = full jitter), defaults to 0.5
+    :type jitter: float, optional
+    :param retry_statuses: HTTP status codes considered transient, defaults to 429, 502, 503 and 504
+    :type retry_statuses: frozenset[int], optional
+    :param idempotent_methods: HTTP methods that are safe to repeat
+    :type idempotent_methods: frozenset[str], optional
+    :param retry_non_idempotent: Also retry POST and PATCH requests, defaults to False
+    :type retry_non_idempotent: bool, optional
+    :param respect_retry_after: Honor the ``Retry-After`` header, defaults to True
+    :type respect_retry_after: bool, optional
+    :param max_retry_after: Upper bound in seconds for the ``Retry-After`` delay, defaults to 300
+    :type max_retry_after: float, optional
+    """
+    max_retries: int = attr.ib(default=3)
+    backoff_factor: float = attr.ib(default=0.5)
+    max_backoff: float = attr.ib(default=30.0)
+    jitter: float = attr.ib(default=0.5)
+    retry_statuses: FrozenSet[int] = attr.ib(default=frozenset({429, 502, 503, 504}), converter=frozenset)
+    idempotent_methods: FrozenSet[str] = attr.ib(
+        default=frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}), converter=frozenset
+    )
+    retry_non_idempotent: bool = attr.ib(default=False)
+    respect_retry_after: bool = attr.ib(default=True)
+    max_retry_after: float = attr.ib(default=300.0)
+
+    retry_exceptions: Tuple[type, ...] = attr.ib(factory=_transport_errors, repr=False)
+
+    def is_idempotent(self, method: str) -> bool:
+        """
+        Tell whether requests with the given method may be retried.
+        """
+        return self.retry_non_idempotent or method.upper() in self.idempotent_methods
+
+    def backoff(self, attempt: int) -> float:
+        """
+        Return the exponential backoff delay, with jitter, before the given attempt.
+
+        :param attempt: Number of the retry about to be made (1 for the first retry)
+        :type attempt: int
+        :return: Delay in seconds
+        :rtype: float
+        """
+        delay = min(self.max_backoff, self.backoff_factor * (2 ** (attempt - 1)))
+        if self.jitter:
+            delay -= random.uniform(0, delay * min(self.jitter, 1.0))
+        return delay
+
+    @staticmethod
+    def parse_retry_after(value: Optional[str]) -> Optional[float]:
+        """
+        Parse a ``Retry-After`` header expressed in seconds or as an HTTP date.
+
+        :param value: Header value
+        :type value: str, optional
+        :return: Delay in seconds, or None if the header is missing or invalid
+        :rtype: float, optional
+        """
+        if not value:
+            return None
+        value = value.strip()
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            when = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if when.tzinfo is None:
+            when = when.replace(tzinfo=timezone.utc)
+        return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+    def next_delay(
+        self,
+        method: str,
+        attempt: int,
+        status_code: int = None,
+        exception: BaseException = None,
+        retry_after: str = None,
+    ) -> Optional[float]:
+        """
+        Decide whether a failed attempt is retried.
+
+        :param method: HTTP method of the request
+        :type method: str
+        :param attempt: Number of the retry that would be made (1 for the first retry)
+        :type attempt: int
+        :param status_code: Status code of the response, if one was received
+        :type status_code: int, optional
+        :param exception: Exception raised while sending the request, if any
+        :type exception: BaseException, optional
+        :param retry_after: Value of the ``Retry-After`` response header, if any
+        :type retry_after: str, optional
+        :return: Seconds to wait before retrying, or None if the request must not be retried
+        :rtype: float, optional
+        """
+        if attempt > self.max_retries or not self.is_idempotent(method):
+            return None
+
+        if exception is not None:
+            return self.backoff(attempt) if isinstance(exception, self.retry_exceptions) else None
+
+        if status_code not in self.retry_statuses:
+            return None
+
+        if self.respect_retry_after:
+            delay = self.parse_retry_after(retry_after)
+            if delay is not None:
+                return min(delay, self.max_retry_after)
+
+        return self.backoff(attempt)
+
+
+NO_RETRY = RetryPolicy(max_retries=0)
+
+
+@attr.s
+class RetryStats:
+    """
+    Thread-safe counters of the requests sent by a client and the retries they needed.
+
+    :ivar requests: Number of requests sent (without counting retries)
+    :ivar retries: Total number of retries performed
+    :ivar retried_requests: Number of requests that needed at least one retry
+    :ivar by_reason: Number of retries per reason (HTTP status code or exception name)
+    """
+    requests: int = attr.ib(default=0)
+    retries: int = attr.ib(default=0)
+    retried_requests: int = attr.ib(default=0)
+    by_reason: Dict[str, int] = attr.ib(factory=dict)
+
+    _lock: threading.Lock = attr.ib(factory=threading.Lock, repr=False, eq=False)
+
+    def record(self, retries: int, reasons: Tuple[str, ...] = ()) -> None:
+        """
+        Record a finished request and the retries it needed.
+
+        :param retries: Number of retries performed for the request
+        :type retries: int
+        :param reasons: Reason of each retry
+        :type reasons: tuple[str, ...]
+        """
+        with self._lock:
+            self.requests += 1
+            self.retries += retries
+            if retries:
+                self.retried_requests += 1
+            for reason in reasons:
+                self.by_reason[reason] = self.by_reason.get(reason, 0) + 1
@@ -0,0 +1,56 @@
+"""
+SQLite databases of the local stores.
+
+Defines:
+    - open_database: open (and create) the database of a store, as used by
+      :class:`~trapper_client.ResponseCache.ResponseCache`,
+      :class:`~trapper_client.SyncState.SyncStore` and :class:`~trapper_client.Mirror.ProjectMirror`.
+    - batches: split a stream of rows in lists, to write each one in a short transaction.
+
+Connections are shared between threads (the stores serialize their use with a lock) and
+run in autocommit mode, so transactions are explicit ``BEGIN`` / ``COMMIT`` statements.
+"""
+import logging
+import os
+import sqlite3
+from typing import Any, Iterable, Iterator, List
+
+logger = logging.getLogger(__name__)
+
+MEMORY = ":memory:"
+
+
+def open_database(path: str, schema: str) -> sqlite3.Connection:
+    """
+    Open the SQLite database at ``path``, creating its folder and running ``schema``.
+
+    File databases use the WAL journal, so readers are not blocked by a writer.
+
+    :param path: Database file, or ``:memory:``
+    :type path: str
+    :param schema: SQL script creating the tables if they do not exist
+    :type schema: str
+    :rtype: sqlite3.Connection
+    """
+    if path != MEMORY:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+    if path != MEMORY:
+        conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript(schema)
+    logger.debug("Opened SQLite database %s", path)
+    return conn
+
+
+def batches(rows: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    """
+    Yield the rows in lists of ``size`` (the last one may be shorter).
+    """
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
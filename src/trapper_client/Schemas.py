@@ -1,9 +1,10 @@
 from __future__ import annotations
 
 from typing import Optional, List, Union, Dict, Any
-from pydantic import BaseModel, Field, ConfigDict, HttpUrl, field_validator, model_validator, AnyUrl
+from pydantic import BaseModel, Field, ConfigDict, HttpUrl, field_validator, model_validator, AnyUrl, \
+    Discriminator, Tag
 from datetime import datetime
-from typing_extensions import Literal
+from typing_extensions import Literal, Annotated
 
 class MyTrapperBase(BaseModel):
     model_config = ConfigDict(from_attributes=True)
@@ -687,27 +688,100 @@ class ClassificationResultsAgg(BaseModel):
             return None
         return v
 
+def _keys(v: Any):
+    """Keys of a raw row (dict) or field names and aliases set on a model instance."""
+    if isinstance(v, dict):
+        return v
+    if isinstance(v, BaseModel):
+        fields = type(v).model_fields
+        return set(fields) | {f.alias for f in fields.values() if f.alias}
+    return ()
+
+
+def _classification_tag(v: Any) -> Optional[str]:
+    """
+    Pick the model of a row of the classifications endpoints without trying every member of the union.
+
+    Rows of the classification view sets embed the ``resource``: AI classifications carry
+    ``ai_provider``, user classifications an ``owner``. Result rows (CSV) of human
+    classifications carry ``classificationMethod``, which AI results lack.
+    """
+    if isinstance(v, BaseModel) and type(v) in _CLASSIFICATION_TAGS:
+        return _CLASSIFICATION_TAGS[type(v)]
+    keys = _keys(v)
+    if "resource" in keys:
+        if "ai_provider" in keys:
+            return "ai"
+        return "user" if "owner" in keys else "classification"
+    if "classificationMethod" in keys or "observationID" in keys:
+        return "results"
+    return "ai_results"
+
+
+def _classification_results_tag(v: Any) -> Optional[str]:
+    """
+    Pick the model of a row of the classification results endpoints.
+
+    Human results carry ``classificationMethod``. The Trapper format (``camtrapdp=False``)
+    adds ``_id``, ``bboxes``, ``countNew`` and ``englishName`` to the Camtrap DP columns; AI
+    results in Trapper format are also the only AI rows with an ``observationID``.
+    """
+    if isinstance(v, BaseModel) and type(v) in _CLASSIFICATION_RESULTS_TAGS:
+        return _CLASSIFICATION_RESULTS_TAGS[type(v)]
+    keys = _keys(v)
+    trapper_format = any(k in keys for k in ("_id", "bboxes", "countNew", "englishName"))
+    if "classificationMethod" in keys:
+        return "trapper" if trapper_format else "ctdp"
+    return "ai_trapper" if trapper_format or "observationID" in keys else "ai_ctdp"
+
+
+_CLASSIFICATION_TAGS = {
+    TrapperClassification: "classification",
+    TrapperAIClassification: "ai",
+    TrapperUserClassification: "user",
+    TrapperObservationResults: "results",
+    TrapperAIObservationResults: "ai_results",
+}
+
+_CLASSIFICATION_RESULTS_TAGS = {
+    TrapperObservationResultsCTDP: "ctdp",
+    TrapperObservationResultsTrapper: "trapper",
+    TrapperAIObservationResultsTrapper: "ai_trapper",
+    TrapperAIObservationResultsCTDP: "ai_ctdp",
+}
+
+TrapperClassificationItem = Annotated[
+    Union[
+        Annotated[TrapperClassification, Tag("classification")],
+        Annotated[TrapperAIClassification, Tag("ai")],
+        Annotated[TrapperUserClassification, Tag("user")],
+        Annotated[TrapperObservationResults, Tag("results")],
+        Annotated[TrapperAIObservationResults, Tag("ai_results")],
+        # ClassificationResultsAgg
+    ],
+    Discriminator(_classification_tag),
+]
+
+TrapperClassificationResultsItem = Annotated[
+    Union[
+        Annotated[TrapperObservationResultsCTDP, Tag("ctdp")],
+        Annotated[TrapperObservationResultsTrapper, Tag("trapper")],
+        Annotated[TrapperAIObservationResultsTrapper, Tag("ai_trapper")],
+        Annotated[TrapperAIObservationResultsCTDP, Tag("ai_ctdp")],
+        # ClassificationResultsAgg
+    ],
+    Discriminator(_classification_results_tag),
+]
+
 class TrapperClassificationList(BaseModel):
     pagination: Pagination
-    #results: List[Union[TrapperClassification, TrapperAIClassification, TrapperUserClassification]]
-    results: List[Union[TrapperClassification
-                        , TrapperAIClassification
-                        , TrapperUserClassification
-                        , TrapperObservationResults
-                        , TrapperAIObservationResults
-    #                    , ClassificationResultsAgg
-    ]]
+    # Cada fila se valida solo contra el modelo elegido por el discriminador
+    results: List[TrapperClassificationItem]
 
 class TrapperClassificationResultsList(BaseModel):
     pagination: Pagination
-    #results: List[Union[TrapperClassification, TrapperAIClassification, TrapperUserClassification]]
-    results: List[Union[
-                          TrapperObservationResultsCTDP
-                        , TrapperObservationResultsTrapper
-                        , TrapperAIObservationResultsTrapper
-                        , TrapperAIObservationResultsCTDP
-        #                   , ClassificationResultsAgg
-    ]]
+    # Cada fila se valida solo contra el modelo elegido por el discriminador
+    results: List[TrapperClassificationResultsItem]
 
 
 class TrapperObservationList(BaseModel):
@@ -0,0 +1,337 @@
+"""
+Incremental (delta) sync of classification listings into a local store.
+
+Defines:
+    - SyncStore: SQLite store of the synced records and of a high-water mark per
+      (endpoint, classification project, query).
+    - SyncResult: outcome of one sync.
+    - sync_records: pull the records changed since the last sync and merge them into the store.
+    - async_sync_records: the same through the asynchronous client.
+
+The high-water mark is the latest ``updated_at`` (or any other timestamp field) seen in a
+completed sync. When the endpoint accepts an "updated since" filter it is sent, so only
+changed records are downloaded; otherwise the listing is read again and records whose
+content did not change are skipped by primary key. Records deleted on the server are not
+detected by a delta sync: use :meth:`SyncStore.reset` to start over.
+"""
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import attr
+
+from trapper_client.APIQuery import APIQuery
+from trapper_client.AsyncAPIQuery import AsyncAPIQuery
+from trapper_client.SQLiteStore import batches, open_database
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PATH = os.path.join(os.path.expanduser("~"), ".cache", "trapper_client", "sync.sqlite")
+BATCH_SIZE = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS watermarks (
+    scope TEXT PRIMARY KEY,
+    endpoint TEXT NOT NULL,
+    cp_id INTEGER,
+    query TEXT NOT NULL,
+    high_water TEXT,
+    synced_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS records (
+    scope TEXT NOT NULL,
+    pk TEXT NOT NULL,
+    updated_at TEXT,
+    digest TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    PRIMARY KEY (scope, pk)
+);
+"""
+
+
+def _parse_timestamp(value: Any) -> Optional[datetime]:
+    """
+    Parse an ISO 8601 timestamp (naive values are taken as UTC), or return None.
+    """
+    if isinstance(value, datetime):
+        parsed = value
+    elif value:
+        try:
+            parsed = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    else:
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+@attr.s
+class SyncResult:
+    """
+    Outcome of :func:`sync_records`.
+
+    :param scope: Key of the synced (endpoint, project, query)
+    :param fetched: Records received from the server
+    :param inserted: Records new to the store
+    :param updated: Records whose content changed
+    :param watermark: High-water mark after the sync
+    """
+    scope: str = attr.ib()
+    fetched: int = attr.ib(default=0)
+    inserted: int = attr.ib(default=0)
+    updated: int = attr.ib(default=0)
+    watermark: Optional[datetime] = attr.ib(default=None)
+
+    @property
+    def unchanged(self) -> int:
+        return self.fetched - self.inserted - self.updated
+
+
+@attr.s
+class SyncStore:
+    """
+    SQLite store of synced records and high-water marks.
+
+    Records are stored as JSON by scope and primary key, with a digest of their content so
+    a record received again without changes is not rewritten.
+
+    Examples
+    --------
+    store = SyncStore("project_33.sqlite")
+    result = trapper_client.observations.sync(33, store=store)
+    for row in store.records(result.scope):
+        print(row["pk"], row["updated_at"])
+
+    :param path: SQLite database file, defaults to ``~/.cache/trapper_client/sync.sqlite``
+    :type path: str, optional
+    """
+    path: str = attr.ib(default=DEFAULT_PATH, converter=str)
+
+    _conn: sqlite3.Connection = attr.ib(init=False, repr=False, default=None)
+    _lock: threading.RLock = attr.ib(init=False, repr=False, eq=False, factory=threading.RLock)
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        """
+        Return the SQLite connection, opening the database (and creating it) on first use.
+        """
+        if self._conn is None:
+            with self._lock:
+                if self._conn is None:
+                    self._conn = open_database(self.path, _SCHEMA)
+        return self._conn
+
+    def close(self) -> None:
+        """
+        Close the database. It is opened again on the next use.
+        """
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    @staticmethod
+    def scope(endpoint: str, cp_id: int = None, query: Dict[str, Any] = None) -> str:
+        """
+        Return the key of the records and high-water mark of an (endpoint, project, query).
+        """
+        material = json.dumps([endpoint.strip("/"), cp_id, query or {}], sort_keys=True, default=str)
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def watermark(self, scope: str) -> Optional[datetime]:
+        """
+        Return the high-water mark of a scope, or None if it was never synced.
+        """
+        with self._lock:
+            row = self.connection.execute("SELECT high_water FROM watermarks WHERE scope = ?", (scope,)).fetchone()
+        return _parse_timestamp(row[0]) if row else None
+
+    def set_watermark(self, scope: str, endpoint: str, cp_id: Optional[int], query: Dict[str, Any],
+                      high_water: Optional[datetime]) -> None:
+        """
+        Record a completed sync of a scope.
+        """
+        with self._lock:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO watermarks VALUES (?, ?, ?, ?, ?, ?)",
+                (scope, endpoint, cp_id, json.dumps(query or {}, sort_keys=True, default=str),
+                 high_water.isoformat() if high_water else None, time.time()),
+            )
+
+    def merge(self, scope: str, records: Iterable[Tuple[Any, Optional[datetime], Dict[str, Any]]]) -> Tuple[int, int]:
+        """
+        Insert or update records of a scope in one transaction.
+
+        :param records: ``(pk, updated_at, record)`` tuples
+        :return: Number of inserted and updated records (unchanged ones are skipped)
+        :rtype: Tuple[int, int]
+        """
+        inserted = updated = 0
+        with self._lock:
+            conn = self.connection
+            conn.execute("BEGIN")
+            try:
+                for pk, updated_at, record in records:
+                    payload = json.dumps(record, sort_keys=True, default=str)
+                    digest = hashlib.sha256(payload.encode("utf-8")).hexdigest()
+                    row = conn.execute(
+                        "SELECT digest FROM records WHERE scope = ? AND pk = ?", (scope, str(pk))
+                    ).fetchone()
+                    if row is not None and row[0] == digest:
+                        continue
+                    conn.execute(
+                        "INSERT OR REPLACE INTO records VALUES (?, ?, ?, ?, ?)",
+                        (scope, str(pk), updated_at.isoformat() if updated_at else None, digest, payload),
+                    )
+                    if row is None:
+                        inserted += 1
+                    else:
+                        updated += 1
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        return inserted, updated
+
+    def records(self, scope: str) -> Iterator[Dict[str, Any]]:
+        """
+        Yield the stored records of a scope.
+        """
+        with self._lock:
+            rows = self.connection.execute(
+                "SELECT payload FROM records WHERE scope = ? ORDER BY rowid", (scope,)
+            ).fetchall()
+        for (payload,) in rows:
+            yield json.loads(payload)
+
+    def count(self, scope: str) -> int:
+        with self._lock:
+            return self.connection.execute("SELECT COUNT(*) FROM records WHERE scope = ?", (scope,)).fetchone()[0]
+
+    def reset(self, scope: str) -> None:
+        """
+        Forget the records and high-water mark of a scope, so the next sync is a full one.
+        """
+        with self._lock:
+            conn = self.connection
+            conn.execute("DELETE FROM records WHERE scope = ?", (scope,))
+            conn.execute("DELETE FROM watermarks WHERE scope = ?", (scope,))
+
+
+@attr.s
+class _SyncRun:
+    """
+    State of one sync, shared by :func:`sync_records` and :func:`async_sync_records`.
+    """
+    store: SyncStore = attr.ib()
+    endpoint: str = attr.ib()
+    cp_id: Optional[int] = attr.ib()
+    query: Dict[str, Any] = attr.ib(converter=lambda q: dict(q or {}))
+    pk_field: str = attr.ib()
+    timestamp_field: str = attr.ib()
+    since_param: Optional[str] = attr.ib()
+
+    result: SyncResult = attr.ib(init=False)
+    request_query: Dict[str, Any] = attr.ib(init=False)
+
+    def __attrs_post_init__(self):
+        scope = self.store.scope(self.endpoint, self.cp_id, self.query)
+        previous = self.store.watermark(scope)
+        self.result = SyncResult(scope, watermark=previous)
+        self.request_query = dict(self.query)
+        if previous is not None and self.since_param:
+            self.request_query[self.since_param] = previous.isoformat()
+        logger.debug("Syncing %s (project %s) since %s", self.endpoint, self.cp_id, previous)
+
+    def keyed(self, row: Dict[str, Any]) -> Optional[Tuple[Any, Optional[datetime], Dict[str, Any]]]:
+        """
+        Return the ``(pk, updated_at, record)`` of a row, advancing the high-water mark, or None without pk.
+        """
+        result = self.result
+        result.fetched += 1
+        pk = row.get(self.pk_field)
+        if pk is None:
+            logger.warning("Skipping record of %s without %s", self.endpoint, self.pk_field)
+            return None
+        updated_at = _parse_timestamp(row.get(self.timestamp_field))
+        if updated_at is not None and (result.watermark is None or updated_at > result.watermark):
+            result.watermark = updated_at
+        return pk, updated_at, row
+
+    def merge(self, batch: List[Tuple[Any, Optional[datetime], Dict[str, Any]]]) -> None:
+        inserted, updated = self.store.merge(self.result.scope, batch)
+        self.result.inserted += inserted
+        self.result.updated += updated
+
+    def finish(self) -> SyncResult:
+        result = self.result
+        self.store.set_watermark(result.scope, self.endpoint, self.cp_id, self.query, result.watermark)
+        logger.debug("Synced %s: %d fetched, %d new, %d changed", self.endpoint, result.fetched, result.inserted,
+                     result.updated)
+        return result
+
+
+def sync_records(client, endpoint: str, store: SyncStore, cp_id: int = None, query: Dict[str, Any] = None,
+                 pk_field: str = "pk", timestamp_field: str = "updated_at", since_param: str = None,
+                 page_size: int = 50) -> SyncResult:
+    """
+    Pull the records of a listing changed since the last sync and merge them into ``store``.
+
+    The high-water mark is only advanced when the whole listing has been read, so an
+    interrupted sync is repeated from the previous mark.
+
+    :param client: API client
+    :param endpoint: Listing endpoint
+    :type endpoint: str
+    :param store: Local store
+    :type store: SyncStore
+    :param cp_id: Classification project, part of the scope (it must also be in ``query`` if the endpoint filters by it)
+    :type cp_id: int, optional
+    :param query: Query parameters of the listing, part of the scope
+    :type query: dict, optional
+    :param pk_field: Primary key field of the records, defaults to ``pk``
+    :type pk_field: str, optional
+    :param timestamp_field: Last modification field of the records, defaults to ``updated_at``
+    :type timestamp_field: str, optional
+    :param since_param: Query parameter of the server filtering records modified since a date,
+        if the endpoint has one. Without it every record is read and unchanged ones are skipped.
+    :type since_param: str, optional
+    :param page_size: Records per page
+    :type page_size: int, optional
+    :rtype: SyncResult
+    """
+    run = _SyncRun(store, endpoint, cp_id, query, pk_field, timestamp_field, since_param)
+    rows = APIQuery(client, endpoint, run.request_query, schema=None, page_size=page_size)
+    for batch in batches(filter(None, map(run.keyed, rows)), BATCH_SIZE):
+        run.merge(batch)
+    return run.finish()
+
+
+async def async_sync_records(client, endpoint: str, store: SyncStore, cp_id: int = None,
+                             query: Dict[str, Any] = None, pk_field: str = "pk", timestamp_field: str = "updated_at",
+                             since_param: str = None, page_size: int = 50) -> SyncResult:
+    """
+    Like :func:`sync_records`, reading the listing through an asynchronous client.
+
+    The pages are read without blocking the event loop; each batch is merged into the
+    local store in a short transaction.
+    """
+    run = _SyncRun(store, endpoint, cp_id, query, pk_field, timestamp_field, since_param)
+    batch = []
+    async for row in AsyncAPIQuery(client, endpoint, run.request_query, schema=None, page_size=page_size):
+        record = run.keyed(row)
+        if record is None:
+            continue
+        batch.append(record)
+        if len(batch) >= BATCH_SIZE:
+            run.merge(batch)
+            batch = []
+    if batch:
+        run.merge(batch)
+    return run.finish()
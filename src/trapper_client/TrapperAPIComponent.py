@@ -1,17 +1,18 @@
 import csv
 import io
 import re
-import zipfile
 from inspect import Signature, Parameter
-from typing import Type, Dict, Any, Callable, TypeVar
+from typing import Type, Dict, Any, Callable, TypeVar, Iterator
 
 from pydantic import BaseModel
 
-from trapper_client.APIClientBase import APIClientBase
+from trapper_client.APIClientBase import APIClientBase, is_csv_response, decode_csv_text
 import attr
 import logging
 
 from trapper_client.APIQuery import APIQuery
+from trapper_client.Columns import COLUMNS, ColumnarResults, check_container
+from trapper_client.Validation import FULL, build_page
 
 logger = logging.getLogger(__name__)
 
@@ -60,6 +61,12 @@ class TrapperAPIComponent:
 
     explicit_fields = ["pk"]
 
+    def _validation_mode(self, validate: str = None) -> str:
+        """
+        Validation mode of a call: the one requested or, by default, the one of the client.
+        """
+        return validate or getattr(self._client, "validate", FULL)
+
     def _resolve_endpoint(self, endpoint: str, query: dict | None):
         """
         Reemplaza variables del endpoint como /{cp}/ usando valores del query.
@@ -168,7 +175,9 @@ class TrapperAPIComponent:
         query: Dict[str, Any] = None,
         filter_fn: Callable[[T], bool] = None,
         endpoint: str = None,
-        schema: type[BaseModel]=None
+        schema: type[BaseModel]=None,
+        validate: str = None,
+        as_: str = None,
     ) -> T:
         """
         Retrieve all results (all pages) from the endpoint.
@@ -181,18 +190,26 @@ class TrapperAPIComponent:
             Optional function to filter results locally.
         endpoint : str, optional
             Optional endpoint override.
+        validate : str, optional
+            Validation mode (``"full"``, ``"light"`` or ``"none"``), defaults to the client setting.
+        as_ : str, optional
+            ``"columns"`` stores the results column-wise in a :class:`ColumnarResults` instead of
+            building one model per row. ``filter_fn`` then receives row views.
 
         Returns
         -------
         T
-            Pydantic model containing all retrieved results.
+            Pydantic model containing all retrieved results (or ColumnarResults with ``as_="columns"``).
         """
         actual_endpoint = self._resolve_endpoint(endpoint or self._endpoint, query)
         actual_schema = schema or self._schema
-        logger.debug(f"TrapperAPIComponent.get_all called with endpoint: {actual_endpoint} and query: {query}")
+        logger.debug("TrapperAPIComponent.get_all called with endpoint: %s and query: %s", actual_endpoint, query)
+        container = check_container(as_)
         res = self._client.get_all_pages(actual_endpoint, query)
-        logger.debug(f"Validating components using {actual_schema} schema")
-        parsed = actual_schema(**res)
+        if container == COLUMNS:
+            return ColumnarResults.from_page(actual_schema, res, filter_fn)
+        logger.debug("Validating components using %s schema", actual_schema)
+        parsed = build_page(actual_schema, res, self._validation_mode(validate))
         if filter_fn:
             parsed.results = [r for r in parsed.results if filter_fn(r)]
         return parsed
@@ -202,7 +219,8 @@ class TrapperAPIComponent:
         query: Dict[str, Any] = None,
         filter_fn: Callable[[T], bool] = None,
         endpoint: str = None,
-        schema: type[BaseModel]=None
+        schema: type[BaseModel]=None,
+        validate: str = None,
     ) -> T:
         """
         Retrieve results from the endpoint (single page).
@@ -215,6 +233,8 @@ class TrapperAPIComponent:
             Optional function to filter results locally.
         endpoint : str, optional
             Optional endpoint override.
+        validate : str, optional
+            Validation mode (``"full"``, ``"light"`` or ``"none"``), defaults to the client setting.
 
         Returns
         -------
@@ -224,21 +244,27 @@ class TrapperAPIComponent:
         actual_endpoint = self._resolve_endpoint(endpoint or self._endpoint, query)
         actual_schema = schema or self._schema
         res = self._client.get(actual_endpoint, query)
-        parsed = actual_schema(**res)
+        parsed = build_page(actual_schema, res, self._validation_mode(validate))
         if filter_fn:
             parsed.results = [r for r in parsed.results if filter_fn(r)]
         return parsed
 
-    def where(self, filter_fn: Callable[[T], bool] = None, **query):
+    def where(self, filter_fn: Callable[[T], bool] = None, prefetch: int = 0, validate: str = None, **query):
         """
         Igual que Zooniverse: devuelve un iterador estilo cursor
         que carga página a página.
+
+        Con ``prefetch`` > 0 las siguientes páginas (como máximo ``prefetch``) se cargan
+        en segundo plano mientras se recorre la actual.
         """
         return APIQuery(
             client=self._client,
             endpoint=self._endpoint,
             query=query,
-            schema=self._schema
+            schema=self._schema,
+            filter_fn=filter_fn,
+            prefetch=prefetch,
+            validate=self._validation_mode(validate),
         )
 
     def first(self, **filters):
@@ -306,8 +332,31 @@ class TrapperAPIComponent:
         return self.get(filters, filter_fn=filter_fn, endpoint=endpoint)
 
 
-    def export(self,query: Dict[str, Any] = None, endpoint: str = None) -> None | csv.DictReader :
-        a= self._client.make_request(
+    def export(self, query: Dict[str, Any] = None, endpoint: str = None,
+               stream: bool = False) -> None | csv.DictReader | Iterator[Dict[str, str]]:
+        """
+        Download a CSV export (plain, zip, gzip or bzip2) from the API.
+
+        Parameters
+        ----------
+        query : dict, optional
+            Optional query parameters.
+        endpoint : str, optional
+            Export endpoint.
+        stream : bool, optional
+            If True, return a generator that decompresses and parses the export while it is
+            downloaded (see :meth:`iter_export`), so memory use stays flat whatever the size of
+            the project. Defaults to False.
+
+        Returns
+        -------
+        csv.DictReader or Iterator[dict] or None
+            Rows of the export, or None if the response is not CSV.
+        """
+        if stream:
+            return self.iter_export(query, endpoint)
+
+        a = self._client.make_request(
             method="GET",
             endpoint=endpoint,
             query=query,
@@ -316,22 +365,33 @@ class TrapperAPIComponent:
 
         content_type = a.headers.get("Content-Type", "")
 
-        if "text/csv" in content_type or a.text.strip().startswith(
-            tuple("abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ")):
-
-            if a.content[:4] == b'PK\x03\x04' or "zip" in content_type:
-                with zipfile.ZipFile(io.BytesIO(a.content)) as zf:
-                    csv_name = next((n for n in zf.namelist() if n.endswith(".csv")), None)
-                    csv_text = zf.read(csv_name).decode("utf-8") if csv_name else ""
-            elif a.content[:2] == b'\x1f\x8b' or "gzip" in content_type:
-                import gzip
-                csv_text = gzip.decompress(a.content).decode("utf-8")
-            elif a.content[:2] == b'BZ' or "bzip2" in content_type:
-                import bz2
-                csv_text = bz2.decompress(a.content).decode("utf-8")
-            else:
-                csv_text = a.text
-
-            return csv.DictReader(io.StringIO(csv_text))
-        else:
-            None
\ No newline at end of file
+        if is_csv_response(content_type, a.content):
+            return csv.DictReader(io.StringIO(decode_csv_text(a.content, content_type, a.text)))
+        return None
+
+    def iter_export(self, query: Dict[str, Any] = None, endpoint: str = None) -> Iterator[Dict[str, str]]:
+        """
+        Stream the rows of a CSV export as they are downloaded.
+
+        Compressed exports are decompressed incrementally; rows are yielded one at a time
+        and never accumulated, so the whole body is never held in memory.
+
+        Parameters
+        ----------
+        query : dict, optional
+            Optional query parameters. Endpoint variables such as ``{cp}`` are taken from it.
+        endpoint : str, optional
+            Export endpoint, defaults to the component endpoint.
+
+        Returns
+        -------
+        Iterator[dict]
+            Generator of CSV rows.
+
+        Examples
+        --------
+        for row in client.deployments.export(stream=True):
+            print(row["deploymentID"])
+        """
+        actual_endpoint = self._resolve_endpoint(endpoint or self._endpoint, query)
+        return self._client.stream_csv(actual_endpoint, query)
@@ -10,6 +10,10 @@ import csv
 import logging
 
 from trapper_client.APIClientBase import APIClientBase
+from trapper_client.Mirror import ProjectMirror
+from trapper_client.RateLimiter import RateLimiter
+from trapper_client.ResponseCache import ResponseCache
+from trapper_client.RetryPolicy import RetryPolicy
 from trapper_client.components.ClassificatorsComponent import ClassificatorsComponent
 from trapper_client.components.ResourcesComponent import ResourcesComponent
 from trapper_client.components.CollectionsComponent import CollectionsComponent
@@ -50,6 +54,24 @@ class TrapperClient:
         Username for authentication.
     user_password : str
         Password for authentication.
+    pool_maxsize : int
+        Maximum number of keep-alive connections kept per host by the HTTP session.
+    media_pool_maxsize : int
+        Maximum number of connections per host used to download media files; grows to the number of
+        workers of a bulk download.
+    page_workers : int
+        Maximum number of pages fetched concurrently when retrieving all pages of an endpoint.
+    retry_policy : RetryPolicy
+        Policy used to retry transient failures (throttling, gateway errors, connection resets).
+    api_rate_limit : float, optional
+        Maximum API requests per second sent to the server, shared by all components and threads (None = unlimited).
+    media_rate_limit : float, optional
+        Maximum media downloads per second, budgeted separately from API requests (None = unlimited).
+    validate : str
+        How results are built: "full" Pydantic validation, "light" scalar coercion only or "none"
+        (trusted server, no validation). Can be overridden per call.
+    cache : ResponseCache, optional
+        Persistent cache of GET responses for rarely changing listings (None = no cache).
     raw : APIClientBase
         Raw API client instance.
     locations : LocationsComponent
@@ -74,6 +96,14 @@ class TrapperClient:
     base_url: str = attr.ib(default="https://wildintel-trap.uhu.es", converter=parse_url)
     user_name: str = attr.ib(repr=False, default="me")
     user_password: str = attr.ib(repr=False, default="")
+    pool_maxsize: int = attr.ib(repr=False, default=10)
+    media_pool_maxsize: int = attr.ib(repr=False, default=10)
+    page_workers: int = attr.ib(repr=False, default=4)
+    retry_policy: RetryPolicy = attr.ib(repr=False, factory=RetryPolicy)
+    api_rate_limit: float = attr.ib(repr=False, default=None)
+    media_rate_limit: float = attr.ib(repr=False, default=None)
+    validate: str = attr.ib(repr=False, default="full")
+    cache: ResponseCache = attr.ib(repr=False, default=None)
 
     raw: APIClientBase = attr.ib(init=False, repr=False)
 
@@ -83,6 +113,13 @@ class TrapperClient:
             user_name=self.user_name,
             user_password=self.user_password,
             base_url=self.base_url,
+            pool_maxsize=self.pool_maxsize,
+            media_pool_maxsize=self.media_pool_maxsize,
+            page_workers=self.page_workers,
+            retry_policy=self.retry_policy,
+            rate_limiter=RateLimiter(api_rate=self.api_rate_limit, media_rate=self.media_rate_limit),
+            validate=self.validate,
+            cache=self.cache,
         )
 
         self.locations: LocationsComponent = LocationsComponent(self.raw)
@@ -100,6 +137,44 @@ class TrapperClient:
         self.collections: CollectionsComponent = CollectionsComponent(self.raw)
         self.packages: PackagesComponent = PackagesComponent(self.raw)
 
+    def close(self) -> None:
+        """
+        Close the underlying HTTP session and release its pooled connections.
+        """
+        self.raw.close()
+
+    def mirror(self, cp_id: int, path: str, refresh: bool = True, max_age: float = None) -> ProjectMirror:
+        """
+        Open (and bring up to date) a local SQLite mirror of a classification project.
+
+        Parameters
+        ----------
+        cp_id : int
+            The ID of the classification project.
+        path : str
+            SQLite database file of the mirror; it is created if missing.
+        refresh : bool, optional
+            Refresh the mirror before returning it. Defaults to True.
+        max_age : float, optional
+            Only refresh the tables older than ``max_age`` seconds. Defaults to None (refresh all).
+
+        Returns
+        -------
+        ProjectMirror
+            The mirror, ready to be queried.
+        """
+        mirror = ProjectMirror(self.raw, cp_id, path)
+        if refresh:
+            mirror.refresh(max_age=max_age)
+        return mirror
+
+    def __enter__(self) -> "TrapperClient":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
     @classmethod
     def from_environment(cls) -> "TrapperClient":
         """
@@ -124,7 +199,8 @@ class TrapperClient:
         logger.debug("Creating TrapperClient from environment variables.")
         env = os.environ
 
-        logger.debug(f"{env.get("TRAPPER_ACCESS_TOKEN", None)} - {env.get("TRAPPER_URL", None)} - {env.get("TRAPPER_USER_NAME", None)} - {env.get("TRAPPER_USER_PASSWORD", None)}")
+        logger.debug("TRAPPER_URL=%s, TRAPPER_USER_NAME=%s",
+                     env.get("TRAPPER_URL", None), env.get("TRAPPER_USER_NAME", None))
 
         return cls(
             access_token=env.get("TRAPPER_ACCESS_TOKEN", None),
@@ -0,0 +1,332 @@
+"""
+Validation modes used to turn API payloads into schema instances.
+
+Defines:
+    - FULL, LIGHT, NONE: the supported ``validate`` modes.
+    - results_validator: cached full validator of the ``results`` of a list schema.
+    - results_builder: cached function building the ``results`` of a list schema in a given mode.
+    - build_page: build a list schema instance (pagination and results) in a given mode.
+    - scalar_coercer, strip_optional: annotation helpers shared with the columnar results.
+
+``"full"`` runs the whole Pydantic validation, including every ``field_validator``.
+``"light"`` builds the models with ``model_construct`` after a cheap coercion of scalar
+fields (empty strings to None, numbers, booleans and ISO datetimes) and leaves complex
+values (bboxes, nested dicts) as received. ``"none"`` builds the models with
+``model_construct`` from the raw values. The last two trust the server: invalid rows are
+not detected.
+"""
+import logging
+import types
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type, Union, get_args, get_origin
+
+from pydantic import BaseModel, Discriminator, TypeAdapter
+from typing_extensions import Annotated
+
+logger = logging.getLogger(__name__)
+
+FULL = "full"
+LIGHT = "light"
+NONE = "none"
+VALIDATION_MODES = (FULL, LIGHT, NONE)
+
+_TRUE = frozenset({"true", "t", "yes", "y", "1"})
+_FALSE = frozenset({"false", "f", "no", "n", "0"})
+
+
+def check_mode(mode: str) -> str:
+    """
+    Return ``mode`` if it is a supported validation mode.
+
+    :raises ValueError: If the mode is unknown
+    """
+    if mode not in VALIDATION_MODES:
+        raise ValueError(f"Invalid validation mode: {mode}. Must be one of {', '.join(VALIDATION_MODES)}")
+    return mode
+
+
+@lru_cache(maxsize=None)
+def results_validator(schema: Type[BaseModel]) -> Callable[[List[Any]], List[Any]]:
+    """
+    Return a function validating the ``results`` of one page of ``schema`` in a single call.
+
+    The validator is built once per schema from the annotation of its ``results`` field,
+    so a whole page is validated without building the list model (and its pagination) and
+    without re-wrapping every item.
+
+    :param schema: Paginated list schema, e.g. ``Schemas.TrapperMediaList``
+    :type schema: Type[BaseModel]
+    :return: Function turning a list of raw items into a list of validated items
+    :rtype: Callable[[list], list]
+    """
+    field = schema.model_fields.get("results") if hasattr(schema, "model_fields") else None
+    if field is None:
+        adapter = TypeAdapter(schema)
+        pagination = {"page": 1, "page_size": 0, "pages": 1, "count": 0}
+        return lambda results: adapter.validate_python({"pagination": pagination, "results": results}).results
+
+    return TypeAdapter(field.annotation).validate_python
+
+
+def _is_model(tp: Any) -> bool:
+    return isinstance(tp, type) and issubclass(tp, BaseModel)
+
+
+def strip_optional(tp: Any) -> Tuple[Any, bool]:
+    """
+    Remove ``None`` from an ``Optional`` annotation and tell whether it was there.
+    """
+    if get_origin(tp) in (Union, types.UnionType):
+        args = [a for a in get_args(tp) if a is not type(None)]
+        if len(args) < len(get_args(tp)):
+            return (args[0] if len(args) == 1 else Union[tuple(args)]), True
+    return tp, False
+
+
+def _to_int(v: Any) -> Any:
+    try:
+        return int(v)
+    except ValueError:
+        return int(float(v))
+
+
+def _to_bool(v: Any) -> Any:
+    s = v.strip().lower()
+    if s in _TRUE:
+        return True
+    if s in _FALSE:
+        return False
+    return v
+
+
+_SCALAR_COERCERS = {
+    int: _to_int,
+    float: float,
+    bool: _to_bool,
+    datetime: datetime.fromisoformat,
+}
+
+
+def scalar_coercer(tp: Any) -> Optional[Callable[[Any], Any]]:
+    """
+    Return the function converting a string to the scalar type ``tp`` (int, float, bool or
+    datetime), or None for any other type. Values that cannot be converted are returned as received.
+    """
+    convert = _SCALAR_COERCERS.get(tp)
+    return _coercer(convert) if convert is not None else None
+
+
+def _item_builder(tp: Any, mode: str) -> Optional[Callable[[Any], Any]]:
+    """
+    Return a function building a value of annotation ``tp``, or None if values are kept as received.
+    """
+    if _is_model(tp):
+        return lambda v, model=tp: _construct(model, v, mode)
+
+    if get_origin(tp) is Annotated or get_origin(tp) in (Union, types.UnionType):
+        picker = _member_picker(tp, mode)
+        if picker is not None:
+            return picker
+
+    if get_origin(tp) in (list, List):
+        args = get_args(tp)
+        inner = _item_builder(args[0], mode) if args else None
+        if inner is not None:
+            return lambda v: [inner(x) for x in v] if isinstance(v, list) else v
+
+    return None
+
+
+def _member_picker(tp: Any, mode: str) -> Optional[Callable[[Any], Any]]:
+    """
+    Build a function constructing the member of a union of models that matches a row.
+
+    Discriminated unions use their discriminator. For plain unions the first member whose
+    required fields are all present (and that accepts every key, if it forbids extras) is
+    used; rows matching no member are fully validated.
+    """
+    discriminator = None
+    if get_origin(tp) is Annotated:
+        tp, *metadata = get_args(tp)
+        discriminator = next((m for m in metadata if isinstance(m, Discriminator)), None)
+
+    members = get_args(tp) if get_origin(tp) in (Union, types.UnionType) else ()
+    if not members:
+        return None
+
+    tagged = {}
+    models = []
+    for member in members:
+        tag = None
+        if get_origin(member) is Annotated:
+            member, *metadata = get_args(member)
+            tag = next((getattr(m, "tag") for m in metadata if hasattr(m, "tag")), None)
+        if not _is_model(member):
+            return None
+        models.append(member)
+        if tag is not None:
+            tagged[tag] = member
+
+    fallback = TypeAdapter(tp if discriminator is None else Annotated[tp, discriminator]).validate_python
+
+    if discriminator is not None and callable(discriminator.discriminator) and tagged:
+        tag_of = discriminator.discriminator
+
+        def pick(row):
+            return tagged.get(tag_of(row))
+    else:
+        shapes = [(m, _required_keys(m), _allowed_keys(m)) for m in models]
+
+        def pick(row):
+            keys = row.keys()
+            for model, required, allowed in shapes:
+                if required <= keys and (allowed is None or keys <= allowed):
+                    return model
+            return None
+
+    def build(row):
+        if isinstance(row, BaseModel):
+            return row
+        model = pick(row) if isinstance(row, dict) else None
+        if model is None:
+            return fallback(row)
+        return _construct(model, row, mode)
+
+    return build
+
+
+def _required_keys(model: Type[BaseModel]) -> frozenset:
+    return frozenset(f.alias or name for name, f in model.model_fields.items() if f.is_required())
+
+
+def _allowed_keys(model: Type[BaseModel]) -> Optional[frozenset]:
+    if model.model_config.get("extra") != "forbid":
+        return None
+    return frozenset(f.alias or name for name, f in model.model_fields.items())
+
+
+def _coercer(convert: Callable[[Any], Any]) -> Callable[[Any], Any]:
+    def coerce(v):
+        if not isinstance(v, str):
+            return v
+        try:
+            return convert(v)
+        except (TypeError, ValueError):
+            return v
+    return coerce
+
+
+@lru_cache(maxsize=None)
+def _constructor(model: Type[BaseModel], mode: str) -> Callable[[Dict[str, Any]], BaseModel]:
+    """
+    Return a function building ``model`` from a raw row without validation.
+
+    The field plan (input key, conversion, defaults) is computed once per model and mode.
+    Instances are created like ``model_construct`` does, but without its per-call overhead.
+    """
+    copied = []      # (name, key): value kept as received
+    converted = []   # (name, key, empty_to_none, builder)
+    defaults = {}
+    factories = []
+    for name, field in model.model_fields.items():
+        tp, optional = strip_optional(field.annotation)
+        key = field.alias or name
+        builder = _item_builder(tp, mode)
+        if builder is None and mode == LIGHT:
+            builder = scalar_coercer(tp)
+        empty_to_none = optional and mode == LIGHT
+        if builder is None and not empty_to_none:
+            copied.append((name, key))
+        else:
+            converted.append((name, key, empty_to_none, builder))
+        if field.default_factory is not None:
+            factories.append((name, field.default_factory))
+        elif not field.is_required():
+            defaults[name] = field.default
+
+    n_fields = len(model.model_fields)
+    new = object.__new__
+    set_attr = object.__setattr__
+
+    def construct(row: Dict[str, Any]) -> BaseModel:
+        values = {name: row[key] for name, key in copied if key in row}
+        for name, key, empty_to_none, builder in converted:
+            if key not in row:
+                continue
+            v = row[key]
+            if v == "" and empty_to_none:
+                v = None
+            elif builder is not None and v is not None:
+                v = builder(v)
+            values[name] = v
+        fields_set = set(values)
+        if len(values) < n_fields:
+            for name, default in defaults.items():
+                values.setdefault(name, default)
+            for name, factory in factories:
+                if name not in values:
+                    values[name] = factory()
+        obj = new(model)
+        set_attr(obj, "__dict__", values)
+        set_attr(obj, "__pydantic_fields_set__", fields_set)
+        set_attr(obj, "__pydantic_extra__", None)
+        set_attr(obj, "__pydantic_private__", None)
+        return obj
+
+    return construct
+
+
+def _construct(model: Type[BaseModel], row: Any, mode: str) -> Any:
+    """
+    Build ``model`` from a raw row without validation, following the field plan of ``mode``.
+    """
+    if not isinstance(row, dict):
+        return row
+    return _constructor(model, mode)(row)
+
+
+@lru_cache(maxsize=None)
+def results_builder(schema: Type[BaseModel], mode: str = FULL) -> Callable[[List[Any]], List[Any]]:
+    """
+    Return a function building the ``results`` of one page of ``schema`` in the given mode.
+
+    :param schema: Paginated list schema, e.g. ``Schemas.TrapperMediaList``
+    :type schema: Type[BaseModel]
+    :param mode: ``"full"``, ``"light"`` or ``"none"``, defaults to ``"full"``
+    :type mode: str, optional
+    :return: Function turning a list of raw items into a list of schema items
+    :rtype: Callable[[list], list]
+    """
+    if check_mode(mode) == FULL:
+        return results_validator(schema)
+
+    field = schema.model_fields["results"]
+    tp, _ = strip_optional(field.annotation)
+    item = _item_builder(get_args(tp)[0], mode)
+    if item is None:
+        return list
+    return lambda results: [item(r) for r in results]
+
+
+def build_page(schema: Type[BaseModel], data: Dict[str, Any], mode: str = FULL) -> BaseModel:
+    """
+    Build a list schema instance from a page (``{"pagination": ..., "results": ...}``).
+
+    :param schema: Paginated list schema
+    :type schema: Type[BaseModel]
+    :param data: Normalized page returned by the API client
+    :type data: dict
+    :param mode: ``"full"``, ``"light"`` or ``"none"``, defaults to ``"full"``
+    :type mode: str, optional
+    :return: Instance of ``schema``
+    :rtype: BaseModel
+    """
+    if check_mode(mode) == FULL:
+        return schema(**data)
+
+    pagination_tp, _ = strip_optional(schema.model_fields["pagination"].annotation)
+    pagination = data.get("pagination")
+    if _is_model(pagination_tp):
+        pagination = _construct(pagination_tp, pagination, mode)
+    return schema.model_construct(pagination=pagination, results=results_builder(schema, mode)(data.get("results", [])))
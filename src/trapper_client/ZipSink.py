@@ -0,0 +1,168 @@
+"""
+Streaming ZIP archives for media exports.
+
+Defines:
+    - ZipSink: thread-safe writer that streams downloaded files into ZIP entries
+      (ZIP64, STORED for already compressed media, size-based volumes).
+    - compress_type_for: compression method used for an entry name.
+
+Files are never staged in a folder: each download is spooled (in memory, on disk past
+``spool_size``) and copied into the archive once it is complete, so a failed download
+never leaves anything in the archive.
+"""
+import logging
+import os
+import tempfile
+import threading
+import time
+import zipfile
+from pathlib import Path
+from typing import BinaryIO, Iterable, List, Optional
+
+import attr
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 1024 * 1024
+DEFAULT_SPOOL_SIZE = 8 * 1024 * 1024
+
+# Formatos ya comprimidos: deflate solo gasta CPU
+STORED_EXTENSIONS = frozenset({
+    ".jpg", ".jpeg", ".png", ".gif", ".webp", ".heic",
+    ".mp4", ".m4v", ".mov", ".avi", ".mkv", ".webm", ".mp3", ".m4a",
+    ".zip", ".gz", ".bz2", ".xz", ".7z",
+})
+
+
+def compress_type_for(name: str) -> int:
+    """
+    Return ``ZIP_STORED`` for already compressed formats (by extension) and ``ZIP_DEFLATED`` otherwise.
+    """
+    return zipfile.ZIP_STORED if os.path.splitext(name)[1].lower() in STORED_EXTENSIONS else zipfile.ZIP_DEFLATED
+
+
+@attr.s
+class ZipSink:
+    """
+    ZIP archive (optionally split in volumes) that downloads are streamed into.
+
+    Entries are always written with ZIP64 headers, so files and archives over 4 GiB are
+    supported. Without ``max_volume_size`` a single ``<base>.zip`` is written; otherwise
+    the volumes are ``<base>_001.zip``, ``<base>_002.zip``... and a new one is started when
+    the next entry would make the current one exceed the limit. Every volume is a complete
+    ZIP file. An entry is only added to the archive once its whole content has been spooled.
+
+    Examples
+    --------
+    with ZipSink(Path("export/media"), max_volume_size=2 * 1024 ** 3) as sink:
+        resp = requests.get(url, stream=True)
+        sink.write("dep_01/1.jpg", resp.iter_content(8192))
+    print(sink.volumes)
+
+    :param base: Path of the archive without the ``.zip`` extension
+    :type base: Path
+    :param max_volume_size: Approximate maximum size in bytes of each volume, defaults to None (a single file)
+    :type max_volume_size: int, optional
+    :param spool_size: Bytes a download keeps in memory before spooling to disk, defaults to 8 MiB
+    :type spool_size: int, optional
+    """
+    base: Path = attr.ib(converter=Path)
+    max_volume_size: Optional[int] = attr.ib(default=None)
+    spool_size: int = attr.ib(default=DEFAULT_SPOOL_SIZE)
+
+    _volumes: List[Path] = attr.ib(init=False, repr=False, factory=list)
+    _file: Optional[BinaryIO] = attr.ib(init=False, repr=False, default=None)
+    _zip: Optional[zipfile.ZipFile] = attr.ib(init=False, repr=False, default=None)
+    _lock: threading.Lock = attr.ib(init=False, repr=False, eq=False, factory=threading.Lock)
+
+    @property
+    def volumes(self) -> List[Path]:
+        """
+        Paths of the volumes written so far.
+        """
+        return list(self._volumes)
+
+    def volume_path(self, index: int) -> Path:
+        if self.max_volume_size is None:
+            return self.base.with_name(self.base.name + ".zip")
+        return self.base.with_name(f"{self.base.name}_{index:03}.zip")
+
+    def write(self, arcname: str, chunks: Iterable[bytes]) -> Path:
+        """
+        Write a file into the archive from an iterable of chunks and return its volume.
+
+        The chunks are spooled first: if reading them fails nothing is added to the archive.
+
+        :param arcname: Name of the entry inside the archive
+        :type arcname: str
+        :param chunks: Content of the file
+        :type chunks: Iterable[bytes]
+        :rtype: Path
+        """
+        spool = self.spool()
+        try:
+            for chunk in chunks:
+                spool.write(chunk)
+        except BaseException:
+            spool.close()
+            raise
+        return self.write_spooled(arcname, spool)
+
+    def spool(self) -> BinaryIO:
+        """
+        Return a temporary file to buffer a download until :meth:`write_spooled`.
+        """
+        return tempfile.SpooledTemporaryFile(max_size=self.spool_size)
+
+    def write_spooled(self, arcname: str, spool: BinaryIO) -> Path:
+        """
+        Write the content of a spool (see :meth:`spool`) into the archive, close it and return its volume.
+        """
+        with spool:
+            size = spool.tell()
+            spool.seek(0)
+            with self._lock:
+                return self._write_entry(arcname, spool, size)
+
+    def close(self) -> None:
+        """
+        Finish the current volume. An empty archive is written if nothing was added.
+        """
+        with self._lock:
+            if not self._volumes:
+                self._volume_for(None)
+            self._close_volume()
+
+    def __enter__(self) -> "ZipSink":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def _write_entry(self, arcname: str, spool: BinaryIO, size: int) -> Path:
+        zf = self._volume_for(size)
+        info = zipfile.ZipInfo(arcname, date_time=time.localtime()[:6])
+        info.compress_type = compress_type_for(arcname)
+        with zf.open(info, "w", force_zip64=True) as entry:
+            for chunk in iter(lambda: spool.read(CHUNK_SIZE), b""):
+                entry.write(chunk)
+        return self._volumes[-1]
+
+    def _volume_for(self, size: Optional[int]) -> zipfile.ZipFile:
+        if (self._zip is not None and self.max_volume_size is not None and size is not None
+                and self._zip.filelist and self._file.tell() + size > self.max_volume_size):
+            self._close_volume()
+        if self._zip is None:
+            path = self.volume_path(len(self._volumes) + 1)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = open(path, "w+b")
+            self._zip = zipfile.ZipFile(self._file, "w", allowZip64=True)
+            self._volumes.append(path)
+            logger.debug("Writing ZIP volume %s", path)
+        return self._zip
+
+    def _close_volume(self) -> None:
+        if self._zip is not None:
+            self._zip.close()
+            self._file.close()
+            self._zip = self._file = None
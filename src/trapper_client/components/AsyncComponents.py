@@ -0,0 +1,704 @@
+"""
+Asynchronous mirrors of the Trapper API components.
+
+Each class wraps the synchronous component of the same name through
+:class:`AsyncTrapperAPIComponent`, reusing its endpoint and schema, and
+re-implements as coroutines the methods that issue HTTP requests.
+"""
+import asyncio
+import os
+from pathlib import Path
+from typing import Dict, Any, AsyncIterator, List, Tuple, Union, Set
+
+import attr
+
+from trapper_client import Schemas
+from trapper_client.AsyncDownloader import AsyncDownloader
+from trapper_client.AsyncTrapperAPIComponent import AsyncTrapperAPIComponent
+from trapper_client.DownloadManifest import DownloadManifest, PartFile
+from trapper_client.MediaPredicates import MediaFlags, MediaPredicate, ONLY_ANIMALS
+from trapper_client.RateLimiter import MEDIA
+from trapper_client.Reports import Report
+from trapper_client.Schemas import TrapperMedia
+from trapper_client.SyncState import SyncResult, SyncStore, async_sync_records
+from trapper_client.TrapperAPIComponent import T
+from trapper_client.ZipSink import ZipSink
+from trapper_client.components.ClassificationProjectsComponent import ClassificationProjectsComponent
+from trapper_client.components.ClassificatorsComponent import ClassificatorsComponent
+from trapper_client.components.CollectionsComponent import CollectionsComponent, CollectionIndex
+from trapper_client.components.DeploymentsComponent import DeploymentsComponent
+from trapper_client.components.LocationsComponent import LocationsComponent
+from trapper_client.components.MediaComponent import MediaComponent
+from trapper_client.components.ObservationsComponent import ObservationsComponent, ObservationsResultsComponent, \
+    AIObservationsComponent, AIObservationsResultsComponent, UserObservationsComponent
+from trapper_client.components.PackageComponent import PackagesComponent
+from trapper_client.components.ResearchProjectsComponent import ResearchProjectsComponent
+from trapper_client.components.ResourcesComponent import ResourcesComponent
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def _empty(schema) -> T:
+    return schema(**{"pagination": {"page": 1, "page_size": 0, "pages": 1, "count": 0}, "results": []})
+
+
+async def _collection_internal_ids(client, cp_id: int, c_id: int) -> List[int]:
+    """
+    Map a collection ID to the internal IDs of the collection inside a classification project,
+    through the :class:`CollectionIndex` shared by the client.
+    """
+    index = CollectionIndex.of(client)
+    if not index.loaded(cp_id):
+        res = await client.get_all_pages(index.endpoint(cp_id))
+        index.update(cp_id, res.get("results", []))
+    return index.lookup(cp_id, c_id)
+
+
+@attr.s
+class AsyncLocationsComponent(AsyncTrapperAPIComponent):
+    _component_class = attr.ib(repr=False, default=LocationsComponent)
+
+    async def get_by_id(self, pk: str, query: dict = None) -> T:
+        return await self.get_by_pk(pk, query=query)
+
+    async def get_by_acronym(self, acro: str, query: dict = None) -> T:
+        return await self.get_filtered(location_id=acro, query=query)
+
+    async def export(self, query: dict = None, stream: bool = False):
+        return await super().export(query=query, endpoint=self._component.export_endpoint, stream=stream)
+
+
+@attr.s
+class AsyncDeploymentsComponent(AsyncTrapperAPIComponent):
+    _component_class = attr.ib(repr=False, default=DeploymentsComponent)
+
+    async def get_by_id(self, pk: str, query: dict = None) -> T:
+        return await self.get_by_pk(pk, query=query)
+
+    async def get_by_acronym(self, deployment_acro: str, query: dict = None) -> T:
+        return await self.get_filtered(deploymentID=deployment_acro, query=query)
+
+    async def export(self, query: dict = None, stream: bool = False):
+        return await super().export(query=query, endpoint=self._component.export_endpoint, stream=stream)
+
+
+@attr.s
+class AsyncCollectionsComponent(AsyncTrapperAPIComponent):
+    _component_class = attr.ib(repr=False, default=CollectionsComponent)
+
+    async def get_by_id(self, pk: int, query: dict = None) -> T:
+        return await self.get_by_pk(pk, query=query)
+
+    async def get_by_research_project(self, project_id: int, query: dict = None) -> T:
+        res = await self._client.get_all_pages(f"/research/api/project/{project_id}/collections", query)
+        return self._schema(**res)
+
+    @property
+    def index(self) -> CollectionIndex:
+        return CollectionIndex.of(self._client)
+
+    async def get_by_classification_project(self, project_id: int, query: dict = None) -> T:
+        res = await self._client.get_all_pages(CollectionIndex.endpoint(project_id), query)
+        if not query:
+            self.index.update(project_id, res.get("results", []))
+        return self._schema(**res)
+
+
+@attr.s
+class AsyncClassificationProjectsComponent(AsyncTrapperAPIComponent):
+    _component_class = attr.ib(repr=False, default=ClassificationProjectsComponent)
+
+    async def get_by_id(self, pk: int, query: dict = None) -> T:
+        return await self.get_by_pk(pk, query=query)
+
+    async def get_by_name(self, name: str, query: dict = None) -> T:
+        return await self.get_all(query, filter_fn=lambda cp: cp.name == name)
+
+    async def get_by_owners(self, owners: Set[str], query: dict = None) -> T:
+        return await self.get_all(query, filter_fn=lambda cp: cp.owner in owners)
+
+
+@attr.s
+class AsyncResearchProjectsComponent(AsyncTrapperAPIComponent):
+    _component_class = attr.ib(repr=False, default=ResearchProjectsComponent)
+
+    async def get_by_id(self, pk: int, query: dict = None) -> T:
+        return await self.get_by_pk(pk, query=query)
+
+    async def get_by_owner(self, owner: str) -> T:
+        return await self.get_all(filter_fn=lambda rp: rp.owner == owner)
+
+    async def get_by_owners(self, owners: List[str]) -> T:
+        return await self.get_all(filter_fn=lambda rp: rp.owner in owners)
+
+
+@attr.s
+class AsyncClassificatorsComponent(AsyncTrapperAPIComponent):
+    _component_class = attr.ib(repr=False, default=ClassificatorsComponent)
+
+    async def get_by_id(self, pk: str, query: dict = None) -> T:
+        return await self.get_by_pk(pk, query=query)
+
+    async def get_by_owner(self, owner: str = None, query: dict = None) -> T:
+        query = query or {}
+        query["owner"] = owner or self._client.user_name
+        return await self.get_all(query)
+
+
+@attr.s
+class AsyncResourcesComponent(AsyncTrapperAPIComponent):
+    _component_class = attr.ib(repr=False, default=ResourcesComponent)
+
+    async def get_by_collection(self, cp_id: int, query: dict = None) -> T:
+        res = await self._client.get_all_pages(f"/storage/api/resources/collection/{cp_id}", query)
+        return self._schema(**res)
+
+    async def get_by_location(self, cp_id: int, query: dict = None) -> T:
+        res = await self._client.get_all_pages(f"/storage/api/resources/location/{cp_id}", query)
+        return self._schema(**res)
+
+
+@attr.s
+class AsyncMediaComponent(AsyncTrapperAPIComponent):
+    _component_class = attr.ib(repr=False, default=MediaComponent)
+
+    async def get_by_classification_project(self, cp_id: int, query: dict = None) -> T:
+        return await self.get(query={"cp": cp_id, **(query or {})})
+
+    async def get_all_by_classification_project(self, cp_id: int, query: dict = None) -> T:
+        return await self.get_all(query={"cp": cp_id, **(query or {})})
+
+    async def get_by_media_id(self, cp_id: int, m_id: int, query: dict = None) -> T:
+        res = await self.get(query={**(query or {}), "cp": cp_id, "pk": m_id})
+        if any(entry.mediaID != m_id for entry in res.results):
+            logger.warning("The media endpoint ignored the pk filter; listing project %s to find media %s", cp_id, m_id)
+            res = await self.get_all_by_classification_project(cp_id, query)
+        res.results = [entry for entry in res.results if entry.mediaID == m_id]
+        return res
+
+    async def media_index(self, cp_id: int, query: dict = None) -> Dict[int, TrapperMedia]:
+        res = await self.get_all_by_classification_project(cp_id, query)
+        return {media.mediaID: media for media in res.results}
+
+    async def resolve(self, cp_id: int, medias: List[Union[int, TrapperMedia]]) -> (List[TrapperMedia], List[int]):
+        index = await self.media_index(cp_id) if self._component._has_ids(medias) else {}
+        return self._component._resolve(medias, index)
+
+    async def get_by_collection(self, cp_id: int, c_id: int, query: dict = None) -> T:
+        collection_inter_id = await _collection_internal_ids(self._client, cp_id, c_id)
+
+        if len(collection_inter_id) == 0:
+            return _empty(Schemas.TrapperMediaList)
+
+        q = query.copy() if query else {}
+        q["collection"] = ",".join(map(str, collection_inter_id))
+        return await self.get_all(query=q, endpoint=self._endpoint.format(cp=cp_id))
+
+    async def get_by_classification_project_only_animals(self, cp_id: int, query: dict = None,
+                                                         observations_query: dict = None) -> T:
+        """
+        Retrieve media containing only animal observations from a classification project,
+        see :meth:`MediaComponent.get_by_classification_project_only_animals`.
+        """
+        return await self.get_by_predicate(cp_id, ONLY_ANIMALS, query, observations_query)
+
+    async def get_by_predicate(self, cp_id: int, predicates: Union[MediaPredicate, List[MediaPredicate]],
+                               query: dict = None, observations_query: dict = None) -> T:
+        """
+        Retrieve the media of a classification project whose observations satisfy one or more predicates,
+        in the order of the listing. See :meth:`MediaComponent.get_by_predicate`.
+        """
+        matched = [m async for m in self._iter_by_predicate(cp_id, predicates, query, observations_query)]
+        results = [media for _, media in sorted(matched, key=lambda m: m[0])]
+        pagination = Schemas.Pagination(page=1, page_size=len(results), pages=1, count=len(results))
+        return Schemas.TrapperMediaList(pagination=pagination, results=results)
+
+    async def iter_by_predicate(self, cp_id: int, predicates: Union[MediaPredicate, List[MediaPredicate]],
+                                query: dict = None, observations_query: dict = None) -> AsyncIterator[TrapperMedia]:
+        """
+        Stream the media of a classification project whose observations satisfy one or more predicates.
+
+        Counterpart of :meth:`MediaComponent.iter_by_predicate`: the results export is folded
+        by an asyncio task (:meth:`MediaFlags.afold`) while the media pages are streamed.
+
+        Examples
+        --------
+        async for media in client.media.iter_by_predicate(33, ANY_HUMAN):
+            print(media.mediaID)
+        """
+        async for _, media in self._iter_by_predicate(cp_id, predicates, query, observations_query):
+            yield media
+
+    async def _iter_by_predicate(self, cp_id: int, predicates: Union[MediaPredicate, List[MediaPredicate]],
+                                 query: dict = None,
+                                 observations_query: dict = None) -> AsyncIterator[Tuple[int, TrapperMedia]]:
+        # Devuelve (posición en el listado, media) para poder restaurar el orden
+        if isinstance(predicates, MediaPredicate):
+            predicates = [predicates]
+        flags = MediaFlags(predicates)
+        rows = AsyncObservationsResultsComponent(self._client).iter_by_classification_project(cp_id, observations_query)
+
+        pending = []
+        folding = asyncio.create_task(flags.afold(rows))
+        try:
+            position = 0
+            async for media in self.where(**{**(query or {}), "cp": cp_id}):
+                if folding.done():
+                    # Propaga enseguida el error de las observaciones
+                    folding.result()
+                decided = flags.decided(media.mediaID)
+                if decided is None:
+                    pending.append((position, media))
+                elif decided:
+                    yield position, media
+                position += 1
+            await folding
+        finally:
+            flags.cancel()
+            folding.cancel()
+
+        logger.debug("Media of project %s undecided until the end of the observations: %d", cp_id, len(pending))
+        for position, media in pending:
+            if flags.matches(media.mediaID):
+                yield position, media
+
+    async def download(self, cp_id: int, m_id: Union[int, TrapperMedia], destination_folder: Path,
+                       filename_overwrite: str = None, resume: bool = False,
+                       manifest: DownloadManifest = None, sink: ZipSink = None) -> Path:
+        """
+        Download a single media file.
+
+        Parameters
+        ----------
+        cp_id : int
+            The ID of the classification project.
+        m_id : int or TrapperMedia
+            The media ID to download or a TrapperMedia object.
+        destination_folder : Path
+            Folder to save the downloaded media.
+        filename_overwrite : str, optional
+            If provided, the downloaded file will be saved with this name.
+        resume : bool, optional
+            Skip the media if ``manifest`` records it as completed and continue a partially
+            written file with an HTTP Range request. Default is False.
+        manifest : DownloadManifest, optional
+            Manifest where the completed download is recorded.
+        sink : ZipSink, optional
+            Stream the file into this archive instead of the disk; ``destination_folder`` is then
+            the folder inside the archive.
+
+        Returns
+        -------
+        Path
+            Path to the downloaded media file.
+        """
+        done = self._component._completed(m_id, resume, manifest)
+        if done is not None:
+            return done
+
+        if not isinstance(m_id, int):
+            media = self._component._given_media(cp_id, m_id)
+        else:
+            res = await self.get_by_media_id(cp_id, m_id)
+            if not res.results:
+                raise Exception(self._component._not_found(cp_id, m_id))
+            media = res.results[0]
+
+        return await self._download_media(media, destination_folder, filename_overwrite, resume, manifest, sink)
+
+    async def _download_media(self, media: TrapperMedia, destination_folder: Path,
+                              filename_overwrite: str = None, resume: bool = False,
+                              manifest: DownloadManifest = None, sink: ZipSink = None) -> Path:
+        package_url, filename = self._component._media_source(media, filename_overwrite)
+
+        if sink is not None:
+            return await self._stream_media(package_url, sink, (Path(destination_folder) / filename).as_posix())
+
+        part = PartFile(Path(destination_folder) / filename, resume, manifest)
+        await self._client.throttle(package_url, MEDIA)
+        headers = {"Range": f"bytes={part.offset}-"} if part.offset else None
+        async with self._client.async_session.stream("GET", package_url, timeout=60, headers=headers) as resp:
+            # El fichero parcial no encaja con el del servidor: se descarga de nuevo
+            restart = bool(part.offset) and resp.status_code == 416
+            if not restart:
+                resp.raise_for_status()
+                with part.open(part.offset if resp.status_code == 206 else 0):
+                    async for chunk in resp.aiter_bytes(8192):
+                        part.write(chunk)
+        if restart:
+            return await self._download_media(media, destination_folder, filename_overwrite, False, manifest)
+
+        return part.commit(media.mediaID, self._component.fingerprint(media))
+
+    async def _stream_media(self, url: str, sink: ZipSink, arcname: str) -> Path:
+        # Se acumula en un spool y se escribe en el ZIP en un hilo, sin bloquear el bucle de eventos
+        spool = sink.spool()
+        try:
+            await self._client.throttle(url, MEDIA)
+            async with self._client.async_session.stream("GET", url, timeout=60) as resp:
+                resp.raise_for_status()
+                async for chunk in resp.aiter_bytes(8192):
+                    spool.write(chunk)
+        except BaseException:
+            spool.close()
+            raise
+        volume = await asyncio.to_thread(sink.write_spooled, arcname, spool)
+        return volume / arcname
+
+    async def download_many(
+        self,
+        cp_id: int,
+        medias: List[Union[int, TrapperMedia]],
+        destination_folder: Path,
+        compress: bool = False,
+        max_workers=2,
+        callback: callable = None,
+        resume: bool = False,
+        max_volume_size: int = None,
+    ) -> (Path, Report):
+        """
+        Download multiple media files concurrently.
+
+        Same contract as :meth:`MediaComponent.download_many`, with at most
+        ``max_workers`` downloads in flight at the same time.
+        """
+        items, missing = await self.resolve(cp_id, medias)
+        plan = self._component._download_plan(cp_id, medias, missing, destination_folder, compress, resume,
+                                              max_volume_size)
+        report = plan.report
+        semaphore = asyncio.Semaphore(max_workers)
+
+        def _notify(event: str, sid: int, name, total=None, step=None):
+            if callback:
+                callback(event, sid, name, total, step)
+
+        async def _worker(item):
+            media_id = item.mediaID
+            async with semaphore:
+                _notify("start", media_id, "Downloading file", total=None, step=0)
+                try:
+                    path = await self.download(None, item, plan.target, resume=resume, manifest=plan.manifest,
+                                               sink=plan.sink)
+                except Exception as e:
+                    _notify("fail", media_id, "Downloading file", total=None, step=1)
+                    report.add_error(str(media_id), "download", str(e))
+                else:
+                    report.add_success(str(media_id), "download", str(path))
+                    _notify("end", media_id, "Downloading file", total=None, step=1)
+
+        _notify("start", cp_id, "Downloading medias", total=len(medias), step=0)
+        await asyncio.gather(*(_worker(item) for item in items))
+
+        out_put_dir = await asyncio.to_thread(self._component._finish_download, plan)
+        report.finish()
+        _notify("end", cp_id, "Downloading medias", total=len(medias), step=0)
+
+        return out_put_dir, report
+
+    async def download_by_classification_project(self, cp_id: int, query: dict = None, destination_folder: Path = None,
+                                                 compress: bool = False, workers=2,
+                                                 callback: callable = None, resume: bool = False) -> (Path, Report):
+        """
+        Download all media from a specific classification project.
+
+        Same output as :meth:`MediaComponent.download_by_classification_project`.
+
+        Parameters
+        ----------
+        cp_id : int
+            The ID of the classification project.
+        query : dict, optional
+            Optional search/pagination parameters.
+        destination_folder : Path
+            Folder to store downloaded media temporarily.
+        compress : bool, optional
+            If True, media will be zipped into a single file. Default is False.
+        workers : int, optional
+            Number of concurrent downloads. Default is 2.
+        callback : callable, optional
+            Optional callback function for progress updates.
+        resume : bool, optional
+            Resume a previous download into the same folder (see :meth:`download_many`). Default is False.
+
+        Returns
+        -------
+        Path
+            Path to the folder with downloaded media or the ZIP file.
+        Report
+            Report object with details of the download process.
+        """
+        out_put_dir = self._component._output_subfolder(destination_folder, f"trapper_download_media_{cp_id}", resume)
+        results = await self.get_by_classification_project(cp_id, query)
+        return await self.download_many(None, results.results, out_put_dir, compress, workers, callback, resume)
+
+    async def download_by_collection(self, cp_id: int, c_id: int, query: dict = None, destination_folder: Path = None,
+                                     compress: bool = False, workers=2, callback: callable = None,
+                                     resume: bool = False) -> (Path, Report):
+        """
+        Download all media from a specific classification project and collection.
+
+        Same output as :meth:`MediaComponent.download_by_collection`.
+
+        Parameters
+        ----------
+        cp_id : int
+            The ID of the classification project.
+        c_id : int
+            The ID of the collection.
+        query : dict, optional
+            Optional search/pagination parameters.
+        destination_folder : Path
+            Folder to store downloaded media temporarily.
+        compress : bool, optional
+            If True, media will be zipped into a single file. Default is False.
+        workers : int, optional
+            Number of concurrent downloads. Default is 2.
+        callback : callable, optional
+            Optional callback function for progress updates.
+        resume : bool, optional
+            Resume a previous download into the same folder (see :meth:`download_many`). Default is False.
+
+        Returns
+        -------
+        Path
+            Path to the folder with downloaded media or the ZIP file.
+        Report
+            Report object with details of the download process.
+        """
+        out_put_dir = self._component._output_subfolder(
+            destination_folder, f"trapper_download_media_{cp_id}_{c_id}", resume
+        )
+        results = await self.get_by_collection(cp_id, c_id, query)
+        return await self.download_many(None, results.results, out_put_dir, compress, workers, callback, resume)
+
+    async def sync(self, cp_id: int, destination_folder: Path, query: dict = None, prune: bool = False,
+                   workers: int = 2, callback: callable = None, verify: bool = False) -> (Path, Report):
+        """
+        Synchronize a local mirror with the media of a classification project.
+
+        Same contract as :meth:`MediaComponent.sync`, with at most ``workers`` downloads
+        in flight at the same time.
+        """
+        component = self._component
+        destination_folder = Path(destination_folder)
+        destination_folder.mkdir(parents=True, exist_ok=True)
+        manifest = DownloadManifest(destination_folder)
+        remote = (await self.get_all_by_classification_project(cp_id, query)).results
+        pending, unchanged, stale = component._sync_plan(manifest, remote, verify)
+        report: Report = Report(title=f"Synchronizing {len(remote)} media(s)")
+        semaphore = asyncio.Semaphore(workers)
+
+        def _notify(event: str, sid: int, name, total=None, step=None):
+            if callback:
+                callback(event, sid, name, total, step)
+
+        async def _worker(media):
+            previous = manifest.get(media.mediaID)
+            resume = previous is None or previous.fingerprint == component.fingerprint(media)
+            async with semaphore:
+                try:
+                    path = await self._download_media(media, destination_folder / str(media.deploymentID),
+                                                      resume=resume, manifest=manifest)
+                    component._remove_replaced(destination_folder, previous, media)
+                except Exception as e:
+                    _notify("fail", media.mediaID, "Downloading file", total=None, step=1)
+                    report.add_error(str(media.mediaID), "download", str(e))
+                else:
+                    report.add_success(str(media.mediaID), "download", str(path))
+                    _notify("end", media.mediaID, "Downloading file", total=None, step=1)
+
+        for media in unchanged:
+            report.add_success(str(media.mediaID), "skip")
+
+        _notify("start", cp_id, "Synchronizing medias", total=len(pending), step=0)
+        await asyncio.gather(*(_worker(media) for media in pending))
+
+        if prune:
+            await asyncio.to_thread(component._prune, destination_folder, manifest, stale, report)
+        report.finish()
+        _notify("end", cp_id, "Synchronizing medias", total=len(pending), step=0)
+
+        return destination_folder, report
+
+
+    async def download_concurrent(self, cp_id: int, medias: List[Union[int, TrapperMedia]], destination_folder: Path,
+                                  max_concurrency: int = 256, per_host: int = 64, callback: callable = None,
+                                  downloader: AsyncDownloader = None) -> (Path, Report):
+        """
+        Download many media files with the asyncio engine (:class:`AsyncDownloader`).
+
+        Same contract as :meth:`MediaComponent.download_concurrent`.
+        """
+        component = self._component
+        out_put_dir = component._create_random_subfolder(Path(destination_folder),
+                                                         prefix=f"trapper_download_media_{cp_id}")
+        index = await self.media_index(cp_id) if component._has_ids(medias) else {}
+        jobs, report = component._download_jobs(medias, index, out_put_dir)
+        downloader = downloader or component._downloader(max_concurrency, per_host)
+
+        await downloader.run(jobs, callback, report)
+        return out_put_dir, report
+
+
+@attr.s
+class AsyncClassificationResultsComponent(AsyncTrapperAPIComponent):
+    """
+    Asynchronous mirror of :class:`ClassificationResultsComponent` (human and AI results).
+    """
+
+    async def get_by_collection(self, cp_id: int, c_id: int, query: dict = None) -> T:
+        collection_inter_id = await _collection_internal_ids(self._client, cp_id, c_id)
+
+        if len(collection_inter_id) == 0:
+            return _empty(Schemas.TrapperClassificationResultsList)
+
+        q = {**self._default_query, **(query or {})}
+        q["collection"] = ",".join(map(str, collection_inter_id))
+        return await self.get_all(query=q, endpoint=self._endpoint.format(cp=cp_id))
+
+    def iter_by_classification_project(self, cp_id: int, query: Dict[str, Any] = None) -> AsyncIterator[Dict[str, str]]:
+        """
+        Stream the raw CSV rows of the results of a classification project, see
+        :meth:`ClassificationResultsComponent.iter_by_classification_project`.
+        """
+        return self.iter_export({**self._default_query, **(query or {})}, endpoint=self._endpoint.format(cp=cp_id))
+
+
+@attr.s
+class AsyncObservationsResultsComponent(AsyncClassificationResultsComponent):
+    _component_class = attr.ib(repr=False, default=ObservationsResultsComponent)
+
+
+@attr.s
+class AsyncAIObservationsResultsComponent(AsyncClassificationResultsComponent):
+    _component_class = attr.ib(repr=False, default=AIObservationsResultsComponent)
+
+
+@attr.s
+class AsyncClassificationsComponent(AsyncTrapperAPIComponent):
+    """
+    Asynchronous mirror of :class:`ClassificationsComponent` (human and AI classifications).
+    """
+
+    async def sync(self, cp_id: int, store: SyncStore = None, query: dict = None,
+                   since_param: str = None) -> SyncResult:
+        """
+        Pull the classifications of a classification project changed since the last sync into a local store.
+
+        See :meth:`ClassificationsComponent.sync` and :func:`trapper_client.SyncState.async_sync_records`.
+        """
+        store = store or self._client.shared("sync_store", SyncStore)
+        return await async_sync_records(self._client, self._endpoint, store, cp_id,
+                                        {**(query or {}), "project": cp_id}, since_param=since_param)
+
+
+@attr.s
+class AsyncObservationsComponent(AsyncClassificationsComponent):
+    _component_class = attr.ib(repr=False, default=ObservationsComponent)
+    results: AsyncObservationsResultsComponent = attr.ib(init=False, repr=False)
+
+    def __attrs_post_init__(self):
+        super().__attrs_post_init__()
+        self.results = AsyncObservationsResultsComponent(self._client)
+
+    async def get_by_collection(self, cp_id: int, c_id: int, query: dict = None) -> T:
+        collection_inter_id = await _collection_internal_ids(self._client, cp_id, c_id)
+
+        if len(collection_inter_id) == 0:
+            return _empty(Schemas.TrapperClassificationList)
+
+        q = query.copy() if query else {}
+        q["collection"] = collection_inter_id[0]
+        q["project"] = cp_id
+        return await self.get(q)
+
+    async def get_all_by_collection(self, cp_id: int, c_id: int, query: dict = None) -> T:
+        collection_inter_id = await _collection_internal_ids(self._client, cp_id, c_id)
+
+        if len(collection_inter_id) == 0:
+            return _empty(Schemas.TrapperClassificationList)
+
+        q = query.copy() if query else {}
+        q["collection"] = collection_inter_id[0]
+        q["project"] = cp_id
+        return await self.get_all(q, None, f"/media_classification/api/classifications/results/{cp_id}/")
+
+
+@attr.s
+class AsyncAIObservationsComponent(AsyncClassificationsComponent):
+    _component_class = attr.ib(repr=False, default=AIObservationsComponent)
+    results: AsyncAIObservationsResultsComponent = attr.ib(init=False, repr=False)
+
+    def __attrs_post_init__(self):
+        super().__attrs_post_init__()
+        self.results = AsyncAIObservationsResultsComponent(self._client)
+
+    async def get_by_collection(self, cp_id: int, c_id: int, query: dict = None) -> T:
+        collection_inter_id = await _collection_internal_ids(self._client, cp_id, c_id)
+
+        if len(collection_inter_id) == 0:
+            return _empty(Schemas.TrapperClassificationList)
+
+        q = query.copy() if query else {}
+        q["collection"] = ",".join(map(str, collection_inter_id))
+        q["project"] = cp_id
+        return await self.get_all(query=q, endpoint=self._endpoint)
+
+
+@attr.s
+class AsyncUserObservationsComponent(AsyncTrapperAPIComponent):
+    _component_class = attr.ib(repr=False, default=UserObservationsComponent)
+
+    async def get_by_collection(self, cp_id: int, c_id: int, query: dict = None) -> T:
+        collection_inter_id = await _collection_internal_ids(self._client, cp_id, c_id)
+
+        if len(collection_inter_id) == 0:
+            return _empty(Schemas.TrapperClassificationList)
+
+        q = query.copy() if query else {}
+        q["collection"] = ",".join(map(str, collection_inter_id))
+        q["project"] = cp_id
+        return await self.get_all(query=q, endpoint=self._endpoint)
+
+
+@attr.s
+class AsyncPackagesComponent(AsyncTrapperAPIComponent):
+    _component_class = attr.ib(repr=False, default=PackagesComponent)
+
+    async def generate(self, cp: int, params: Dict[str, Any] = None) -> Dict[str, Any]:
+        """
+        Genera un paquete para el proyecto de clasificación especificado.
+        """
+        params = params or {}
+        valid_params = {k: v for k, v in params.items() if k in self._component.package_generation_params}
+
+        response = await self._client.make_request(endpoint=self._endpoint.format(cp=cp), method="GET",
+                                                   query=valid_params, raise_on_error=True, only_json=True)
+        data = response.json()
+
+        return {"errors": data['results'][0]['data']['errors'], "package": data['results'][0]['data']['package']}
+
+    async def download(self, package_url: str, destination_folder: str) -> str:
+        """
+        Descarga el paquete desde la URL proporcionada y lo guarda en la carpeta de destino.
+        """
+        await self._client.throttle(package_url, MEDIA)
+        async with self._client.async_session.stream("GET", package_url, timeout=60) as resp:
+            resp.raise_for_status()
+
+            filename = None
+            cd = resp.headers.get("content-disposition")
+            if cd and "=" in cd:
+                filename = cd.split("=", maxsplit=1)[1].strip('" ')
+            if not filename:
+                filename = package_url.rstrip("/").split("/")[-1] or "downloaded_package"
+
+            os.makedirs(destination_folder, exist_ok=True)
+            destination_path = os.path.join(destination_folder, filename)
+
+            with open(destination_path, "wb") as f:
+                async for chunk in resp.aiter_bytes(8192):
+                    f.write(chunk)
+
+        return destination_path
@@ -1,13 +1,112 @@
-from typing import Dict, Any, Callable, TypeVar
+import threading
+from typing import Dict, Any, Callable, TypeVar, List, Iterable
 
 from trapper_client import Schemas
 from trapper_client.TrapperAPIComponent import TrapperAPIComponent, T
 import attr
+import logging
+
+logger = logging.getLogger(__name__)
 
 #
 # Collection
 #
 
+
+@attr.s
+class CollectionIndex:
+    """
+    Memoized mapping from collection IDs to the internal IDs of the collections inside a
+    classification project (the ``pk`` of ``/media_classification/api/project/{cp}/collections``).
+
+    The collections of a project are downloaded once, on the first lookup, and shared by every
+    component and thread using the client (see :meth:`CollectionIndex.of`). Call
+    :meth:`invalidate` after collections are added to or removed from a project.
+
+    Examples
+    --------
+    index = trapper_client.collections.index
+    ids = index.internal_ids(cp_id=33, c_id=12)
+    index.invalidate(33)
+
+    :param client: API client used to download the collections
+    :type client: APIClientBase
+    """
+    _client: Any = attr.ib(repr=False)
+
+    _projects: Dict[str, Dict[str, List[int]]] = attr.ib(init=False, factory=dict)
+    _lock: threading.Lock = attr.ib(init=False, repr=False, eq=False, factory=threading.Lock)
+
+    @classmethod
+    def of(cls, client) -> "CollectionIndex":
+        """
+        Return the index shared by every component of ``client``.
+        """
+        return client.shared("collection_index", lambda: cls(client))
+
+    @staticmethod
+    def endpoint(cp_id: int) -> str:
+        return f"/media_classification/api/project/{cp_id}/collections"
+
+    def loaded(self, cp_id: int) -> bool:
+        """
+        Tell whether the collections of a classification project are already indexed.
+        """
+        return str(cp_id) in self._projects
+
+    def update(self, cp_id: int, rows: Iterable[Any]) -> None:
+        """
+        Index the collections of a classification project, replacing the previous ones.
+
+        :param cp_id: ID of the classification project
+        :type cp_id: int
+        :param rows: Collections of the project, raw rows or schema items with ``pk`` and ``collection_pk``
+        :type rows: Iterable
+        """
+        mapping = {}
+        for row in rows:
+            pk, collection_pk = (row.get("pk"), row.get("collection_pk")) if isinstance(row, dict) \
+                else (row.pk, getattr(row, "collection_pk", None))
+            if collection_pk is not None:
+                mapping.setdefault(str(collection_pk), []).append(int(pk))
+        self._projects[str(cp_id)] = mapping
+        logger.debug("Indexed %d collections of classification project %s", len(mapping), cp_id)
+
+    def lookup(self, cp_id: int, c_id: int) -> List[int]:
+        """
+        Return the indexed internal IDs of collection ``c_id`` (empty if not indexed).
+        """
+        return list(self._projects.get(str(cp_id), {}).get(str(c_id), []))
+
+    def internal_ids(self, cp_id: int, c_id: int) -> List[int]:
+        """
+        Return the internal IDs of collection ``c_id`` in classification project ``cp_id``,
+        downloading the collections of the project on first use.
+
+        :param cp_id: ID of the classification project
+        :type cp_id: int
+        :param c_id: ID of the collection
+        :type c_id: int
+        :return: Internal IDs (empty if the collection does not belong to the project)
+        :rtype: list[int]
+        """
+        if not self.loaded(cp_id):
+            with self._lock:
+                if not self.loaded(cp_id):
+                    res = self._client.get_all_pages(self.endpoint(cp_id))
+                    self.update(cp_id, res.get("results", []))
+        return self.lookup(cp_id, c_id)
+
+    def invalidate(self, cp_id: int = None) -> None:
+        """
+        Forget the collections of a classification project, or of every project if ``cp_id`` is None.
+        """
+        if cp_id is None:
+            self._projects.clear()
+        else:
+            self._projects.pop(str(cp_id), None)
+
+
 @attr.s
 class CollectionsComponent(TrapperAPIComponent):
     """
@@ -87,6 +186,13 @@ T
             setattr(cls, f"get_by_{field}", make_getter(field, all_results=False))
             setattr(cls, f"get_all_by_{field}", make_getter(field, all_results=True))
 
+    @property
+    def index(self) -> CollectionIndex:
+        """
+        Collection ID resolver shared by every component of the client.
+        """
+        return CollectionIndex.of(self._client)
+
     def get_by_id(self, pk: int, query: dict = None) -> T:
         """
         Retrieve collection by ID.
@@ -135,6 +241,9 @@ T
         Schemas.TrapperCollectionList
             Collections associated with the specified classification project.
         """
-        endpoint = f"/media_classification/api/project/{project_id}/collections"
+        endpoint = CollectionIndex.endpoint(project_id)
         res = self._client.get_all_pages(endpoint, query)
+        if not query:
+            # La lista completa sirve también para refrescar el índice compartido
+            self.index.update(project_id, res.get("results", []))
         return self._schema(**res)
@@ -1,5 +1,5 @@
 import csv
-from typing import TypeVar
+from typing import TypeVar, Iterator, Dict
 
 from trapper_client import Schemas
 from trapper_client.TrapperAPIComponent import TrapperAPIComponent, T
@@ -15,6 +15,8 @@ class DeploymentsComponent(TrapperAPIComponent):
     the mapping of API responses to Pydantic models.
     """
 
+    export_endpoint = "/geomap/api/deployments/export/"
+
     explicit_fields = [
         "deployment_code",
         "deployment_id",
@@ -159,5 +161,5 @@ T
             filter_fn=lambda dep: dep.locationID == location_id
         )
 
-    def export(self, query: dict = None) -> None | csv.DictReader :
-        return super().export(query=query,endpoint="/geomap/api/deployments/export/")
+    def export(self, query: dict = None, stream: bool = False) -> None | csv.DictReader | Iterator[Dict[str, str]]:
+        return super().export(query=query, endpoint=self.export_endpoint, stream=stream)
@@ -1,7 +1,7 @@
 import csv
 import io
 import zipfile
-from typing import List, Any
+from typing import List, Any, Iterator, Dict
 from trapper_client import Schemas
 from trapper_client.TrapperAPIComponent import TrapperAPIComponent, T
 import attr
@@ -27,6 +27,8 @@ class LocationsComponent(TrapperAPIComponent):
         - locations_map
     """
 
+    export_endpoint = "/geomap/api/locations/export/"
+
     explicit_fields = [
         "name",
         "location_id",
@@ -140,5 +142,5 @@ T
         """
         return self.get_filtered(location_id=acro, query=query)
 
-    def export(self, query: dict = None) -> None | csv.DictReader :
-        return super().export(query=query,endpoint="/geomap/api/locations/export/")
+    def export(self, query: dict = None, stream: bool = False) -> None | csv.DictReader | Iterator[Dict[str, str]]:
+        return super().export(query=query, endpoint=self.export_endpoint, stream=stream)
@@ -1,28 +1,74 @@
+import asyncio
 import datetime
-import os
 import shutil
 import tempfile
-from collections import defaultdict
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import Dict, Any, Callable, TypeVar, List, Set, Union
+from typing import Dict, Any, Callable, Iterator, TypeVar, List, Optional, Set, Tuple, Union
 
 import requests
 from pydantic import BaseModel
 
 from trapper_client import Schemas
+from trapper_client.AsyncDownloader import AsyncDownloader, DownloadJob
+from trapper_client.DownloadManifest import DownloadManifest, PartFile, part_path
+from trapper_client.MediaPredicates import MediaFlags, MediaPredicate, ONLY_ANIMALS
+from trapper_client.RateLimiter import MEDIA
 from trapper_client.Reports import Report
 from trapper_client.Schemas import TrapperMedia
 from trapper_client.TrapperAPIComponent import TrapperAPIComponent, T
+from trapper_client.ZipSink import ZipSink
 import attr
 
-from trapper_client.components.CollectionsComponent import CollectionsComponent
-from trapper_client.components.ObservationsComponent import ObservationsComponent
+from trapper_client.components.CollectionsComponent import CollectionIndex
+from trapper_client.components.ObservationsComponent import ObservationsResultsComponent
 from trapper_client.components.ResourcesComponent import ResourcesComponent
 import logging
 
 logger = logging.getLogger(__name__)
 
+_NOT_PUBLIC = "Media no es público, no se puede descargar directamente."
+
+
+@attr.s
+class DownloadPlan:
+    """
+    Output of a bulk media download, shared by :class:`MediaComponent` and its asynchronous mirror.
+
+    With ``resume`` the completed files are checkpointed in a :class:`DownloadManifest` kept in
+    ``folder``; with ``compress`` (and no ``resume``) the media are streamed into a
+    :class:`ZipSink` named after ``folder`` and written under :attr:`target` inside it.
+
+    :param folder: Output folder
+    :type folder: Path
+    :param report: Report of the download
+    :type report: Report
+    :param compress: Produce a ZIP file
+    :type compress: bool
+    :param resume: Checkpoint the completed files
+    :type resume: bool
+    :param max_volume_size: Size of the ZIP volumes, if split
+    :type max_volume_size: int, optional
+    """
+    folder: Path = attr.ib()
+    report: Report = attr.ib()
+    compress: bool = attr.ib(default=False)
+    resume: bool = attr.ib(default=False)
+    max_volume_size: Optional[int] = attr.ib(default=None)
+
+    manifest: Optional[DownloadManifest] = attr.ib(init=False, default=None)
+    target: Path = attr.ib(init=False)
+    sink: Optional[ZipSink] = attr.ib(init=False, default=None)
+
+    def __attrs_post_init__(self):
+        self.target = self.folder
+        if self.resume:
+            self.manifest = DownloadManifest(self.folder)
+        elif self.compress:
+            # Las descargas se escriben directamente en el ZIP; la carpeta solo reserva el nombre
+            self.target, self.sink = Path(self.folder.name), ZipSink(self.folder, self.max_volume_size)
+
+
 @attr.s
 class MediaComponent(TrapperAPIComponent):
     """
@@ -34,10 +80,11 @@ class MediaComponent(TrapperAPIComponent):
     _schema = Schemas.TrapperMediaList
 
     explicit_fields = [
+        "pk",  # int → Identificador del recurso (mediaID)
         "project",
         "owner",
         "deployment",
-#        "collection", --> overridden in self. get_by_collection (resol collection_id through CollectionsComponent)
+#        "collection", --> overridden in self. get_by_collection (resol collection_id through CollectionIndex)
         "locations_map",
         "status",
         "status_ai",
@@ -81,57 +128,22 @@ class MediaComponent(TrapperAPIComponent):
         """
 
         MAX_ZIP_SIZE = 2 * 1024 ** 3  # 2 GB
-        import tempfile, requests, zipfile
         temp_dir = Path(tempfile.mkdtemp(prefix="trapper_client_"))
 
         if zip_filename_base is None:
             zip_filename_base = "trapper_media_export"
 
-        zip_filename_base = os.path.join(temp_dir, zip_filename_base)
-
-        zip_files = []
-        zip_index = 1
-        current_zip_size = 0
-        zip_writer = None
-
-        def start_new_zip():
-            nonlocal zip_index, zip_writer, current_zip_size
-            zip_name = f"{zip_filename_base}_{zip_index:03}.zip"
-            zip_writer = zipfile.ZipFile(zip_name, "w", zipfile.ZIP_DEFLATED)
-            zip_files.append(zip_name)
-            current_zip_size = 0
-            return zip_name
+        with ZipSink(temp_dir / zip_filename_base, max_volume_size=MAX_ZIP_SIZE) as sink:
+            for media in media_list.results:
+                file_name = f"{media.mediaID}:{media.fileName}"
+                mediatype = media.fileMediatype or "image/jpeg"
+                file_ext = ".jpg" if mediatype == "image/jpeg" else ""
+                zip_internal_path = f"{media.deploymentID}/{file_name}{file_ext}"
 
-        # Iniciar el primer zip
-        start_new_zip()
-
-        for media in media_list.results:
-            file_url = media.filePath
-            file_name = f"{media.mediaID}:{media.fileName}"
-            deployment_id = media.deploymentID
-            mediatype = media.fileMediatype or "image/jpeg"
-            file_ext = ".jpg" if mediatype == "image/jpeg" else ""
-            zip_internal_path = os.path.join(deployment_id, file_name + file_ext)
-
-            try:
-                response = requests.get(str(file_url))
-                response.raise_for_status()
-                file_data = response.content
-                file_size = len(file_data)
-
-                if current_zip_size + file_size > MAX_ZIP_SIZE:
-                    zip_writer.close()
-                    zip_index += 1
-                    start_new_zip()
-
-                zip_writer.writestr(zip_internal_path, file_data)
-                current_zip_size += file_size
-
-            except Exception as e:
-                print(f"❌ Error descargando {file_name}: {e}")
-
-        if zip_writer:
-            zip_writer.close()
+                try:
+                    self._stream_media(media.filePath, sink, zip_internal_path)
+                except Exception as e:
+                    print(f"❌ Error descargando {file_name}: {e}")
 
         return temp_dir
 
@@ -176,15 +188,20 @@ class MediaComponent(TrapperAPIComponent):
         Returns
         -------
         Schemas.TrapperMediaList
-            Media items associated with the specified classification project.
+            Media items associated with the specified classification project (all pages).
         """
+        query_copy = query.copy() if query else {}
+        default_query =  {"cp": cp_id}
 
-        return self.get_all_by_classification_project(cp_id, query)
+        return self.get_all(query={**default_query, **query_copy})
 
     def get_by_media_id(self, cp_id: int, m_id: int, query: dict = None) -> T:
         """
         Retrieve media by media ID within a specific classification project.
 
+        The media is requested with the server-side ``pk`` filter (a single request). If the
+        server ignores the filter the whole project is listed instead, and a warning is logged.
+
         Parameters
         ----------
         cp_id : int
@@ -199,12 +216,64 @@ class MediaComponent(TrapperAPIComponent):
         Schemas.TrapperMediaList
             Media items associated with the specified classification project and media ID.
         """
-        res = self.get_by_classification_project(cp_id, query)
+        res = self.get({**(query or {}), "cp": cp_id, "pk": m_id})
+        if any(entry.mediaID != m_id for entry in res.results):
+            logger.warning("The media endpoint ignored the pk filter; listing project %s to find media %s", cp_id, m_id)
+            res = self.get_all_by_classification_project(cp_id, query)
 
         res.results = [entry for entry in res.results if entry.mediaID == m_id]
 
         return  res
 
+    def media_index(self, cp_id: int, query: dict = None) -> Dict[int, TrapperMedia]:
+        """
+        Return the media of a classification project indexed by mediaID, from a single listing.
+
+        Parameters
+        ----------
+        cp_id : int
+            The ID of the classification project.
+        query : dict, optional
+            Optional search parameters.
+
+        Returns
+        -------
+        Dict[int, TrapperMedia]
+            mediaID -> media.
+        """
+        return {media.mediaID: media for media in self.get_all_by_classification_project(cp_id, query).results}
+
+    def resolve(self, cp_id: int, medias: List[Union[int, "TrapperMedia"]]) -> (List[TrapperMedia], List[int]):
+        """
+        Resolve the media IDs of a list with one listing of the project (only if there are IDs).
+
+        Parameters
+        ----------
+        cp_id : int
+            The ID of the classification project.
+        medias : List[Union[int, TrapperMedia]]
+            Media IDs and/or TrapperMedia objects.
+
+        Returns
+        -------
+        List[TrapperMedia]
+            The media found, in the same order.
+        List[int]
+            The media IDs that were not found in the project.
+        """
+        return self._resolve(medias, self.media_index(cp_id) if self._has_ids(medias) else {})
+
+    @staticmethod
+    def _resolve(medias: List[Union[int, "TrapperMedia"]], index: Dict[int, TrapperMedia]):
+        found, missing = [], []
+        for item in medias:
+            media = index.get(item) if isinstance(item, int) else item
+            if media is None:
+                missing.append(item)
+            else:
+                found.append(media)
+        return found, missing
+
     def get_by_collection(self, cp_id: int, c_id:int, query: dict = None) -> T:
         """
         Retrieve media from a specific classification project and collection.
@@ -224,11 +293,7 @@ class MediaComponent(TrapperAPIComponent):
             Media items associated with the specified classification project and collection.
         """
 
-        collections:CollectionsComponent = CollectionsComponent(self._client)
-        results = collections.get_by_classification_project(cp_id)
-        logger.info(results)
-
-        collection_inter_id = [ r.pk for r in results.results if r.collection_pk == c_id ]
+        collection_inter_id = CollectionIndex.of(self._client).internal_ids(cp_id, c_id)
 
         if len(collection_inter_id) == 0:
             # No hay colecciones asociadas al proyecto de clasificacion
@@ -245,54 +310,118 @@ class MediaComponent(TrapperAPIComponent):
 
         return res
 
-    def get_by_classification_project_only_animals(self, cp_id: int, query: dict = None) -> T:
+    def get_by_classification_project_only_animals(self, cp_id: int, query: dict = None,
+                                                   observations_query: dict = None) -> T:
         """
         Retrieve media containing only animal observations from a classification project.
 
+        This is :meth:`get_by_predicate` with :data:`ONLY_ANIMALS`: the observations are read
+        from the results export of the project (not from the observations listing), ``query``
+        filters only the media listing and ``observations_query`` the export. Media without
+        observations are not returned. The media keep the order of the listing.
+
         Parameters
         ----------
         cp_id : int
             The ID of the classification project.
         query : dict, optional
-            Optional search/pagination parameters.
+            Optional search parameters of the media listing.
+        observations_query : dict, optional
+            Optional query parameters of the results export.
 
         Returns
         -------
         Schemas.TrapperMediaList
             Media items containing only animal observations.
         """
+        return self.get_by_predicate(cp_id, ONLY_ANIMALS, query, observations_query)
 
-        # Obtenemos los mediaid de los media que solo tengan animales
-        observations: ObservationsComponent = ObservationsComponent(self._client)
-        o = observations.get_by_classification_project(cp_id, query)
-
-        mediaid_groups = defaultdict(list)
-        for entry in o.results:
-            mediaid_groups[entry.mediaID].append(entry)
-
-        filtered = []
-        for mediaid, entries in mediaid_groups.items():
-            if all(e.observationType == 'animal' for e in entries):
-                filtered.extend(entries)
-
-        # Obtenemos todos los medias del proyecto de clasificacion
-        endpoint = self._endpoint.format(cp=cp_id)
-        res = self._client.get_all_pages(endpoint, query)
-        medias = self._schema(**res)
-
-        # Obtener el conjunto de mediaIDs válidos del paso anterior
-        valid_media_ids = {obs.mediaID for obs in filtered}
+    def get_by_predicate(self, cp_id: int, predicates: Union[MediaPredicate, List[MediaPredicate]],
+                         query: dict = None, observations_query: dict = None) -> T:
+        """
+        Retrieve the media of a classification project whose observations satisfy one or more predicates.
 
-        # Filtrar las entradas multimedia que tienen esos mediaIDs
-        filtered = [entry for entry in medias.results if entry.mediaID in valid_media_ids]
+        See :meth:`iter_by_predicate`; unlike it, the media keep the order of the listing.
 
-        pagination = medias.pagination
-        pagination.count = len(valid_media_ids)
+        Returns
+        -------
+        Schemas.TrapperMediaList
+            Matching media items.
+        """
+        matched = sorted(self._iter_by_predicate(cp_id, predicates, query, observations_query), key=lambda m: m[0])
+        results = [media for _, media in matched]
+        pagination = Schemas.Pagination(page=1, page_size=len(results), pages=1, count=len(results))
+        return Schemas.TrapperMediaList(pagination=pagination, results=results)
+
+    def iter_by_predicate(self, cp_id: int, predicates: Union[MediaPredicate, List[MediaPredicate]],
+                          query: dict = None, observations_query: dict = None,
+                          prefetch: int = 2) -> Iterator[TrapperMedia]:
+        """
+        Stream the media of a classification project whose observations satisfy one or more predicates.
 
-        return Schemas.TrapperMediaList(**{"pagination": pagination, "results": filtered})
+        The results export of the project is streamed in a background thread and folded into a few
+        bits per media (:class:`MediaFlags`) while the media pages are streamed in the foreground.
+        A media is yielded (or dropped) as soon as the observations read so far decide it, e.g. on
+        the first human observation for :data:`ANY_HUMAN`; the undecided ones are yielded once the
+        export is complete, so the order is not the one of the listing.
 
+        Parameters
+        ----------
+        cp_id : int
+            The ID of the classification project.
+        predicates : MediaPredicate or list of MediaPredicate
+            Conditions the media must satisfy (all of them), e.g. :data:`ONLY_ANIMALS`,
+            :data:`ANY_HUMAN`, :data:`BLANK_ONLY` or ``species("Cervus elaphus")``.
+        query : dict, optional
+            Optional search parameters of the media listing.
+        observations_query : dict, optional
+            Optional query parameters of the results export.
+        prefetch : int, optional
+            Media pages loaded ahead in the background. Default is 2.
 
-    def download(self, cp_id: int, m_id:Union[int, "TrapperMedia"], destination_folder: Path, filename_overwrite:str=None) -> Path:
+        Returns
+        -------
+        Iterator[TrapperMedia]
+            Matching media items.
+        """
+        for _, media in self._iter_by_predicate(cp_id, predicates, query, observations_query, prefetch):
+            yield media
+
+    def _iter_by_predicate(self, cp_id: int, predicates: Union[MediaPredicate, List[MediaPredicate]],
+                           query: dict = None, observations_query: dict = None,
+                           prefetch: int = 2) -> Iterator[Tuple[int, TrapperMedia]]:
+        # Devuelve (posición en el listado, media) para poder restaurar el orden
+        if isinstance(predicates, MediaPredicate):
+            predicates = [predicates]
+        flags = MediaFlags(predicates)
+        rows = ObservationsResultsComponent(self._client).iter_by_classification_project(cp_id, observations_query)
+
+        pending = []
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="trapper-observations") as executor:
+            folding = executor.submit(flags.fold, rows)
+            try:
+                with self.where(prefetch=prefetch, **{**(query or {}), "cp": cp_id}) as media_query:
+                    for position, media in enumerate(media_query):
+                        if folding.done():
+                            # Propaga enseguida el error de las observaciones
+                            folding.result()
+                        decided = flags.decided(media.mediaID)
+                        if decided is None:
+                            pending.append((position, media))
+                        elif decided:
+                            yield position, media
+                folding.result()
+            finally:
+                flags.cancel()
+
+        logger.debug("Media of project %s undecided until the end of the observations: %d", cp_id, len(pending))
+        for position, media in pending:
+            if flags.matches(media.mediaID):
+                yield position, media
+
+    def download(self, cp_id: int, m_id:Union[int, "TrapperMedia"], destination_folder: Path,
+                 filename_overwrite:str=None, resume: bool = False, manifest: DownloadManifest = None,
+                 sink: ZipSink = None) -> Path:
         """
         Download a single media file.
         Parameters
@@ -305,25 +434,34 @@ class MediaComponent(TrapperAPIComponent):
             Folder to save the downloaded media.
         filename_overwrite : str, optional
             If provided, the downloaded file will be saved with this name.
+        resume : bool, optional
+            Skip the media if ``manifest`` records it as completed and continue a partially
+            written file with an HTTP Range request. Default is False.
+        manifest : DownloadManifest, optional
+            Manifest where the completed download is recorded.
+        sink : ZipSink, optional
+            Stream the file into this archive instead of the disk; ``destination_folder`` is then
+            the folder inside the archive.
         Returns
         -------
         Path
-            Path to the downloaded media file.
+            Path to the downloaded media file (``<volume>/<entry>`` when written to ``sink``).
         """
+        done = self._completed(m_id, resume, manifest)
+        if done is not None:
+            return done
 
         if not isinstance(m_id, int):
-            media = m_id
-            if cp_id is not None:
-                raise ValueError("Si se pasa un TrapperMedia, no se debe especificar cp_id.")
+            media = self._given_media(cp_id, m_id)
         else:
             media = self.get_by_media_id(cp_id, m_id)
 
             if media.results is None or len(media.results) == 0:
-                raise Exception(f"No se encontró media con mediaID {m_id} en el proyecto de clasificación {cp_id}.")
+                raise Exception(self._not_found(cp_id, m_id))
 
             media = media.results[0]
 
-        return self._download_media(media, destination_folder, filename_overwrite)
+        return self._download_media(media, destination_folder, filename_overwrite, resume, manifest, sink)
 
     def download_one(self, cp_id: int, m_id:Union[int, "TrapperMedia"], destination_folder: Path,
                      filename_overwrite:str=None) -> Path:
@@ -353,11 +491,18 @@ class MediaComponent(TrapperAPIComponent):
         destination_folder: Path,
         compress: bool = False,
         max_workers=2,
-        callback: callable = None
+        callback: callable = None,
+        resume: bool = False,
+        max_volume_size: int = None,
     ) -> (Path, Report):
 
         """
         Download multiple media files concurrently.
+
+        With ``compress`` the files are streamed into the ZIP archive as they are downloaded
+        (see :class:`ZipSink`), without staging them in a folder. With ``resume`` every completed
+        file is recorded (mediaID, path, size and SHA-256) in a :class:`DownloadManifest` kept in
+        the output folder.
         Parameters
         ----------
         cp_id : int
@@ -372,16 +517,26 @@ class MediaComponent(TrapperAPIComponent):
             Number of concurrent download workers. Default is 2.
         callback : callable, optional
             Optional callback function for progress updates.
+        resume : bool, optional
+            Download into a stable folder (instead of a new random one), checkpoint the completed
+            files, skip the ones recorded by a previous run and continue partially written files. With ``compress``
+            the folder is kept next to the ZIP file, so the download can be resumed again.
+            Default is False.
+        max_volume_size : int, optional
+            With ``compress``, split the archive in volumes of about this size in bytes
+            (``<name>_001.zip``, ``<name>_002.zip``...). Default is None (a single file).
         Returns
         -------
         Path
-            Path to the folder with downloaded media or the ZIP file.
+            Path to the folder with downloaded media or the ZIP file (the first volume if split).
         Report
             Report object with details of the download process.
         """
-        report:Report = Report(title=f"Downloading {len(medias)} media(s)")
-
-        out_put_dir =self._create_random_subfolder(destination_folder, prefix=f"trapper_download_media_{cp_id}")
+        self._client.media_session_for(max_workers)
+        # Una sola consulta del proyecto para todos los mediaID, en vez de una por descarga
+        items, missing = self.resolve(cp_id, medias)
+        plan = self._download_plan(cp_id, medias, missing, destination_folder, compress, resume, max_volume_size)
+        report = plan.report
 
         def _notify(event: str, sid: int, name, total=None, step=None):
             if callback:
@@ -393,20 +548,18 @@ class MediaComponent(TrapperAPIComponent):
 
         # Wrapper to notify when thread starts
         def _worker(item):
-            media_id = item if isinstance(item, int) else item.mediaID
-            _notify("start", media_id, "Downloading file", total=None, step=0)
-            return self.download(cp_id, item, out_put_dir)
+            _notify("start", item.mediaID, "Downloading file", total=None, step=0)
+            return self.download(None, item, plan.target, resume=resume, manifest=plan.manifest, sink=plan.sink)
 
         _notify("start", cp_id, "Downloading medias",  total=len(medias), step=0)
 
         with ThreadPoolExecutor(max_workers=max_workers) as executor:
             # Lanzamos cada descarga como una tarea independiente
-            futures = {executor.submit(_worker, item): item for item in medias}
+            futures = {executor.submit(_worker, item): item for item in items}
 
             for future in as_completed(futures):
-                item = futures[future]
+                media_id = futures[future].mediaID
                 try:
-                    media_id = item if isinstance(item, int) else item.mediaID
                     ok = future.result()  # devuelve Path
                     report.add_success(str(media_id),"download", str(ok))
                     _notify("end", media_id, "Downloading file", total=None, step=1)
@@ -415,8 +568,7 @@ class MediaComponent(TrapperAPIComponent):
                     _notify("fail", media_id, "Downloading file", total=None, step=1)
                     report.add_error(str(media_id), "download", str(e))
 
-        if compress:
-            out_put_dir= self._compress_folder(out_put_dir, fmt="zip", remove_folder=True)
+        out_put_dir = self._finish_download(plan)
         report.finish()
 
         _notify("end", cp_id, "Downloading medias", total=len(medias), step=0)
@@ -424,7 +576,8 @@ class MediaComponent(TrapperAPIComponent):
         return out_put_dir, report
 
     def download_by_classification_project(self, cp_id: int, query: dict = None, destination_folder: Path=None,
-                                    compress: bool = False, workers = 2, callback: callable = None) -> (Path, Report):
+                                    compress: bool = False, workers = 2, callback: callable = None,
+                                    resume: bool = False) -> (Path, Report):
         """
         Download all media from a specific classification project.
         Parameters
@@ -441,6 +594,8 @@ class MediaComponent(TrapperAPIComponent):
             Number of concurrent download workers. Default is 2.
         callback : callable, optional
             Optional callback function for progress updates.
+        resume : bool, optional
+            Resume a previous download into the same folder (see :meth:`download_many`). Default is False.
         Returns
         -------
         Path
@@ -449,13 +604,14 @@ class MediaComponent(TrapperAPIComponent):
             Report object with details of the download process.
         """
 
-        out_put_dir =self._create_random_subfolder(destination_folder, prefix=f"trapper_download_media_{cp_id}")
+        out_put_dir = self._output_subfolder(destination_folder, f"trapper_download_media_{cp_id}", resume)
         results = self.get_by_classification_project(cp_id, query)
 
-        return self.download_many(None, results.results, out_put_dir, compress, workers, callback)
+        return self.download_many(None, results.results, out_put_dir, compress, workers, callback, resume)
 
     def download_by_collection(self, cp_id: int, c_id:int, query: dict = None, destination_folder: Path=None,
-                                           compress: bool = False, workers = 2, callback: callable = None) -> (Path, Report):
+                                           compress: bool = False, workers = 2, callback: callable = None,
+                                           resume: bool = False) -> (Path, Report):
         """
         Download all media from a specific classification project and collection.
 
@@ -475,6 +631,8 @@ class MediaComponent(TrapperAPIComponent):
             Number of concurrent download workers. Default is 2.
         callback : callable, optional
             Optional callback function for progress updates.
+        resume : bool, optional
+            Resume a previous download into the same folder (see :meth:`download_many`). Default is False.
 
         Returns
         -------
@@ -485,14 +643,219 @@ class MediaComponent(TrapperAPIComponent):
 
         """
 
-        out_put_dir = self._create_random_subfolder(destination_folder, prefix=f"trapper_download_media_{cp_id}")
+        out_put_dir = self._output_subfolder(destination_folder, f"trapper_download_media_{cp_id}_{c_id}", resume)
         results = self.get_by_collection(cp_id, c_id, query)
 
-        return self.download_many(None, results.results, out_put_dir, compress, workers, callback)
+        return self.download_many(None, results.results, out_put_dir, compress, workers, callback, resume)
+
+    def sync(self, cp_id: int, destination_folder: Path, query: dict = None, prune: bool = False,
+             workers: int = 2, callback: callable = None, verify: bool = False) -> (Path, Report):
+        """
+        Synchronize a local mirror with the media of a classification project.
+
+        The mirror has a stable layout, ``<destination_folder>/<deploymentID>/<fileName>``, and its
+        index is the :class:`DownloadManifest` kept in ``destination_folder``. The remote media list
+        is compared with the index by mediaID: only new media, media whose file name or timestamp
+        changed and files that are missing locally (or whose size no longer matches) are downloaded.
+
+        Parameters
+        ----------
+        cp_id : int
+            The ID of the classification project.
+        destination_folder : Path
+            Root folder of the mirror.
+        query : dict, optional
+            Optional search parameters. With ``prune``, media filtered out are treated as deleted.
+        prune : bool, optional
+            Remove the local files of media that are no longer listed. Default is False.
+        workers : int, optional
+            Number of concurrent download workers. Default is 2.
+        callback : callable, optional
+            Optional callback function for progress updates.
+        verify : bool, optional
+            Also check the SHA-256 of the files that are up to date (reads every file). Default is False.
+
+        Returns
+        -------
+        Path
+            Root folder of the mirror.
+        Report
+            Report with a ``download``, ``skip`` or ``prune`` entry per media.
+        """
+        destination_folder = Path(destination_folder)
+        destination_folder.mkdir(parents=True, exist_ok=True)
+        manifest = DownloadManifest(destination_folder)
+        remote = self.get_all_by_classification_project(cp_id, query).results
+        pending, unchanged, stale = self._sync_plan(manifest, remote, verify)
+        report: Report = Report(title=f"Synchronizing {len(remote)} media(s)")
+        self._client.media_session_for(workers)
+        logger.debug("Sync of project %s: %d to download, %d up to date, %d not listed",
+                     cp_id, len(pending), len(unchanged), len(stale))
+
+        def _notify(event: str, sid: int, name, total=None, step=None):
+            if callback:
+                callback(event, sid, name, total, step)
+
+        for media in unchanged:
+            report.add_success(str(media.mediaID), "skip")
 
-    def _download_media(self, media:TrapperMedia,destination_folder: Path, filename_overwrite:str=None) -> Path:
+        _notify("start", cp_id, "Synchronizing medias", total=len(pending), step=0)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {executor.submit(self._sync_media, media, destination_folder, manifest): media
+                       for media in pending}
+            for future in as_completed(futures):
+                media_id = futures[future].mediaID
+                try:
+                    report.add_success(str(media_id), "download", str(future.result()))
+                    _notify("end", media_id, "Downloading file", total=None, step=1)
+                except Exception as e:
+                    _notify("fail", media_id, "Downloading file", total=None, step=1)
+                    report.add_error(str(media_id), "download", str(e))
+
+        if prune:
+            self._prune(destination_folder, manifest, stale, report)
+        report.finish()
+        _notify("end", cp_id, "Synchronizing medias", total=len(pending), step=0)
+
+        return destination_folder, report
+
+    def download_concurrent(self, cp_id: int, medias: List[Union[int, "TrapperMedia"]], destination_folder: Path,
+                            max_concurrency: int = 256, per_host: int = 64, callback: callable = None,
+                            downloader: AsyncDownloader = None) -> (Path, Report):
+        """
+        Download many media files with the asyncio engine (:class:`AsyncDownloader`).
+
+        Unlike :meth:`download_many`, media IDs are resolved with a single listing of the
+        project instead of one lookup per file, and up to ``max_concurrency`` files are streamed
+        at once; the actual concurrency adapts to the observed throughput and error rate.
+        Requires ``httpx`` (``async`` extra). From a running event loop use
+        :meth:`AsyncMediaComponent.download_concurrent` instead.
+
+        Parameters
+        ----------
+        cp_id : int
+            The ID of the classification project (only needed to resolve media IDs).
+        medias : List[Union[int, TrapperMedia]]
+            List of media IDs or TrapperMedia objects to download.
+        destination_folder : Path
+            Folder where a new download folder is created.
+        max_concurrency : int, optional
+            Maximum number of simultaneous downloads. Default is 256.
+        per_host : int, optional
+            Maximum number of simultaneous downloads from the same host. Default is 64.
+        callback : callable, optional
+            Optional callback function for progress updates.
+        downloader : AsyncDownloader, optional
+            Engine to use instead of a new one built from the client's rate limiter and retry policy.
+
+        Returns
+        -------
+        Path
+            Path to the folder with downloaded media.
+        Report
+            Report object with details of the download process.
+        """
+        out_put_dir = self._create_random_subfolder(Path(destination_folder), prefix=f"trapper_download_media_{cp_id}")
+        index = self.media_index(cp_id) if self._has_ids(medias) else {}
+        jobs, report = self._download_jobs(medias, index, out_put_dir)
+        downloader = downloader or self._downloader(max_concurrency, per_host)
+
+        asyncio.run(downloader.run(jobs, callback, report))
+        return out_put_dir, report
+
+    def _downloader(self, max_concurrency: int, per_host: int) -> AsyncDownloader:
+        return AsyncDownloader(max_concurrency=max_concurrency, per_host=per_host,
+                               rate_limiter=self._client.rate_limiter, retry_policy=self._client.retry_policy)
+
+    @staticmethod
+    def _has_ids(medias: List[Union[int, "TrapperMedia"]]) -> bool:
+        return any(isinstance(item, int) for item in medias)
+
+    @staticmethod
+    def _download_jobs(medias: List[Union[int, "TrapperMedia"]], index: Dict[int, TrapperMedia],
+                       destination_folder: Path) -> (List[DownloadJob], Report):
+        """
+        Build the download jobs of ``medias``, resolving media IDs with ``index``. Media that
+        cannot be downloaded are reported as errors.
+        """
+        report: Report = Report(title=f"Downloading {len(medias)} media(s)")
+        found, missing = MediaComponent._resolve(medias, index)
+        for m_id in missing:
+            report.add_error(str(m_id), "download", f"No se encontró media con mediaID {m_id}.")
+        jobs = []
+        for media in found:
+            if media.filePublic is not True:
+                report.add_error(str(media.mediaID), "download", _NOT_PUBLIC)
+            else:
+                jobs.append(DownloadJob(media.mediaID, media.filePath, Path(destination_folder) / media.fileName))
+        return jobs, report
+
+    @staticmethod
+    def fingerprint(media: TrapperMedia) -> str:
+        """
+        Return the remote version of a media: a change of file name or timestamp means a new file.
+        """
+        return f"{media.fileName}|{media.timestamp.isoformat()}"
+
+    @staticmethod
+    def mirror_path(media: TrapperMedia) -> str:
+        """
+        Return the path of a media inside a mirror, relative to its root.
+        """
+        return f"{media.deploymentID}/{media.fileName}"
+
+    def _sync_plan(self, manifest: DownloadManifest, remote: List[TrapperMedia], verify: bool = False):
+        """
+        Split the remote media into (to download, up to date) and return the manifest entries
+        that are not listed anymore.
+        """
+        pending, unchanged = [], []
+        for media in remote:
+            entry = manifest.get(media.mediaID)
+            if (entry is not None and entry.fingerprint == self.fingerprint(media)
+                    and entry.path == self.mirror_path(media)
+                    and manifest.completed(media.mediaID, verify=verify) is not None):
+                unchanged.append(media)
+            else:
+                pending.append(media)
+        listed = {str(media.mediaID) for media in remote}
+        stale = [entry for entry in manifest if entry.mediaID not in listed]
+        return pending, unchanged, stale
+
+    def _sync_media(self, media: TrapperMedia, destination_folder: Path, manifest: DownloadManifest) -> Path:
+        previous = manifest.get(media.mediaID)
+        # Solo se continúa un .part si es la misma versión del fichero
+        resume = previous is None or previous.fingerprint == self.fingerprint(media)
+        path = self._download_media(media, destination_folder / str(media.deploymentID), resume=resume,
+                                    manifest=manifest)
+        self._remove_replaced(destination_folder, previous, media)
+        return path
+
+    def _remove_replaced(self, destination_folder: Path, previous, media: TrapperMedia) -> None:
+        # Si cambió el nombre del fichero se borra la versión anterior
+        if previous is not None and previous.path != self.mirror_path(media):
+            (destination_folder / previous.path).unlink(missing_ok=True)
+
+    def _prune(self, destination_folder: Path, manifest: DownloadManifest, stale: list, report: Report) -> None:
+        pruned = []
+        for entry in stale:
+            try:
+                (destination_folder / entry.path).unlink(missing_ok=True)
+                part_path(destination_folder / entry.path).unlink(missing_ok=True)
+            except OSError as e:
+                report.add_error(entry.mediaID, "prune", str(e))
+            else:
+                report.add_success(entry.mediaID, "prune", entry.path)
+                pruned.append(entry.mediaID)
+        manifest.discard(pruned)
+
+    def _download_media(self, media:TrapperMedia,destination_folder: Path, filename_overwrite:str=None,
+                        resume: bool = False, manifest: DownloadManifest = None, sink: ZipSink = None) -> Path:
         """
         Download a single media file.
+
+        The content is written to ``<filename>.part`` and renamed when complete, so an interrupted
+        download never leaves a truncated file under the final name.
         Parameters
         ----------
         media : TrapperMedia
@@ -501,39 +864,128 @@ class MediaComponent(TrapperAPIComponent):
             Folder to save the downloaded media.
         filename_overwrite : str, optional
             If provided, the downloaded file will be saved with this name.
+        resume : bool, optional
+            Continue an existing ``.part`` file with an HTTP Range request. Default is False.
+        manifest : DownloadManifest, optional
+            Manifest where the completed download (size and SHA-256) is recorded.
+        sink : ZipSink, optional
+            Stream the file into this archive, under ``destination_folder/filename``.
         Returns
         -------
         Path
             Path to the downloaded media file.
         """
-        logger.debug(
-            f"MediaID: {media.mediaID}, FileName: {media.fileName}, DeploymentID: {media.deploymentID}, FilePath: {media.filePath}"
-        )
+        logger.debug("MediaID: %s, FileName: %s, DeploymentID: %s, FilePath: %s",
+                     media.mediaID, media.fileName, media.deploymentID, media.filePath)
 
+        package_url, filename = self._media_source(media, filename_overwrite)
 
-        if media.filePublic is True:
-            package_url = media.filePath
-        else:
-            raise Exception("Media no es público, no se puede descargar directamente.")
+        if sink is not None:
+            return self._stream_media(package_url, sink, (Path(destination_folder) / filename).as_posix())
+
+        part = PartFile(Path(destination_folder) / filename, resume, manifest)
+        resp, offset = self._get_media(package_url, part.offset)
+
+        # Guardar el contenido por chunks
+        with resp, part.open(offset):
+            for chunk in resp.iter_content(chunk_size=8192):
+                part.write(chunk)
+
+        return part.commit(media.mediaID, self.fingerprint(media))
+
+    def _stream_media(self, url: str, sink: ZipSink, arcname: str) -> Path:
+        """
+        Stream a media file into an archive entry and return ``<volume>/<arcname>``.
+        """
+        resp, _ = self._get_media(str(url))
+        with resp:
+            volume = sink.write(arcname, resp.iter_content(chunk_size=8192))
+        return volume / arcname
 
-        resp = requests.get(package_url, stream=True, timeout=60)
+    def _get_media(self, url: str, offset: int = 0) -> (requests.Response, int):
+        """
+        Start streaming a media file, from byte ``offset`` if the server supports ranges.
+
+        Returns the response and the offset it actually starts at: 0 when the server ignored
+        the Range header and sent the whole file.
+        """
+        self._client.rate_limiter.acquire(url, MEDIA)
+        headers = {"Range": f"bytes={offset}-"} if offset else None
+        resp = self._client.media_session.get(url, stream=True, timeout=60, headers=headers)
+        if offset and resp.status_code == 416:
+            # El fichero parcial no encaja con el del servidor: se descarga de nuevo
+            resp.close()
+            return self._get_media(url)
         resp.raise_for_status()
-        filename = media.fileName
+        return resp, offset if resp.status_code == 206 else 0
 
-        if filename_overwrite:
-            filename = filename_overwrite
+    @staticmethod
+    def _not_found(cp_id: int, m_id: int) -> str:
+        return f"No se encontró media con mediaID {m_id} en el proyecto de clasificación {cp_id}."
 
-        # Asegurar que la carpeta destino existe
-        os.makedirs(destination_folder, exist_ok=True)
-        destination_path = os.path.join(destination_folder, filename)
+    @staticmethod
+    def _completed(m_id: Union[int, TrapperMedia], resume: bool, manifest: DownloadManifest = None) -> Optional[Path]:
+        """
+        Devuelve el fichero de una media ya descargada según el manifiesto, si se reanuda.
+        """
+        if not resume or manifest is None:
+            return None
+        media_id = m_id if isinstance(m_id, int) else m_id.mediaID
+        done = manifest.completed(media_id)
+        if done is not None:
+            logger.debug("Media %s already downloaded: %s", media_id, done)
+        return done
+
+    @staticmethod
+    def _given_media(cp_id: Optional[int], media: TrapperMedia) -> TrapperMedia:
+        if cp_id is not None:
+            raise ValueError("Si se pasa un TrapperMedia, no se debe especificar cp_id.")
+        return media
+
+    @staticmethod
+    def _media_source(media: TrapperMedia, filename_overwrite: str = None) -> Tuple[str, str]:
+        """
+        Devuelve la URL y el nombre de fichero de una media pública.
+        """
+        if media.filePublic is not True:
+            raise Exception(_NOT_PUBLIC)
+        return str(media.filePath), filename_overwrite or media.fileName
 
-        # Guardar el contenido por chunks
-        with open(destination_path, "wb") as f:
-            for chunk in resp.iter_content(chunk_size=8192):
-                if chunk:
-                    f.write(chunk)
+    def _download_plan(self, cp_id: int, medias: List[Union[int, TrapperMedia]], missing: List[int],
+                       destination_folder: Path, compress: bool, resume: bool,
+                       max_volume_size: int = None) -> DownloadPlan:
+        """
+        Prepara la carpeta de salida de `download_many` y anota en el informe las medias no encontradas.
+        """
+        report = Report(title=f"Downloading {len(medias)} media(s)")
+        for m_id in missing:
+            report.add_error(str(m_id), "download", self._not_found(cp_id, m_id))
+        out_put_dir = self._output_subfolder(destination_folder, f"trapper_download_media_{cp_id}", resume)
+        return DownloadPlan(out_put_dir, report, compress, resume, max_volume_size)
 
-        return Path(destination_path)
+    def _finish_download(self, plan: DownloadPlan) -> Path:
+        """
+        Cierra el ZIP (o comprime la carpeta) de `download_many` y devuelve el resultado.
+        Bloquea: desde asyncio se ejecuta en un hilo.
+        """
+        if plan.sink is not None:
+            plan.sink.close()
+            plan.folder.rmdir()
+            return plan.sink.volumes[0]
+        if plan.compress:
+            return self._compress_folder(plan.folder, fmt="zip", remove_folder=not plan.resume)
+        return plan.folder
+
+    def _output_subfolder(self, destination_folder: Path, prefix: str, resume: bool = False) -> Path:
+        """
+        Devuelve la carpeta de descarga: `destination_folder/prefix` si se reanuda (para encontrar
+        la descarga anterior) o una carpeta aleatoria nueva en otro caso.
+        """
+        if not resume:
+            return self._create_random_subfolder(destination_folder, prefix=prefix)
+        subdir = Path(destination_folder) / prefix
+        subdir.mkdir(parents=True, exist_ok=True)
+        return subdir
 
     def _create_random_subfolder(self, destination_folder: Path, prefix:str="trapper_") -> Path:
         """
@@ -1,19 +1,73 @@
 from pathlib import Path
-from typing import Dict, Any, Callable, TypeVar, Set
+from typing import Dict, Any, Callable, TypeVar, Set, Iterator
 
 from pydantic import BaseModel
 
 from trapper_client import Schemas
+from trapper_client.SyncState import SyncResult, SyncStore, sync_records
 from trapper_client.TrapperAPIComponent import TrapperAPIComponent, T
 import attr
 
-from trapper_client.components.CollectionsComponent import CollectionsComponent
+from trapper_client.components.CollectionsComponent import CollectionIndex
 from trapper_client.components.ResourcesComponent import ResourcesComponent
 import logging
 logger = logging.getLogger(__name__)
 
 @attr.s
-class ObservationsResultsComponent(TrapperAPIComponent):
+class ClassificationResultsComponent(TrapperAPIComponent):
+    """
+    Common part of the results endpoints of a classification project (``.../results/{cp}``).
+
+    Subclasses define ``_endpoint`` with a ``{cp}`` placeholder and their own ``_default_query``.
+    """
+    _default_query = {"camtrapdp" : "True"}
+
+    def set_camtrapdp_format(self):
+        """
+        Set the camtrapdp format for the endpoint.
+
+        Parameters
+        ----------
+        camtrapdp : bool
+            If True, set the endpoint to use camtrapdp format.
+        """
+        self._default_query["camtrapdp"] = "True"
+
+    def unset_camtrapdp_format(self):
+        """
+        Set the camtrapdp format for the endpoint.
+
+        Parameters
+        ----------
+        camtrapdp : bool
+            If True, set the endpoint to use camtrapdp format.
+        """
+        self._default_query["camtrapdp"] = "false"
+
+    def iter_by_classification_project(self, cp_id: int, query: Dict[str, Any] = None) -> Iterator[Dict[str, str]]:
+        """
+        Stream the raw CSV rows of the results of a classification project.
+
+        Rows are parsed while the export is downloaded and are not validated against the
+        schema, so memory use stays flat regardless of the size of the project.
+
+        Parameters
+        ----------
+        cp_id : int
+            The ID of the classification project (replaces {cp} in the endpoint).
+        query : dict, optional
+            Optional query parameters, merged with the default ones.
+
+        Returns
+        -------
+        Iterator[dict]
+            Generator of result rows.
+        """
+        return self.iter_export({**self._default_query, **(query or {})}, endpoint=self._endpoint.format(cp=cp_id))
+
+
+@attr.s
+class ObservationsResultsComponent(ClassificationResultsComponent):
     explicit_fields = [
         "pk",
         "project",
@@ -40,28 +94,6 @@ class ObservationsResultsComponent(TrapperAPIComponent):
     _schema = Schemas.TrapperClassificationResultsList
     _default_query = {"camtrapdp" : "True"}
 
-    def set_camtrapdp_format(self):
-        """
-        Set the camtrapdp format for the endpoint.
-
-        Parameters
-        ----------
-        camtrapdp : bool
-            If True, set the endpoint to use camtrapdp format.
-        """
-        self._default_query["camtrapdp"] = "True"
-
-    def unset_camtrapdp_format(self):
-        """
-        Set the camtrapdp format for the endpoint.
-
-        Parameters
-        ----------
-        camtrapdp : bool
-            If True, set the endpoint to use camtrapdp format.
-        """
-        self._default_query["camtrapdp"] = "false"
-
     def __attrs_post_init__(self):
         """
         Initialize the component with observations endpoint and schema.
@@ -96,11 +128,7 @@ class ObservationsResultsComponent(TrapperAPIComponent):
             Media items associated with the specified classification project and collection.
         """
 
-        collections:CollectionsComponent = CollectionsComponent(self._client)
-        results = collections.get_by_classification_project(cp_id)
-        logger.info(results)
-
-        collection_inter_id = [ r.pk for r in results.results if r.collection_pk == c_id ]
+        collection_inter_id = CollectionIndex.of(self._client).internal_ids(cp_id, c_id)
 
         if len(collection_inter_id) == 0:
             return Schemas.TrapperClassificationResultsList(**{"pagination": {"count":0, "next":None, "previous":None}, "results":[]})
@@ -117,7 +145,43 @@ class ObservationsResultsComponent(TrapperAPIComponent):
         return res
 
 @attr.s
-class ObservationsComponent(TrapperAPIComponent):
+class ClassificationsComponent(TrapperAPIComponent):
+    """
+    Common part of the classification listings of a project (human and AI).
+
+    Subclasses define ``_endpoint``, filtered by project with the ``project`` parameter.
+    """
+
+    def sync(self, cp_id: int, store: SyncStore = None, query: dict = None, since_param: str = None) -> SyncResult:
+        """
+        Pull the classifications of a classification project changed since the last sync into a local store.
+
+        The human or AI classifications, depending on the endpoint of the component.
+        See :func:`trapper_client.SyncState.sync_records`.
+
+        Parameters
+        ----------
+        cp_id : int
+            The ID of the classification project.
+        store : SyncStore, optional
+            Local store, defaults to one shared by the client at ``~/.cache/trapper_client/sync.sqlite``.
+        query : dict, optional
+            Optional search parameters; each distinct query has its own high-water mark.
+        since_param : str, optional
+            Query parameter of the server filtering by modification date, if available.
+
+        Returns
+        -------
+        SyncResult
+            Counts of fetched, new and changed records, and the new high-water mark.
+        """
+        store = store or self._client.shared("sync_store", SyncStore)
+        return sync_records(self._client, self._endpoint, store, cp_id, {**(query or {}), "project": cp_id},
+                            since_param=since_param)
+
+
+@attr.s
+class ObservationsComponent(ClassificationsComponent):
     """
     Component for interacting with Observations endpoint.
 
@@ -158,28 +222,26 @@ class ObservationsComponent(TrapperAPIComponent):
         self.results = ObservationsResultsComponent(self._client)
 
     def get_all_by_collection(self, cp_id:int, c_id:int, query: dict = None) -> T:
-        collections = CollectionsComponent(self._client).get_by_classification_project(int(cp_id), query)
-        collection = [col for col in collections.results if str(col.collection_pk) == str(c_id)]
+        collection = CollectionIndex.of(self._client).internal_ids(cp_id, c_id)
 
         query = query.copy() if query else {}
-        query["collection"] = collection[0].pk
+        query["collection"] = collection[0]
         query["project"] = cp_id
-        logger.debug(collection)
+        logger.debug("Internal ids %s", collection)
 
         return self.get_all(query, None, f"/media_classification/api/classifications/results/{cp_id}/")
 
     def get_by_collection(self, cp_id:int, c_id:int, query: dict = None) -> T:
         logger.debug(f"Getting internal id for collection {c_id}")
-        collections = CollectionsComponent(self._client).get_by_classification_project(int(cp_id), query)
-        collection = [col for col in collections.results if str(col.collection_pk) == str(c_id)]
+        collection = CollectionIndex.of(self._client).internal_ids(cp_id, c_id)
 
         if len(collection) == 0:
             return Schemas.TrapperMediaList(**{"pagination": {"count":0, "next":None, "previous":None}, "results":[]})
 
         query = query.copy() if query else {}
-        query["collection"] = collection[0].pk
+        query["collection"] = collection[0]
         query["project"] = cp_id
-        logger.debug(f"Internal id {collection}")
+        logger.debug("Internal ids %s", collection)
 
         return self.get(query)
 
@@ -222,13 +284,12 @@ class ObservationsComponent(TrapperAPIComponent):
         Schemas.TrapperObservationList
             Observations from the specified classification project and collection.
         """
-        collections = CollectionsComponent(self._client).get_by_classification_project(int(cp_id), query)
-        collection = [col for col in collections.results if str(col.collection_pk) == str(c_id)]
+        collection = CollectionIndex.of(self._client).internal_ids(cp_id, c_id)
 
         endpoint = f"/media_classification/api/classifications/results/{cp_id}/"
 
         query = query.copy() if query else {}
-        query["collection"] = collection[0].pk
+        query["collection"] = collection[0]
 
         return self.get_all(query, None, endpoint)
 
@@ -262,7 +323,7 @@ class AggObservationsResultsComponent(ObservationsResultsComponent):
 # AI
 # ###########################################################################################
 @attr.s
-class AIObservationsResultsComponent(TrapperAPIComponent):
+class AIObservationsResultsComponent(ClassificationResultsComponent):
 
     explicit_fields = [
         "pk"
@@ -283,28 +344,6 @@ class AIObservationsResultsComponent(TrapperAPIComponent):
     _schema : BaseModel = Schemas.TrapperClassificationResultsList
     _default_query = {"camtrapdp" : "True"}
 
-    def set_camtrapdp_format(self):
-        """
-        Set the camtrapdp format for the endpoint.
-
-        Parameters
-        ----------
-        camtrapdp : bool
-            If True, set the endpoint to use camtrapdp format.
-        """
-        self._default_query["camtrapdp"] = "True"
-
-    def unset_camtrapdp_format(self):
-        """
-        Set the camtrapdp format for the endpoint.
-
-        Parameters
-        ----------
-        camtrapdp : bool
-            If True, set the endpoint to use camtrapdp format.
-        """
-        self._default_query["camtrapdp"] = "false"
-
     def __init_subclass__(cls, **kwargs):
         """
         Dynamically generate getter methods for each explicit field when the subclass is created.
@@ -347,11 +386,7 @@ class AIObservationsResultsComponent(TrapperAPIComponent):
             Media items associated with the specified classification project and collection.
         """
 
-        collections:CollectionsComponent = CollectionsComponent(self._client)
-        results = collections.get_by_classification_project(cp_id)
-        logger.info(results)
-
-        collection_inter_id = [ r.pk for r in results.results if r.collection_pk == c_id ]
+        collection_inter_id = CollectionIndex.of(self._client).internal_ids(cp_id, c_id)
 
         if len(collection_inter_id) == 0:
             # No hay colecciones asociadas al proyecto de clasificacion
@@ -370,7 +405,7 @@ class AIObservationsResultsComponent(TrapperAPIComponent):
 
 
 @attr.s
-class AIObservationsComponent(TrapperAPIComponent):
+class AIObservationsComponent(ClassificationsComponent):
 
     explicit_fields = [
         "pk"
@@ -422,11 +457,7 @@ class AIObservationsComponent(TrapperAPIComponent):
             Media items associated with the specified classification project and collection.
         """
 
-        collections:CollectionsComponent = CollectionsComponent(self._client)
-        results = collections.get_by_classification_project(cp_id)
-        logger.info(results)
-
-        collection_inter_id = [ r.pk for r in results.results if r.collection_pk == c_id ]
+        collection_inter_id = CollectionIndex.of(self._client).internal_ids(cp_id, c_id)
 
         if len(collection_inter_id) == 0:
             # No hay colecciones asociadas al proyecto de clasificacion
@@ -491,11 +522,7 @@ class UserObservationsComponent(TrapperAPIComponent):
             Media items associated with the specified classification project and collection.
         """
 
-        collections:CollectionsComponent = CollectionsComponent(self._client)
-        results = collections.get_by_classification_project(cp_id)
-        logger.info(results)
-
-        collection_inter_id = [ r.pk for r in results.results if r.collection_pk == c_id ]
+        collection_inter_id = CollectionIndex.of(self._client).internal_ids(cp_id, c_id)
 
         if len(collection_inter_id) == 0:
             # No hay colecciones asociadas al proyecto de clasificacion
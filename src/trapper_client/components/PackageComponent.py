@@ -1,9 +1,8 @@
 import os
 from typing import Dict, Any, Callable, TypeVar, List, Set
 
-import requests
-
 from trapper_client import Schemas
+from trapper_client.RateLimiter import MEDIA
 from trapper_client.TrapperAPIComponent import TrapperAPIComponent, T
 import attr
 
@@ -80,7 +79,8 @@ class PackagesComponent(TrapperAPIComponent):
         :param destination_folder: Carpeta donde se guardará el paquete descargado.
         :return: Ruta completa del archivo descargado.
         """
-        resp = requests.get(package_url, stream=True, timeout=60)
+        self._client.rate_limiter.acquire(package_url, MEDIA)
+        resp = self._client.media_session.get(package_url, stream=True, timeout=60)
         resp.raise_for_status()
 
         # Intentar extraer filename desde Content-Disposition
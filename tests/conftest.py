@@ -1,6 +1,9 @@
 import os
+import types
 import pytest
+from trapper_client.APIClientBase import APIClientBase
 from trapper_client.TrapperClient import TrapperClient
+from tests.helpers import CONTENT, FakeMediaResponse
 from dotenv import load_dotenv
 load_dotenv()
 
@@ -17,4 +20,25 @@ def existing_subjectset_name():
 
 @pytest.fixture
 def existing_subjectset_id():
-    return int(os.getenv("TEST_EXISTING_SUBJECTSET_ID"))
\ No newline at end of file
+    return int(os.getenv("TEST_EXISTING_SUBJECTSET_ID"))
+
+
+@pytest.fixture
+def server(monkeypatch):
+    """
+    Fake media server returning CONTENT (honouring Range requests); returns the headers of each request.
+    """
+    calls = []
+
+    def get(url, stream=False, timeout=None, headers=None):
+        calls.append(headers)
+        if headers and "Range" in headers:
+            start = int(headers["Range"][len("bytes="):-1])
+            if start >= len(CONTENT):
+                return FakeMediaResponse(416, b"")
+            return FakeMediaResponse(206, CONTENT[start:])
+        return FakeMediaResponse(200, CONTENT)
+
+    session = types.SimpleNamespace(get=get)
+    monkeypatch.setattr(APIClientBase, "media_session_for", lambda self, workers=None: session)
+    return calls
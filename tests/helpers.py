@@ -1,6 +1,9 @@
 import logging
 import pytest
 
+from trapper_client import Schemas
+from trapper_client.APIClientBase import APIClientBase
+
 logger = logging.getLogger(__name__)
 
 def validate_objects(deployments, expected_type):
@@ -123,3 +126,73 @@ def validate_rdata_from(results, expected):
     from datetime import datetime
     expected_date = datetime.fromisoformat(expected)
     assert all(d.date_recorded >= expected_date for d in results)
+
+
+# ---------------------------------------------------------------------------------------------
+# Datos y dobles de prueba sin servidor
+# ---------------------------------------------------------------------------------------------
+
+PAGINATION = {"page": 1, "page_size": 1, "pages": 1, "count": 1}
+
+CONTENT = b"0123456789" * 1000
+
+OBSERVATION_ROW = {
+    "deploymentID": "dep_01", "mediaID": "7", "eventID": "ev_1", "eventStart": "2025-01-01T00:00:00",
+    "eventEnd": "2025-01-01T00:00:10", "observationLevel": "media", "observationType": "animal",
+    "cameraSetupType": "", "scientificName": "Vulpes vulpes", "count": "1", "lifeStage": "", "sex": "",
+    "behavior": "", "individualID": "", "individualPositionRadius": "", "individualPositionAngle": "",
+    "individualSpeed": "", "classifiedBy": "user", "classificationTimestamp": "2025-01-02T00:00:00",
+    "classificationProbability": "0.9",
+}
+HUMAN_ROW = {**OBSERVATION_ROW, "observationID": "1", "classificationMethod": "human", "observationTags": "",
+             "observationComments": ""}
+TRAPPER_FIELDS = {"_id": "abc", "countNew": "", "englishName": "Red fox", "bboxes": "[[0.1, 0.2, 0.3, 0.4]]"}
+
+# Fila de resultados y el modelo que debe elegir la unión
+RESULT_ROWS = [
+    (HUMAN_ROW, Schemas.TrapperObservationResultsCTDP),
+    ({**HUMAN_ROW, **TRAPPER_FIELDS}, Schemas.TrapperObservationResultsTrapper),
+    ({**OBSERVATION_ROW, "observationID": "1", **TRAPPER_FIELDS}, Schemas.TrapperAIObservationResultsTrapper),
+    ({**OBSERVATION_ROW, "bboxWidth": "0.5"}, Schemas.TrapperAIObservationResultsCTDP),
+]
+
+
+def media_row(media_id):
+    """Raw media row as returned by the media listing."""
+    return {
+        "mediaID": media_id, "deploymentID": "dep_01", "captureMethod": "activityDetection",
+        "timestamp": "2025-01-01T00:00:00", "filePath": f"http://trapper.test/media/{media_id}.jpg",
+        "filePublic": True, "fileName": f"{media_id}.jpg", "fileMediatype": "image/jpeg", "favorite": False,
+    }
+
+
+def offline_client(**kwargs):
+    """APIClientBase with a dummy token that never authenticates against a server."""
+    return APIClientBase(access_token="token", user_name=None, user_password=None,
+                         base_url="http://localhost", **kwargs)
+
+
+class FakeMediaResponse:
+    """Streamed media response of a fake media server."""
+
+    def __init__(self, status_code, content):
+        self.status_code = status_code
+        self.content = content
+        self.headers = {"Content-Length": str(len(content))}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        pass
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise Exception(f"HTTP {self.status_code}")
+
+    def iter_content(self, chunk_size=1):
+        for i in range(0, len(self.content), chunk_size):
+            yield self.content[i:i + chunk_size]
@@ -0,0 +1,109 @@
+import gc
+import logging
+import time
+
+import pytest
+
+from trapper_client import Schemas
+from trapper_client.APIQuery import APIQuery
+from trapper_client.Schemas import TrapperMedia
+from trapper_client.Validation import results_validator
+from tests.helpers import media_row
+
+logger = logging.getLogger(__name__)
+
+#
+# pytest -o log_cli=true --log-cli-level=DEBUG
+#
+
+PAGE_SIZE = 3
+
+
+class FakeClient:
+    def __init__(self, pages):
+        self.pages = pages
+        self.calls = []
+
+    def get(self, endpoint, query=None, raise_on_error=True):
+        self.calls.append((endpoint, query))
+        page = query["page"]
+        start = page * PAGE_SIZE
+        return {
+            "pagination": {"page": page, "page_size": PAGE_SIZE, "pages": self.pages, "count": 0},
+            "results": [media_row(i) for i in range(start, start + PAGE_SIZE)],
+        }
+
+
+def test_results_validator_is_cached():
+    assert results_validator(Schemas.TrapperMediaList) is results_validator(Schemas.TrapperMediaList)
+
+
+def test_where_validates_pages():
+    client = FakeClient(pages=2)
+    query = APIQuery(client, "/media/{cp}", {"cp": 33}, Schemas.TrapperMediaList)
+
+    items = list(query)
+
+    assert all(isinstance(m, TrapperMedia) for m in items)
+    assert [m.mediaID for m in items] == list(range(3 * PAGE_SIZE))
+    assert client.calls[0][0] == "/media/33"
+
+
+def test_where_applies_filter_without_recursion():
+    client = FakeClient(pages=400)
+    query = APIQuery(client, "/media", schema=Schemas.TrapperMediaList, filter_fn=lambda m: m.mediaID == 1000)
+
+    assert [m.mediaID for m in query] == [1000]
+
+
+def test_prefetch_keeps_order_and_stays_bounded():
+    client = FakeClient(pages=20)
+    seen = []
+
+    with APIQuery(client, "/media", schema=Schemas.TrapperMediaList, prefetch=2) as query:
+        for media in query:
+            seen.append(media.mediaID)
+            if len(seen) == PAGE_SIZE:
+                time.sleep(0.2)
+                # página actual + 2 en cola + 1 en curso como máximo
+                assert len(client.calls) <= 4
+            if len(seen) == 2 * PAGE_SIZE:
+                break
+
+    assert seen == list(range(2 * PAGE_SIZE))
+    assert query._worker is None
+    assert len(client.calls) <= 5
+
+
+def test_abandoned_cursor_stops_prefetch():
+    query = APIQuery(FakeClient(pages=20), "/media", schema=Schemas.TrapperMediaList, prefetch=1)
+    next(query)
+    worker = query._worker
+
+    del query
+    gc.collect()
+    worker.join(timeout=2)
+
+    assert not worker.is_alive()
+
+
+def test_prefetch_reads_every_page():
+    client = FakeClient(pages=5)
+
+    items = list(APIQuery(client, "/media", schema=Schemas.TrapperMediaList, prefetch=3))
+
+    assert [m.mediaID for m in items] == list(range(6 * PAGE_SIZE))
+
+
+def test_prefetch_propagates_errors():
+    class FailingClient(FakeClient):
+        def get(self, endpoint, query=None, raise_on_error=True):
+            if query["page"] == 2:
+                raise RuntimeError("boom")
+            return super().get(endpoint, query, raise_on_error)
+
+    query = APIQuery(FailingClient(pages=5), "/media", schema=Schemas.TrapperMediaList, prefetch=1)
+
+    with pytest.raises(RuntimeError):
+        list(query)
+    query.close()
@@ -0,0 +1,179 @@
+import asyncio
+import gzip
+import hashlib
+import logging
+import zipfile
+
+import pytest
+
+from trapper_client.Schemas import TrapperMedia
+
+httpx = pytest.importorskip("httpx")
+
+from trapper_client.APIClientBase import APIClientBase, APIClientCore
+from trapper_client.AsyncAPIClientBase import AsyncAPIClientBase
+from trapper_client.AsyncTrapperClient import AsyncTrapperClient
+from trapper_client.DownloadManifest import DownloadManifest, part_path
+from trapper_client.MediaPredicates import ANY_HUMAN
+from trapper_client.SyncState import SyncStore
+from tests.helpers import media_row
+
+logger = logging.getLogger(__name__)
+
+#
+# pytest -o log_cli=true --log-cli-level=DEBUG
+#
+
+PAGES = 3
+
+RESULTS_CSV = (
+    "mediaID,observationType,scientificName\r\n"
+    "1,animal,Sus scrofa\r\n"
+    "2,human,\r\n"
+    "3,animal,Cervus elaphus\r\n"
+).encode("utf-8")
+
+CLASSIFICATIONS = [
+    {"pk": 10, "updated_at": "2025-01-01T00:00:00Z"},
+    {"pk": 11, "updated_at": "2025-01-02T00:00:00Z"},
+]
+
+
+def _handler(request):
+    path = request.url.path
+    if path.endswith(".jpg"):
+        start = int(request.headers.get("Range", "bytes=0-")[len("bytes="):-1])
+        return httpx.Response(206 if start else 200, content=b"jpeg"[start:])
+    if "/results/" in path or path.endswith("/export/"):
+        return httpx.Response(200, content=gzip.compress(RESULTS_CSV), headers={"Content-Type": "text/csv"})
+    if path.endswith("/classifications"):
+        return httpx.Response(200, json={
+            "pagination": {"page": 1, "page_size": 50, "pages": 1, "count": len(CLASSIFICATIONS)},
+            "results": CLASSIFICATIONS,
+        })
+
+    page = int(request.url.params.get("page", "1"))
+    return httpx.Response(200, json={
+        "pagination": {"page": page, "page_size": 1, "pages": PAGES, "count": PAGES},
+        "results": [media_row(page)],
+    })
+
+
+def _run(coro_fn):
+    async def main():
+        async with AsyncTrapperClient(access_token="token", base_url="http://trapper.test") as client:
+            client.raw._async_session = httpx.AsyncClient(transport=httpx.MockTransport(_handler))
+            return await coro_fn(client)
+
+    return asyncio.run(main())
+
+
+def test_async_client_has_no_sync_requests():
+    client = AsyncAPIClientBase(access_token="token", user_name=None, user_password=None, base_url="http://trapper.test")
+
+    assert isinstance(client, APIClientCore)
+    assert not isinstance(client, APIClientBase)
+    assert not hasattr(client, "session")
+
+
+def test_async_get_all():
+    async def scenario(client):
+        return await client.media.get_all(query={"cp": 33})
+
+    media = _run(scenario)
+    assert [m.mediaID for m in media.results] == [1, 2, 3]
+    assert isinstance(media.results[0], TrapperMedia)
+
+
+def test_async_where_iterates_all_pages():
+    async def scenario(client):
+        return [m.mediaID async for m in client.media.where(cp=33)]
+
+    assert _run(scenario) == [1, 2, 3]
+
+
+def test_async_generated_getter():
+    async def scenario(client):
+        return await client.media.get_all_by_deployment(33, 660)
+
+    assert len(_run(scenario).results) == PAGES
+
+
+def test_async_download_many(tmp_path):
+    async def scenario(client):
+        media = await client.media.get_all(query={"cp": 33})
+        return await client.media.download_many(None, media.results, tmp_path, max_workers=2)
+
+    folder, report = _run(scenario)
+    assert report.is_success()
+    assert sorted(p.name for p in folder.iterdir()) == ["1.jpg", "2.jpg", "3.jpg"]
+
+
+def test_async_download_many_compress(tmp_path):
+    async def scenario(client):
+        media = await client.media.get_all(query={"cp": 33})
+        return await client.media.download_many(None, media.results, tmp_path, compress=True)
+
+    archive, report = _run(scenario)
+    assert report.is_success()
+    assert [p.name for p in tmp_path.iterdir()] == [archive.name]
+    with zipfile.ZipFile(archive) as zf:
+        assert sorted(zf.namelist()) == [f"{archive.stem}/{i}.jpg" for i in (1, 2, 3)]
+
+
+def test_async_download_by_classification_project_uses_project_subfolder(tmp_path):
+    async def scenario(client):
+        return await client.media.download_by_classification_project(33, destination_folder=tmp_path)
+
+    folder, report = _run(scenario)
+    assert report.is_success()
+    assert folder.parent.parent == tmp_path
+    assert folder.parent.name.startswith("trapper_download_media_33")
+
+
+def test_async_resume_continues_partial_file(tmp_path):
+    media = TrapperMedia(**media_row(1))
+    manifest = DownloadManifest(tmp_path)
+    part_path(tmp_path / "1.jpg").write_bytes(b"jp")
+
+    async def scenario(client):
+        return await client.media.download(None, media, tmp_path, resume=True, manifest=manifest)
+
+    path = _run(scenario)
+    assert path.read_bytes() == b"jpeg"
+    assert not part_path(path).exists()
+    assert manifest.get(1).sha256 == hashlib.sha256(b"jpeg").hexdigest()
+
+
+def test_async_export_streams_compressed_csv():
+    async def scenario(client):
+        rows = await client.deployments.export(stream=True)
+        return [row["mediaID"] async for row in rows]
+
+    assert _run(scenario) == ["1", "2", "3"]
+
+
+def test_async_only_animals():
+    async def scenario(client):
+        return await client.media.get_by_classification_project_only_animals(33)
+
+    assert [m.mediaID for m in _run(scenario).results] == [1, 3]
+
+
+def test_async_iter_by_predicate():
+    async def scenario(client):
+        return [m.mediaID async for m in client.media.iter_by_predicate(33, ANY_HUMAN)]
+
+    assert _run(scenario) == [2]
+
+
+def test_async_sync_observations(tmp_path):
+    store = SyncStore(tmp_path / "sync.sqlite")
+
+    async def scenario(client):
+        return await client.observations.sync(33, store=store), await client.observations.sync(33, store=store)
+
+    first, second = _run(scenario)
+    assert (first.fetched, first.inserted, first.updated) == (2, 2, 0)
+    assert (second.fetched, second.inserted, second.unchanged) == (2, 0, 2)
+    assert [row["pk"] for row in store.records(first.scope)] == [10, 11]
@@ -0,0 +1,137 @@
+import asyncio
+import logging
+
+import pytest
+
+from trapper_client.AsyncDownloader import AdaptiveLimit, AsyncDownloader, DownloadJob
+from trapper_client.RetryPolicy import RetryPolicy
+from trapper_client.Schemas import TrapperMedia
+from trapper_client.components.MediaComponent import MediaComponent
+from tests.helpers import PAGINATION, media_row, offline_client
+
+httpx = pytest.importorskip("httpx")
+
+logger = logging.getLogger(__name__)
+
+#
+# pytest -o log_cli=true --log-cli-level=DEBUG
+#
+
+
+class Server:
+    def __init__(self, fail_first=()):
+        self.fail_first = set(fail_first)
+        self.active = {}
+        self.peak = {}
+        self.requests = 0
+
+    async def handler(self, request):
+        self.requests += 1
+        host = request.url.host
+        self.active[host] = self.active.get(host, 0) + 1
+        self.peak[host] = max(self.peak.get(host, 0), self.active[host])
+        await asyncio.sleep(0.001)
+        self.active[host] -= 1
+        name = request.url.path.rsplit("/", 1)[-1]
+        if name in self.fail_first:
+            self.fail_first.discard(name)
+            return httpx.Response(503)
+        return httpx.Response(200, content=name.encode() * 100)
+
+    def session(self):
+        return httpx.AsyncClient(transport=httpx.MockTransport(self.handler))
+
+
+def _downloader(server, **kwargs):
+    return AsyncDownloader(session=server.session(), retry_policy=RetryPolicy(backoff_factor=0, jitter=0), **kwargs)
+
+
+def test_limit_slow_start_then_backs_off_on_errors():
+    limit = AdaptiveLimit(initial=4, maximum=64)
+
+    for _ in range(4):
+        limit.record(True, 1000)
+    assert limit.limit == 8
+
+    for i in range(8):
+        limit.record(i != 0, 1000)
+    assert limit.limit == 4
+
+    for _ in range(4):
+        limit.record(True, 10 ** 9)
+    assert limit.limit == 5
+
+
+def test_downloads_respect_per_host_limit(tmp_path):
+    server = Server()
+    downloader = _downloader(server, max_concurrency=50, per_host=3)
+    jobs = [DownloadJob(i, f"http://host{i % 2}.test/{i}.jpg", tmp_path / f"{i}.jpg") for i in range(40)]
+
+    report = asyncio.run(downloader.run(jobs))
+
+    assert report.is_success()
+    assert len(list(tmp_path.glob("*.jpg"))) == 40
+    assert not list(tmp_path.glob("*.part"))
+    assert max(server.peak.values()) <= 3
+
+
+def test_failed_downloads_are_retried_and_reported(tmp_path):
+    server = Server(fail_first={"1.jpg"})
+    downloader = _downloader(server)
+    jobs = [DownloadJob(1, "http://h.test/1.jpg", tmp_path / "1.jpg"),
+            DownloadJob(2, "http://h.test/missing", tmp_path / "2.jpg")]
+    server.fail_first.add("missing")
+    downloader.retry_policy = RetryPolicy(max_retries=0)
+
+    report = asyncio.run(downloader.run(jobs))
+
+    assert set(report.errors) == {"1", "2"}
+
+    server = Server(fail_first={"1.jpg"})
+    report = asyncio.run(_downloader(server).run(jobs[:1]))
+    assert report.is_success()
+    assert (tmp_path / "1.jpg").read_bytes() == b"1.jpg" * 100
+    assert server.requests == 2
+
+
+def test_cancelled_download_releases_its_slot(tmp_path):
+    started = []
+
+    async def handler(request):
+        started.append(request.url.path)
+        await asyncio.sleep(10)
+        return httpx.Response(200, content=b"late")
+
+    async def scenario():
+        session = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        downloader = AsyncDownloader(session=session)
+        task = asyncio.create_task(downloader.run([DownloadJob(1, "http://h.test/1.jpg", tmp_path / "1.jpg")]))
+        while not started:
+            await asyncio.sleep(0.001)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        return downloader.limiter.active
+
+    assert asyncio.run(scenario()) == 0
+    assert not (tmp_path / "1.jpg").exists()
+
+
+def test_media_ids_are_resolved_with_one_listing(tmp_path):
+    client = offline_client()
+    calls = []
+
+    def get_all_pages(endpoint, query=None, raise_on_error=True, max_workers=None):
+        calls.append(query)
+        return {"pagination": PAGINATION, "results": [media_row(i) for i in range(5)]}
+
+    client.get_all_pages = get_all_pages
+    server = Server()
+
+    folder, report = MediaComponent(client).download_concurrent(
+        33, [1, 2, 3, TrapperMedia(**media_row(4)), 99], tmp_path, downloader=_downloader(server)
+    )
+
+    assert len(calls) == 1
+    assert sorted(p.name for p in folder.iterdir()) == ["1.jpg", "2.jpg", "3.jpg", "4.jpg"]
+    assert set(report.errors) == {"99"}
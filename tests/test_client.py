@@ -0,0 +1,124 @@
+import gzip
+import logging
+
+import requests
+
+from trapper_client.TrapperClient import TrapperClient
+from tests.helpers import offline_client
+
+logger = logging.getLogger(__name__)
+
+#
+# pytest -o log_cli=true --log-cli-level=DEBUG
+#
+
+def test_session_is_reused_and_pooled():
+    client = offline_client(pool_maxsize=4)
+    session = client.session
+
+    assert client.session is session
+    assert session.get_adapter("https://localhost")._pool_maxsize == 4
+
+
+def test_close_releases_session():
+    client = offline_client()
+    session = client.session
+    client.close()
+
+    assert client._session is None
+    assert client.session is not session
+
+
+def test_trapper_client_context_manager():
+    with TrapperClient(access_token="token", base_url="http://localhost") as trapper_client:
+        trapper_client.raw.session
+
+    assert trapper_client.raw._session is None
+
+
+def _fake_pages(pages, page_size=2):
+    def fake_get(endpoint, query=None, raise_on_error=True):
+        page = query.get("page", 1)
+        start = (page - 1) * page_size
+        return {
+            "pagination": {"page": page, "page_size": page_size, "pages": pages, "count": pages * page_size},
+            "results": [{"pk": start + i} for i in range(page_size)],
+        }
+    return fake_get
+
+
+def test_get_all_pages_concurrent_keeps_order():
+    client = offline_client(page_workers=4)
+    client.get = _fake_pages(pages=7)
+
+    data = client.get_all_pages("/endpoint", {"page": 3})
+
+    assert [r["pk"] for r in data["results"]] == list(range(14))
+    assert data["pagination"]["page"] == 7
+
+
+def test_get_all_pages_sequential():
+    client = offline_client()
+    client.get = _fake_pages(pages=3)
+
+    data = client.get_all_pages("/endpoint", max_workers=1)
+
+    assert [r["pk"] for r in data["results"]] == list(range(6))
+
+
+def _response(content: bytes, content_type: str) -> requests.Response:
+    r = requests.Response()
+    r.status_code = 200
+    r.headers["Content-Type"] = content_type
+    r._content = content
+    return r
+
+
+class _Session:
+    def __init__(self, response):
+        self.response = response
+
+    def request(self, method, url, **kwargs):
+        return self.response
+
+
+def test_json_response_is_normalized_without_reencoding():
+    body = b'{"pk": 1}'
+    client = offline_client()
+    client._session = _Session(_response(body, "application/json"))
+
+    r = client.make_request("/endpoint", "GET")
+
+    assert r.content == body
+    assert r.json() is r.json()
+    assert r.json()["results"] == [{"pk": 1}]
+
+
+def test_csv_response_is_normalized_once():
+    body = gzip.compress(b"mediaID,observationType\n1,animal\n")
+    client = offline_client()
+    client._session = _Session(_response(body, "text/csv"))
+
+    page = client.get("/endpoint")
+
+    assert page["results"] == [{"mediaID": "1", "observationType": "animal"}]
+    assert page["pagination"]["count"] == 1
+
+
+def test_media_session_is_pooled_and_grows_with_workers():
+    client = offline_client(media_pool_maxsize=4)
+
+    session = client.media_session
+    adapter = session.get_adapter("https://media.example.org/1.jpg")
+    assert client.media_session_for(2) is session
+    assert session.get_adapter("https://x").poolmanager is adapter.poolmanager
+    assert adapter._pool_maxsize == 4 and adapter._pool_block
+    assert "Authorization" not in session.headers
+
+    adapter.poolmanager.connection_from_url("https://media.example.org/")
+    assert client.media_session_for(16) is session
+    assert session.get_adapter("https://x")._pool_maxsize == 16
+    assert len(adapter.poolmanager.pools) == 0
+
+    client.close()
+    assert client.media_session is not session
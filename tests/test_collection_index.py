@@ -0,0 +1,88 @@
+import asyncio
+import logging
+
+from trapper_client.AsyncAPIClientBase import AsyncAPIClientBase
+from trapper_client.components.AsyncComponents import AsyncMediaComponent
+from trapper_client.components.CollectionsComponent import CollectionIndex, CollectionsComponent
+from trapper_client.components.MediaComponent import MediaComponent
+from tests.helpers import PAGINATION, media_row, offline_client
+
+logger = logging.getLogger(__name__)
+
+#
+# pytest -o log_cli=true --log-cli-level=DEBUG
+#
+
+COLLECTIONS = [
+    {"pk": 101, "name": "A", "collection_pk": 1},
+    {"pk": 102, "name": "B", "collection_pk": 2},
+    {"pk": 103, "name": "B bis", "collection_pk": 2},
+]
+
+
+def _pages(calls):
+    def get_all_pages(endpoint, query=None, raise_on_error=True, max_workers=None):
+        calls.append((endpoint, query))
+        if endpoint.endswith("/collections"):
+            return {"pagination": PAGINATION, "results": COLLECTIONS}
+        return {"pagination": PAGINATION, "results": [media_row(1)]}
+    return get_all_pages
+
+
+def test_index_is_shared_and_loaded_once():
+    client = offline_client()
+    calls = []
+    client.get_all_pages = _pages(calls)
+    media = MediaComponent(client)
+
+    for c_id in (1, 2, 1, 2):
+        media.get_by_collection(33, c_id)
+
+    collection_calls = [q for e, q in calls if e.endswith("/collections")]
+    assert len(collection_calls) == 1
+    assert [q["collection"] for e, q in calls if not e.endswith("/collections")] == ["101", "102,103", "101", "102,103"]
+    assert CollectionIndex.of(client) is CollectionsComponent(client).index
+
+
+def test_unknown_collection_and_invalidation():
+    client = offline_client()
+    calls = []
+    client.get_all_pages = _pages(calls)
+    index = CollectionIndex.of(client)
+
+    assert index.internal_ids(33, 9) == []
+    index.invalidate(33)
+    assert index.internal_ids("33", "2") == [102, 103]
+    assert len(calls) == 2
+
+
+def test_listing_collections_refreshes_index():
+    client = offline_client()
+    calls = []
+    client.get_all_pages = _pages(calls)
+
+    CollectionsComponent(client).get_by_classification_project(33)
+
+    assert CollectionIndex.of(client).loaded(33)
+    assert CollectionIndex.of(client).internal_ids(33, 1) == [101]
+    assert len(calls) == 1
+
+
+def test_async_components_share_the_index():
+    client = AsyncAPIClientBase(access_token="token", user_name=None, user_password=None, base_url="http://localhost")
+    calls = []
+    pages = _pages(calls)
+
+    async def get_all_pages(endpoint, query=None, raise_on_error=True, max_workers=None):
+        return pages(endpoint, query)
+
+    client.get_all_pages = get_all_pages
+    media = AsyncMediaComponent(client)
+
+    async def main():
+        await media.get_by_collection(33, 1)
+        await media.get_by_collection(33, 2)
+
+    asyncio.run(main())
+
+    assert len([e for e, _ in calls if e.endswith("/collections")]) == 1
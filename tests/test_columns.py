@@ -0,0 +1,125 @@
+import logging
+from datetime import datetime, timezone
+
+import pytest
+
+from trapper_client import Schemas
+from trapper_client.Columns import ColumnarResults, check_container
+from trapper_client.components.MediaComponent import MediaComponent
+from tests.helpers import PAGINATION, media_row
+
+logger = logging.getLogger(__name__)
+
+#
+# pytest -o log_cli=true --log-cli-level=DEBUG
+#
+
+
+class PagesClient:
+    validate = "full"
+
+    def __init__(self, rows):
+        self.rows = rows
+
+    def get_all_pages(self, endpoint, query=None):
+        return {"pagination": PAGINATION, "results": self.rows}
+
+
+def _columns(rows):
+    return ColumnarResults.from_rows(Schemas.TrapperMediaList, rows)
+
+
+def test_columns_follow_schema_types():
+    cols = _columns([media_row(1), media_row(2)])
+
+    assert len(cols) == 2
+    assert cols.columns["mediaID"].values.typecode == "q"
+    assert cols.columns["filePublic"].values.typecode == "b"
+    assert cols.columns["deploymentID"].categories == ["dep_01"]
+    assert list(cols.columns["deploymentID"].values) == [0, 0]
+
+
+def test_row_views_read_values_on_access():
+    cols = _columns([media_row(1), {**media_row(2), "fileMediatype": None}])
+
+    row = cols[1]
+    assert row.mediaID == 2
+    assert row["fileName"] == "2.jpg"
+    assert row.fileMediatype is None
+    assert row.timestamp == datetime(2025, 1, 1, tzinfo=timezone.utc)
+    assert [r.mediaID for r in cols] == [1, 2]
+    with pytest.raises(AttributeError):
+        row.unknown
+
+
+def test_csv_strings_are_coerced():
+    media = {**media_row(1), "mediaID": "7", "filePublic": "False", "favorite": ""}
+
+    row = _columns([media])[0]
+
+    assert row.mediaID == 7
+    assert row.filePublic is False
+    assert row.favorite is None
+
+
+def test_invalid_values_are_missing():
+    cols = _columns([{**media_row(1), "mediaID": "abc"}])
+
+    assert cols[0].mediaID is None
+    assert cols.columns["mediaID"].valid == bytearray(b"\x00")
+
+
+def test_unknown_keys_become_object_columns():
+    cols = _columns([media_row(1), {**media_row(2), "extra": {"a": 1}}])
+
+    assert cols[0].extra is None
+    assert cols[1].extra == {"a": 1}
+
+
+def test_take_and_model():
+    cols = _columns([media_row(i) for i in range(5)])
+
+    subset = cols.take([4, 1])
+
+    assert [r.mediaID for r in subset] == [4, 1]
+    assert subset.columns["deploymentID"].categories is cols.columns["deploymentID"].categories
+    model = subset[0].to_model()
+    assert isinstance(model, Schemas.TrapperMedia)
+    assert model.mediaID == 4
+
+
+def test_get_all_as_columns():
+    component = MediaComponent(PagesClient([media_row(i) for i in range(4)]))
+
+    cols = component.get_all({"cp": 1}, filter_fn=lambda r: r.mediaID % 2 == 0, as_="columns")
+
+    assert isinstance(cols, ColumnarResults)
+    assert [r.mediaID for r in cols] == [0, 2]
+    assert cols.pagination == PAGINATION
+
+
+def test_unknown_container_is_rejected():
+    with pytest.raises(ValueError):
+        check_container("rows")
+
+
+def test_to_numpy_is_zero_copy():
+    np = pytest.importorskip("numpy")
+    cols = _columns([media_row(1), media_row(2)])
+
+    arrays = cols.to_numpy()
+
+    assert arrays["mediaID"].dtype == np.int64
+    assert np.shares_memory(arrays["mediaID"], np.frombuffer(cols.columns["mediaID"].values, dtype="q"))
+    assert list(arrays["fileName"]) == ["1.jpg", "2.jpg"]
+
+
+def test_to_pandas():
+    pytest.importorskip("pandas")
+    cols = _columns([media_row(1), {**media_row(2), "favorite": None}])
+
+    df = cols.to_pandas()
+
+    assert list(df["mediaID"]) == [1, 2]
+    assert df["deploymentID"].dtype == "category"
+    assert df["favorite"].isna().tolist() == [False, True]
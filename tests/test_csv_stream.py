@@ -0,0 +1,60 @@
+import bz2
+import gzip
+import io
+import logging
+import zipfile
+
+import pytest
+import requests
+
+from trapper_client.APIClientBase import APIClientBase, iter_csv_rows
+from trapper_client.components.DeploymentsComponent import DeploymentsComponent
+
+logger = logging.getLogger(__name__)
+
+#
+# pytest -o log_cli=true --log-cli-level=DEBUG
+#
+
+CSV = "deploymentID,locationID\n" + "".join(f"dep_{i},loc_{i}\n" for i in range(1000))
+
+
+def _zip(data: bytes) -> bytes:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as zf:
+        zf.writestr("deployments.csv", data)
+    return buffer.getvalue()
+
+
+@pytest.mark.parametrize("compress", [lambda d: d, gzip.compress, bz2.compress, _zip])
+def test_iter_csv_rows_decompresses_incrementally(compress):
+    rows = iter_csv_rows(io.BytesIO(compress(CSV.encode())), "text/csv")
+
+    assert next(rows) == {"deploymentID": "dep_0", "locationID": "loc_0"}
+    assert sum(1 for _ in rows) == 999
+
+
+class _Session:
+    def __init__(self, content: bytes):
+        self.content = content
+        self.kwargs = None
+
+    def request(self, method, url, **kwargs):
+        self.kwargs = kwargs
+        r = requests.Response()
+        r.status_code = 200
+        r.headers["Content-Type"] = "text/csv"
+        r.raw = io.BytesIO(self.content)
+        return r
+
+
+def test_export_stream_yields_rows():
+    client = APIClientBase(access_token="token", user_name=None, user_password=None, base_url="http://localhost")
+    client._session = _Session(gzip.compress(CSV.encode()))
+
+    rows = DeploymentsComponent(client).export(stream=True)
+
+    assert client._session.kwargs is None
+    assert next(rows)["deploymentID"] == "dep_0"
+    assert client._session.kwargs["stream"] is True
+    assert len(list(rows)) == 999
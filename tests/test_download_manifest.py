@@ -0,0 +1,128 @@
+import hashlib
+import logging
+from pathlib import Path
+
+from trapper_client.DownloadManifest import DownloadManifest, part_path
+from trapper_client.Schemas import TrapperMedia
+from trapper_client.components.MediaComponent import MediaComponent
+from tests.helpers import PAGINATION, CONTENT, media_row, offline_client
+
+logger = logging.getLogger(__name__)
+
+#
+# pytest -o log_cli=true --log-cli-level=DEBUG
+#
+
+def test_manifest_ignores_truncated_line(tmp_path):
+    manifest = DownloadManifest(tmp_path)
+    (tmp_path / "1.jpg").write_bytes(b"abc")
+    manifest.record(1, tmp_path / "1.jpg", 3, "x")
+    with open(manifest.path, "a") as f:
+        f.write('{"mediaID": "2", "pa')
+
+    reloaded = DownloadManifest(tmp_path)
+    reloaded.record(3, tmp_path / "3.jpg", 3, "y")
+
+    assert [e.mediaID for e in DownloadManifest(tmp_path)] == ["1", "3"]
+    assert reloaded.get(1).path == "1.jpg"
+
+
+def test_completed_checks_size_and_checksum(tmp_path):
+    manifest = DownloadManifest(tmp_path)
+    (tmp_path / "1.jpg").write_bytes(b"abc")
+    manifest.record(1, tmp_path / "1.jpg", 3, hashlib.sha256(b"abc").hexdigest())
+
+    assert manifest.completed(1, verify=True) == tmp_path / "1.jpg"
+    assert manifest.completed(2) is None
+    (tmp_path / "1.jpg").write_bytes(b"abd")
+    assert manifest.completed(1) is not None
+    assert manifest.completed(1, verify=True) is None
+    (tmp_path / "1.jpg").write_bytes(b"ab")
+    assert manifest.completed(1) is None
+
+
+def test_resume_continues_partial_file(tmp_path, server):
+    media = TrapperMedia(**media_row(7))
+    manifest = DownloadManifest(tmp_path)
+    part_path(tmp_path / "7.jpg").write_bytes(CONTENT[:4000])
+
+    path = MediaComponent(offline_client())._download_media(media, tmp_path, resume=True, manifest=manifest)
+
+    assert server == [{"Range": "bytes=4000-"}]
+    assert path.read_bytes() == CONTENT
+    assert not part_path(path).exists()
+    assert manifest.get(7).sha256 == hashlib.sha256(CONTENT).hexdigest()
+    assert manifest.completed(7, verify=True) == path
+
+
+def test_unsatisfiable_range_downloads_again(tmp_path, server):
+    media = TrapperMedia(**media_row(7))
+    part_path(tmp_path / "7.jpg").write_bytes(CONTENT + b"garbage")
+
+    path = MediaComponent(offline_client())._download_media(media, tmp_path, resume=True)
+
+    assert server == [{"Range": f"bytes={len(CONTENT) + 7}-"}, None]
+    assert path.read_bytes() == CONTENT
+
+
+def test_download_many_resume_skips_completed(tmp_path, server):
+    component = MediaComponent(offline_client())
+    medias = [TrapperMedia(**media_row(i)) for i in range(3)]
+
+    folder, _ = component.download_many(None, medias[:2], tmp_path, resume=True)
+    server.clear()
+    again, report = component.download_many(None, medias, tmp_path, resume=True)
+
+    assert report.is_success()
+    assert again == folder == tmp_path / "trapper_download_media_None"
+    assert len(server) == 1
+    assert len(DownloadManifest(folder)) == 3
+    assert sorted(p.name for p in folder.glob("*.jpg")) == ["0.jpg", "1.jpg", "2.jpg"]
+
+
+def test_download_many_resolves_ids_with_one_listing(tmp_path, server):
+    client = offline_client()
+    calls = []
+
+    def get_all_pages(endpoint, query=None, raise_on_error=True, max_workers=None):
+        calls.append(query)
+        return {"pagination": PAGINATION, "results": [media_row(i) for i in range(50)]}
+
+    client.get_all_pages = get_all_pages
+
+    folder, report = MediaComponent(client).download_many(33, [3, 42, 99], tmp_path)
+
+    assert calls == [{"cp": 33}]
+    assert sorted(p.name for p in folder.iterdir()) == ["3.jpg", "42.jpg"]
+    assert set(report.errors) == {"99"}
+
+
+def test_download_by_id_uses_pk_filter(tmp_path, server):
+    client = offline_client()
+    queries = []
+
+    def get(endpoint, query=None, raise_on_error=True):
+        queries.append(query)
+        return {"pagination": PAGINATION, "results": [media_row(query["pk"])]}
+
+    def get_all_pages(endpoint, query=None, raise_on_error=True, max_workers=None):
+        raise AssertionError("the project must not be listed")
+
+    client.get, client.get_all_pages = get, get_all_pages
+
+    path = MediaComponent(client).download(33, 7, tmp_path)
+
+    assert Path(path).name == "7.jpg"
+    assert queries == [{"cp": 33, "pk": 7}]
+
+
+def test_media_id_lookup_falls_back_when_pk_is_ignored():
+    client = offline_client()
+    client.get = lambda endpoint, query=None, raise_on_error=True: {
+        "pagination": PAGINATION, "results": [media_row(i) for i in range(3)]}
+    client.get_all_pages = lambda endpoint, query=None, raise_on_error=True, max_workers=None: {
+        "pagination": PAGINATION, "results": [media_row(i) for i in range(100)]}
+
+    res = MediaComponent(client).get_by_media_id(33, 70)
+
+    assert [m.mediaID for m in res.results] == [70]
@@ -0,0 +1,69 @@
+import logging
+
+import pytest
+
+from trapper_client import Schemas
+from trapper_client.Columns import ColumnarResults
+from trapper_client.Joins import HashIndex, group_by_media, inner_join, label_sets, left_join
+from trapper_client.Schemas import TrapperMedia
+from tests.helpers import media_row
+
+logger = logging.getLogger(__name__)
+
+#
+# pytest -o log_cli=true --log-cli-level=DEBUG
+#
+
+OBSERVATIONS = [
+    {"mediaID": "1", "deploymentID": "dep_01", "scientificName": "Sus scrofa"},
+    {"mediaID": "1", "deploymentID": "dep_01", "scientificName": "Cervus elaphus"},
+    {"mediaID": "1", "deploymentID": "dep_01", "scientificName": "Sus scrofa"},
+    {"mediaID": "2", "deploymentID": "dep_01", "scientificName": ""},
+    {"mediaID": "2", "deploymentID": "dep_02", "scientificName": "Vulpes vulpes"},
+    {"mediaID": "", "deploymentID": "dep_01", "scientificName": "Lynx pardinus"},
+]
+
+
+def _medias():
+    return [TrapperMedia(**media_row(i)) for i in range(4)]
+
+
+def test_index_groups_rows_by_key():
+    index = HashIndex.build(OBSERVATIONS)
+
+    assert len(index) == 5
+    assert len(index.keys()) == 3
+    assert len(index.get((1, "dep_01"))) == 3
+    assert index.get(_medias()[2]) == [OBSERVATIONS[3]]
+    assert _medias()[3] not in index
+
+
+def test_inner_and_left_join():
+    pairs = list(inner_join(_medias(), OBSERVATIONS))
+    assert [(m.mediaID, o["scientificName"]) for m, o in pairs] == [
+        (1, "Sus scrofa"), (1, "Cervus elaphus"), (1, "Sus scrofa"), (2, ""),
+    ]
+
+    pairs = list(left_join(_medias(), HashIndex.build(OBSERVATIONS)))
+    assert [(m.mediaID, o is not None) for m, o in pairs] == [
+        (0, False), (1, True), (1, True), (1, True), (2, True), (3, False),
+    ]
+
+
+def test_join_on_media_id_only():
+    pairs = list(inner_join(_medias(), OBSERVATIONS, key=("mediaID",)))
+
+    assert [m.mediaID for m, _ in pairs] == [1, 1, 1, 2, 2]
+    with pytest.raises(ValueError):
+        list(inner_join(_medias(), HashIndex.build(OBSERVATIONS), key=("mediaID",)))
+
+
+def test_columnar_media_and_label_sets():
+    media = ColumnarResults.from_rows(Schemas.TrapperMediaList, [media_row(i) for i in range(4)])
+
+    groups = {row.mediaID: len(obs) for row, obs in group_by_media(media, OBSERVATIONS)}
+    assert groups == {0: 0, 1: 3, 2: 1, 3: 0}
+
+    labels = {row.mediaID: species for row, species in label_sets(media, OBSERVATIONS)}
+    assert labels[1] == {"Sus scrofa", "Cervus elaphus"}
+    assert labels[2] == frozenset()
@@ -0,0 +1,68 @@
+import logging
+
+import requests
+
+from trapper_client.APIClientBase import APIClientBase
+from trapper_client.LazyLog import LazyRepr, Sampler, lazy, summary
+
+logger = logging.getLogger(__name__)
+
+#
+# pytest -o log_cli=true --log-cli-level=DEBUG
+#
+
+
+class _Session:
+    def __init__(self, content: bytes):
+        self.content = content
+
+    def request(self, method, url, **kwargs):
+        r = requests.Response()
+        r.status_code = 200
+        r.headers["Content-Type"] = "application/json"
+        r._content = self.content
+        return r
+
+
+def test_lazy_repr_is_truncated():
+    text = str(lazy("x" * 1000, max_length=10))
+
+    assert text.startswith("'xxxxxxxxx")
+    assert text.endswith("[992 more chars]")
+
+
+def test_lazy_repr_is_not_formatted_when_level_disabled(caplog):
+    calls = []
+    caplog.set_level(logging.INFO, logger=__name__)
+
+    logger.debug("Payload: %s", LazyRepr({"a": 1}, lambda o: calls.append(o) or "formatted"))
+
+    assert calls == []
+
+
+def test_summary_describes_pages():
+    page = {"pagination": {"page": 1}, "results": [1, 2, 3]}
+
+    assert str(summary(page)).startswith("3 results")
+    assert str(summary([1, 2])) == "2 items"
+
+
+def test_sampler_lets_through_one_in_n():
+    sampler = Sampler(every=3)
+
+    assert [sampler() for _ in range(7)] == [True, False, False, True, False, False, True]
+
+
+def test_payload_dump_is_opt_in(caplog):
+    caplog.set_level(logging.DEBUG, logger="trapper_client.payloads")
+    client = APIClientBase(access_token="token", user_name=None, user_password=None,
+                           base_url="http://localhost", dump_payloads=False)
+    client._session = _Session(b'{"pk": 12345}')
+
+    client.make_request("/endpoint", "GET")
+    assert not [r for r in caplog.records if r.name == "trapper_client.payloads"]
+
+    client.dump_payloads = True
+    client.make_request("/endpoint", "GET")
+    dumps = [r.getMessage() for r in caplog.records if r.name == "trapper_client.payloads"]
+    assert len(dumps) == 1 and "12345" in dumps[0]
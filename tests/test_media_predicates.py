@@ -0,0 +1,143 @@
+import logging
+
+import pytest
+
+from trapper_client.MediaPredicates import ANY_HUMAN, BLANK_ONLY, ONLY_ANIMALS, MediaFlags, species
+from trapper_client.components.MediaComponent import MediaComponent
+from tests.helpers import media_row, offline_client
+
+logger = logging.getLogger(__name__)
+
+#
+# pytest -o log_cli=true --log-cli-level=DEBUG
+#
+
+ROWS = [
+    {"mediaID": "0", "observationType": "animal", "scientificName": "Sus scrofa"},
+    {"mediaID": "1", "observationType": "animal", "scientificName": "Sus scrofa"},
+    {"mediaID": "1", "observationType": "human", "scientificName": ""},
+    {"mediaID": "2", "observationType": "human", "scientificName": ""},
+    {"mediaID": "3", "observationType": "blank", "scientificName": ""},
+    {"mediaID": "4", "observationType": "animal", "scientificName": "Cervus elaphus"},
+]
+
+
+def _component(rows=ROWS, calls=None, order=range(10)):
+    client = offline_client()
+
+    def get(endpoint, query=None, raise_on_error=True):
+        if calls is not None:
+            calls.append(("media", dict(query or {})))
+        return {
+            "pagination": {"page": 1, "page_size": 10, "pages": 1, "count": 10},
+            "results": [media_row(i) for i in order],
+        }
+
+    def stream_csv(endpoint, query=None):
+        if calls is not None:
+            calls.append(("observations", dict(query or {})))
+        return iter(rows)
+
+    client.get = get
+    client.stream_csv = stream_csv
+    return MediaComponent(client)
+
+
+def test_partial_flags_decide_early():
+    flags = MediaFlags([ONLY_ANIMALS, ANY_HUMAN])
+    flags.add(ROWS[2])
+
+    assert flags.decided(1, ANY_HUMAN) is True
+    assert flags.decided(1, ONLY_ANIMALS) is False
+    assert flags.decided(0, ONLY_ANIMALS) is None
+
+    flags.fold(ROWS)
+
+    assert flags.complete
+    assert len(flags) == 5
+    assert flags.decided(0, ONLY_ANIMALS) is True
+    assert not flags.matches(7, ONLY_ANIMALS)
+
+
+@pytest.mark.parametrize("predicates, expected", [
+    (ONLY_ANIMALS, {0, 4}),
+    (ANY_HUMAN, {1, 2}),
+    (BLANK_ONLY, {3}),
+    (species("Cervus elaphus"), {4}),
+    ([ONLY_ANIMALS, species("Sus scrofa")], {0}),
+])
+def test_media_are_joined_with_observations(predicates, expected):
+    medias = _component().iter_by_predicate(33, predicates)
+
+    assert {m.mediaID for m in medias} == expected
+
+
+def test_only_animals_returns_media_list():
+    result = _component().get_by_classification_project_only_animals(33)
+
+    assert sorted(m.mediaID for m in result.results) == [0, 4]
+    assert result.pagination.count == 2
+
+
+def test_only_animals_contract():
+    # Observaciones del export de resultados, query solo para los media, orden del listado
+    calls = []
+    component = _component(calls=calls, order=[9, 4, 8, 0, 7])
+
+    result = component.get_by_classification_project_only_animals(
+        33, query={"deployment": 5}, observations_query={"scientificName": "x"})
+
+    assert [m.mediaID for m in result.results] == [4, 0]
+    media_query = next(q for kind, q in calls if kind == "media")
+    observations_query = next(q for kind, q in calls if kind == "observations")
+    assert media_query["deployment"] == 5
+    assert "deployment" not in observations_query
+    assert observations_query["scientificName"] == "x"
+
+
+def test_rows_without_media_id_are_skipped():
+    flags = MediaFlags([ONLY_ANIMALS])
+    flags.fold([{"mediaID": "", "observationType": "human"},
+                {"mediaID": "n/a", "observationType": "human"},
+                {"observationType": "human"}] + ROWS[:1])
+
+    assert flags.complete
+    assert len(flags) == 1
+    assert flags.matches(0)
+
+
+def test_failed_fold_is_not_complete():
+    def rows():
+        yield ROWS[0]
+        raise IOError("connection reset")
+
+    flags = MediaFlags([ONLY_ANIMALS])
+    with pytest.raises(IOError):
+        flags.fold(rows())
+
+    assert not flags.complete
+    with pytest.raises(IOError):
+        flags.decided(0)
+    with pytest.raises(IOError):
+        flags.matches(0)
+    with pytest.raises(IOError):
+        flags.wait(0)
+
+
+def test_cancelled_fold_is_not_complete():
+    flags = MediaFlags([ONLY_ANIMALS])
+    flags.cancel()
+    flags.fold(ROWS)
+
+    assert not flags.complete
+    with pytest.raises(RuntimeError):
+        flags.decided(0)
+
+
+def test_observation_errors_are_raised():
+    def rows():
+        yield ROWS[0]
+        raise IOError("connection reset")
+
+    with pytest.raises(IOError):
+        list(_component(rows()).iter_by_predicate(33, ONLY_ANIMALS))
@@ -0,0 +1,67 @@
+import logging
+
+from trapper_client.DownloadManifest import DownloadManifest
+from trapper_client.components.MediaComponent import MediaComponent
+from tests.helpers import PAGINATION, CONTENT, media_row, offline_client
+
+logger = logging.getLogger(__name__)
+
+#
+# pytest -o log_cli=true --log-cli-level=DEBUG
+#
+
+
+def _component(remote):
+    client = offline_client()
+    client.get_all_pages = lambda endpoint, query=None, raise_on_error=True, max_workers=None: {
+        "pagination": PAGINATION, "results": list(remote)
+    }
+    return MediaComponent(client)
+
+
+def test_sync_downloads_only_new_and_changed(tmp_path, server):
+    remote = [media_row(1), media_row(2)]
+    component = _component(remote)
+
+    folder, report = component.sync(33, tmp_path)
+    assert (folder / "dep_01" / "1.jpg").read_bytes() == CONTENT
+    assert len(server) == 2
+
+    server.clear()
+    remote.append(media_row(3))
+    remote[0] = {**media_row(1), "timestamp": "2025-02-01T00:00:00"}
+    _, report = component.sync(33, tmp_path)
+
+    assert len(server) == 2
+    assert report.is_success()
+    assert set(report.get_by_action("skip")["successes"]) == {"2"}
+
+
+def test_sync_restores_missing_files_and_renames(tmp_path, server):
+    remote = [media_row(1), media_row(2)]
+    component = _component(remote)
+    component.sync(33, tmp_path)
+
+    (tmp_path / "dep_01" / "2.jpg").unlink()
+    remote[0] = {**media_row(1), "fileName": "renamed.jpg"}
+    server.clear()
+    component.sync(33, tmp_path)
+
+    assert len(server) == 2
+    assert sorted(p.name for p in (tmp_path / "dep_01").iterdir()) == ["2.jpg", "renamed.jpg"]
+
+
+def test_sync_prune(tmp_path, server):
+    remote = [media_row(1), media_row(2)]
+    component = _component(remote)
+    component.sync(33, tmp_path)
+
+    del remote[1]
+    component.sync(33, tmp_path)
+    assert (tmp_path / "dep_01" / "2.jpg").exists()
+
+    _, report = component.sync(33, tmp_path, prune=True)
+
+    assert not (tmp_path / "dep_01" / "2.jpg").exists()
+    assert set(report.get_by_action("prune")["successes"]) == {"2"}
+    assert [e.mediaID for e in DownloadManifest(tmp_path)] == ["1"]
@@ -0,0 +1,124 @@
+import logging
+import threading
+
+import pytest
+
+from trapper_client.Mirror import ProjectMirror
+from trapper_client.TrapperClient import TrapperClient
+from tests.helpers import media_row
+
+logger = logging.getLogger(__name__)
+
+#
+# pytest -o log_cli=true --log-cli-level=DEBUG
+#
+
+
+def _observation(pk, media_id, species, count="1", day="2025-01-01"):
+    return {"observationID": str(pk), "mediaID": str(media_id), "deploymentID": "dep_01", "eventID": "e",
+            "eventStart": f"{day}T10:00:00+01:00", "observationType": "animal", "scientificName": species,
+            "count": count}
+
+
+class Server:
+    def __init__(self):
+        self.listings = {
+            "/geomap/api/deployments": [{"pk": 1, "deployment_id": "dep_01", "location": 10, "location_id": "L10"}],
+            "/geomap/api/locations": [{"pk": 10, "location_id": "L10", "coordinates": "37.1, -6.9"},
+                                      {"pk": 11, "location_id": "L11", "coordinates": "38.0, -5.0"}],
+            "/media_classification/api/project/33/collections": [{"pk": 5, "collection_pk": 50, "name": "c"}],
+            "/media_classification/api/media/33/": [media_row(i) for i in range(3)],
+        }
+        self.observations = [
+            _observation(1, 0, "Sus scrofa", "2"),
+            _observation(2, 1, "Sus scrofa"),
+            _observation(3, 2, "Cervus elaphus", day="2025-01-02"),
+        ]
+        self.requests = 0
+
+    def get(self, endpoint, query=None, raise_on_error=True):
+        self.requests += 1
+        rows = self.listings[endpoint]
+        return {"pagination": {"page": 1, "page_size": 50, "pages": 1, "count": len(rows)}, "results": list(rows)}
+
+    def stream_csv(self, endpoint, query=None):
+        self.requests += 1
+        return iter(list(self.observations))
+
+
+@pytest.fixture
+def trapper_client():
+    server = Server()
+    client = TrapperClient(access_token="token", base_url="http://localhost")
+    client.raw.get = server.get
+    client.raw.stream_csv = server.stream_csv
+    client.server = server
+    return client
+
+
+def test_mirror_is_materialized_and_queried(tmp_path, trapper_client):
+    mirror = trapper_client.mirror(33, tmp_path / "p33.sqlite")
+
+    assert mirror.query("SELECT pk, latitude FROM locations") == [{"pk": 10, "latitude": 37.1}]
+    assert mirror.species_per_deployment() == [
+        {"deployment_id": "dep_01", "scientific_name": "Cervus elaphus", "observations": 1, "individuals": 1},
+        {"deployment_id": "dep_01", "scientific_name": "Sus scrofa", "observations": 2, "individuals": 3},
+    ]
+    assert mirror.counts_per_day("Sus scrofa") == [{"day": "2025-01-01", "observations": 2, "individuals": 3}]
+    assert [m["mediaID"] for m in mirror.media(deployment_id="dep_01")] == [0, 1, 2]
+
+
+def test_refresh_is_incremental(tmp_path, trapper_client):
+    mirror = trapper_client.mirror(33, tmp_path / "p33.sqlite")
+    server = trapper_client.server
+    server.observations[1] = _observation(2, 1, "Vulpes vulpes")
+    del server.observations[2]
+
+    result = mirror.refresh(tables=["observations"])["observations"]
+
+    assert (result.inserted, result.updated, result.deleted) == (0, 1, 1)
+    assert mirror.query("SELECT COUNT(*) AS n FROM observations") == [{"n": 2}]
+
+    requests = server.requests
+    assert all(r.skipped for r in mirror.refresh(max_age=3600).values())
+    assert server.requests == requests
+
+
+def test_mirror_belongs_to_one_project(tmp_path, trapper_client):
+    trapper_client.mirror(33, tmp_path / "p33.sqlite").close()
+
+    with pytest.raises(ValueError):
+        ProjectMirror(trapper_client.raw, 34, tmp_path / "p33.sqlite").query("SELECT 1")
+
+
+def test_queries_are_not_blocked_by_a_refresh(tmp_path, trapper_client):
+    mirror = trapper_client.mirror(33, tmp_path / "p33.sqlite")
+    answers = []
+
+    def rows():
+        yield _observation(1, 0, "Sus scrofa", "2")
+        reader = threading.Thread(target=lambda: answers.append(mirror.query("SELECT COUNT(*) AS n FROM observations")))
+        reader.start()
+        reader.join(5)
+        yield _observation(4, 0, "Sus scrofa")
+
+    trapper_client.raw.stream_csv = lambda endpoint, query=None: rows()
+    result = mirror.refresh(tables=["observations"])["observations"]
+
+    # La consulta responde durante la descarga, con el contenido anterior
+    assert answers == [[{"n": 3}]]
+    assert (result.inserted, result.updated, result.deleted) == (1, 0, 2)
+
+
+def test_interrupted_refresh_keeps_previous_content(tmp_path, trapper_client):
+    mirror = trapper_client.mirror(33, tmp_path / "p33.sqlite")
+
+    def rows():
+        yield _observation(1, 0, "Vulpes vulpes")
+        raise IOError("connection reset")
+
+    trapper_client.raw.stream_csv = lambda endpoint, query=None: rows()
+    with pytest.raises(IOError):
+        mirror.refresh(tables=["observations"])
+
+    assert mirror.query("SELECT COUNT(*) AS n FROM observations WHERE scientific_name = 'Sus scrofa'") == [{"n": 2}]
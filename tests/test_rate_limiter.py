@@ -0,0 +1,85 @@
+import logging
+
+import pytest
+
+from trapper_client.APIClientBase import APIClientBase
+from trapper_client.RateLimiter import TokenBucket, RateLimiter, API, MEDIA
+
+logger = logging.getLogger(__name__)
+
+#
+# pytest -o log_cli=true --log-cli-level=DEBUG
+#
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr("trapper_client.RateLimiter.time.monotonic", fake)
+    return fake
+
+
+def test_bucket_allows_burst_then_waits(clock):
+    bucket = TokenBucket(rate=2, capacity=2)
+
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == pytest.approx(0.5)
+    assert bucket.reserve() == pytest.approx(1.0)
+
+    clock.now = 10
+    assert bucket.reserve() == 0
+
+
+def test_bucket_rejects_non_positive_rate():
+    with pytest.raises(ValueError):
+        TokenBucket(rate=0)
+
+
+def test_unlimited_kind_has_no_bucket():
+    limiter = RateLimiter(api_rate=5)
+
+    assert limiter.bucket("http://localhost/api", MEDIA) is None
+    assert limiter.reserve("http://localhost/media.jpg", MEDIA) == 0
+
+
+def test_api_and_media_have_separate_budgets(clock):
+    limiter = RateLimiter(api_rate=1, media_rate=1)
+
+    assert limiter.reserve("http://localhost/api", API) == 0
+    assert limiter.reserve("http://localhost/media.jpg", MEDIA) == 0
+    assert limiter.reserve("http://localhost/api", API) == pytest.approx(1.0)
+
+
+def test_buckets_are_per_host(clock):
+    limiter = RateLimiter(api_rate=1)
+
+    assert limiter.reserve("http://a.example/api", API) == 0
+    assert limiter.reserve("http://b.example/api", API) == 0
+    assert limiter.bucket("http://a.example/x") is limiter.bucket("http://a.example/y")
+
+
+def test_client_waits_for_limiter(monkeypatch):
+    delays = []
+    monkeypatch.setattr("trapper_client.RateLimiter.time.sleep", delays.append)
+
+    class Session:
+        def request(self, method, url, **kwargs):
+            raise RuntimeError("sent")
+
+    client = APIClientBase(access_token="token", user_name=None, user_password=None,
+                           base_url="http://localhost", rate_limiter=RateLimiter(api_rate=1, api_burst=1))
+    client._session = Session()
+
+    for _ in range(2):
+        with pytest.raises(RuntimeError):
+            client._send("GET", "http://localhost/endpoint")
+    assert len(delays) == 1
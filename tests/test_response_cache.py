@@ -0,0 +1,164 @@
+import json
+import logging
+
+import pytest
+import requests
+
+from trapper_client.ResponseCache import ResponseCache
+from tests.helpers import offline_client
+
+logger = logging.getLogger(__name__)
+
+#
+# pytest -o log_cli=true --log-cli-level=DEBUG
+#
+
+ENDPOINT = "/media_classification/api/classificators"
+PAGE = {"pagination": {"page": 1, "page_size": 1, "pages": 1, "count": 1}, "results": [{"pk": 1}]}
+
+
+class FakeTime:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeTime()
+    monkeypatch.setattr("trapper_client.ResponseCache.time.time", fake)
+    return fake
+
+
+class CountingSession:
+    def __init__(self, etag=None, not_modified=False):
+        self.etag = etag
+        self.not_modified = not_modified
+        self.requests = []
+
+    def request(self, method, url, **kwargs):
+        self.requests.append((method, url, kwargs))
+        r = requests.Response()
+        if self.not_modified and "If-None-Match" in kwargs["headers"]:
+            r.status_code = 304
+            r._content = b""
+        else:
+            r.status_code = 200
+            r.headers["Content-Type"] = "application/json"
+            r._content = json.dumps(PAGE).encode()
+        if self.etag:
+            r.headers["ETag"] = self.etag
+        return r
+
+
+def _cached_client(session, **kwargs):
+    client = offline_client(cache=ResponseCache(":memory:", **kwargs))
+    client._session = session
+    return client
+
+
+def test_fresh_pages_are_served_from_cache(clock):
+    session = CountingSession()
+    client = _cached_client(session)
+
+    assert client.get(ENDPOINT) == PAGE
+    assert client.get(ENDPOINT) == PAGE
+    assert len(session.requests) == 1
+
+
+def test_expired_pages_are_revalidated(clock):
+    session = CountingSession(etag='"v1"', not_modified=True)
+    client = _cached_client(session)
+    client.get(ENDPOINT)
+
+    clock.now += 3601
+    assert client.get(ENDPOINT) == PAGE
+
+    assert len(session.requests) == 2
+    assert session.requests[1][2]["headers"]["If-None-Match"] == '"v1"'
+    assert session.requests[1][2]["headers"]["Authorization"] == "Token token"
+    # The 304 renewed the TTL
+    client.get(ENDPOINT)
+    assert len(session.requests) == 2
+
+
+def test_uncached_endpoints_and_bypass(clock):
+    session = CountingSession()
+    client = _cached_client(session)
+
+    client.get("/media_classification/api/media/1/")
+    client.get("/media_classification/api/media/1/")
+    client.get(ENDPOINT)
+    client.get(ENDPOINT, use_cache=False)
+    with client.cache.bypassed():
+        client.get(ENDPOINT)
+
+    assert len(session.requests) == 5
+
+
+def test_keys_depend_on_user_and_query():
+    cache = ResponseCache(":memory:")
+
+    assert cache.key("a", "http://x/e", {"page": 1}) != cache.key("b", "http://x/e", {"page": 1})
+    assert cache.key("a", "http://x/e", {"page": 1}) != cache.key("a", "http://x/e", {"page": 2})
+    assert cache.key("a", "http://x/e", {"page": 1, "q": 2}) == cache.key("a", "http://x/e", {"q": 2, "page": 1})
+
+
+def test_ttl_patterns():
+    cache = ResponseCache(":memory:", ttls={"geomap/api/deployments*": 60}, default_ttl=5)
+
+    assert cache.ttl("/geomap/api/deployments/") == 60
+    assert cache.ttl("/geomap/api/locations") == 5
+
+
+def test_lru_eviction(clock):
+    cache = ResponseCache(":memory:")
+    cache.store("a", "e/a", PAGE, ttl=60)
+    cache.max_size = cache.connection.execute("SELECT size FROM responses").fetchone()[0]
+    clock.now += 1
+    cache.store("b", "e/b", PAGE, ttl=60)
+
+    rows = cache.connection.execute("SELECT key FROM responses").fetchall()
+
+    assert rows == [("b",)]
+
+
+def test_writes_invalidate_endpoint(clock):
+    session = CountingSession()
+    client = _cached_client(session)
+    client.get(ENDPOINT)
+
+    client.post(ENDPOINT, body={"name": "new"})
+    client.get(ENDPOINT)
+
+    assert [m for m, _, _ in session.requests] == ["GET", "POST", "GET"]
+
+
+def test_writes_invalidate_resource_collection(clock):
+    session = CountingSession()
+    client = _cached_client(session)
+    client.get(ENDPOINT)
+    client.get(ENDPOINT + "/5/")
+    client.get("/research/api/projects")
+
+    client.patch(ENDPOINT + "/5/", body={"name": "renamed"})
+    client.get(ENDPOINT)
+    client.get(ENDPOINT + "/5/")
+    client.get("/research/api/projects")
+
+    assert [m for m, _, _ in session.requests] == ["GET", "GET", "GET", "PATCH", "GET", "GET"]
+
+
+def test_overlapping_bypass_blocks(clock):
+    cache = ResponseCache(":memory:")
+    outer = cache.bypassed()
+    inner = cache.bypassed()
+
+    outer.__enter__()
+    inner.__enter__()
+    outer.__exit__(None, None, None)
+    assert cache.slot("u", "http://x/e", ENDPOINT).page is None
+    inner.__exit__(None, None, None)
+    assert cache._bypassing == 0
@@ -0,0 +1,106 @@
+import logging
+
+import pytest
+import requests
+
+from trapper_client import err
+from trapper_client.APIClientBase import APIClientBase
+from trapper_client.RetryPolicy import RetryPolicy
+
+logger = logging.getLogger(__name__)
+
+#
+# pytest -o log_cli=true --log-cli-level=DEBUG
+#
+
+class FakeResponse:
+    def __init__(self, status_code, headers=None, payload=None):
+        self.status_code = status_code
+        self.headers = {"Content-Type": "application/json", **(headers or {})}
+        self.url = "http://localhost/endpoint"
+        self.text = "{}"
+        self._payload = payload or {}
+
+    def json(self):
+        return self._payload
+
+    def close(self):
+        pass
+
+
+class FakeSession:
+    def __init__(self, outcomes):
+        self.outcomes = list(outcomes)
+        self.calls = 0
+
+    def request(self, method, url, **kwargs):
+        self.calls += 1
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+
+@pytest.fixture
+def no_sleep(monkeypatch):
+    delays = []
+    monkeypatch.setattr("trapper_client.APIClientBase.time.sleep", delays.append)
+    return delays
+
+
+def _client(outcomes, **kwargs):
+    client = APIClientBase(access_token="token", user_name=None, user_password=None,
+                           base_url="http://localhost", **kwargs)
+    client._session = FakeSession(outcomes)
+    return client
+
+
+def test_parse_retry_after():
+    assert RetryPolicy.parse_retry_after("12") == 12
+    assert RetryPolicy.parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0
+    assert RetryPolicy.parse_retry_after("soon") is None
+    assert RetryPolicy.parse_retry_after(None) is None
+
+
+def test_backoff_is_bounded():
+    policy = RetryPolicy(backoff_factor=1, max_backoff=5, jitter=0.5)
+    for attempt in range(1, 10):
+        delay = policy.backoff(attempt)
+        assert 0 <= delay <= 5
+
+
+def test_non_idempotent_methods_are_not_retried():
+    policy = RetryPolicy()
+    assert policy.next_delay("POST", 1, status_code=503) is None
+    assert policy.next_delay("GET", 1, status_code=503) is not None
+    assert policy.next_delay("GET", 1, status_code=404) is None
+    assert policy.next_delay("GET", 4, status_code=503) is None
+
+
+def test_retry_on_transient_status(no_sleep):
+    ok = FakeResponse(200, payload={"pagination": {"page": 1, "page_size": 0, "pages": 1, "count": 0},
+                                    "results": []})
+    client = _client([FakeResponse(503), FakeResponse(429, {"Retry-After": "2"}), ok])
+
+    r = client.make_request("/endpoint", "GET")
+
+    assert r.retries == 2
+    assert no_sleep[1] == 2
+    assert client.retry_stats.retries == 2
+    assert client.retry_stats.by_reason == {"503": 1, "429": 1}
+
+
+def test_retry_on_connection_error(no_sleep):
+    ok = FakeResponse(200, payload={"pk": 1})
+    client = _client([requests.exceptions.ConnectionError("reset"), ok])
+
+    assert client.get("/endpoint")["results"] == [{"pk": 1}]
+    assert client.retry_stats.by_reason == {"ConnectionError": 1}
+
+
+def test_retries_exhausted_raise_api_error(no_sleep):
+    client = _client([FakeResponse(502)] * 3, retry_policy=RetryPolicy(max_retries=2))
+
+    with pytest.raises(err.APIError):
+        client.make_request("/endpoint", "GET")
+    assert client._session.calls == 3
@@ -0,0 +1,44 @@
+import logging
+from typing import List, Union
+
+import pytest
+from pydantic import TypeAdapter
+
+from trapper_client import Schemas
+from tests.helpers import HUMAN_ROW, OBSERVATION_ROW, PAGINATION, RESULT_ROWS
+
+logger = logging.getLogger(__name__)
+
+#
+# pytest -o log_cli=true --log-cli-level=DEBUG
+#
+
+PLAIN_UNION = TypeAdapter(List[Union[
+    Schemas.TrapperObservationResultsCTDP,
+    Schemas.TrapperObservationResultsTrapper,
+    Schemas.TrapperAIObservationResultsTrapper,
+    Schemas.TrapperAIObservationResultsCTDP,
+]])
+
+
+@pytest.mark.parametrize("row, model", RESULT_ROWS)
+def test_results_rows_pick_one_model(row, model):
+    parsed = Schemas.TrapperClassificationResultsList(pagination=PAGINATION, results=[row]).results[0]
+
+    assert type(parsed) is model
+    assert type(PLAIN_UNION.validate_python([row])[0]) is model
+
+
+def test_results_accept_model_instances():
+    parsed = Schemas.TrapperClassificationResultsList(pagination=PAGINATION, results=[r for r, _ in RESULT_ROWS])
+
+    again = Schemas.TrapperClassificationResultsList(pagination=PAGINATION, results=parsed.results)
+
+    assert [type(r) for r in again.results] == [m for _, m in RESULT_ROWS]
+
+
+def test_classification_rows_pick_one_model():
+    parsed = Schemas.TrapperClassificationList(pagination=PAGINATION, results=[HUMAN_ROW, OBSERVATION_ROW]).results
+
+    assert type(parsed[0]) is Schemas.TrapperObservationResults
+    assert type(parsed[1]) is Schemas.TrapperAIObservationResults
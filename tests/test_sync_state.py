@@ -0,0 +1,66 @@
+import logging
+from datetime import datetime, timezone
+
+from trapper_client.SyncState import SyncStore
+from trapper_client.components.ObservationsComponent import AIObservationsComponent, ObservationsComponent
+from tests.helpers import offline_client
+
+logger = logging.getLogger(__name__)
+
+#
+# pytest -o log_cli=true --log-cli-level=DEBUG
+#
+
+
+def _row(pk, updated_at, species="Sus scrofa"):
+    return {"pk": pk, "updated_at": updated_at, "static_attrs": {"species": species}}
+
+
+def _server(rows):
+    client = offline_client()
+    client.calls = []
+
+    def get(endpoint, query=None, raise_on_error=True):
+        client.calls.append(dict(query))
+        return {"pagination": {"page": 1, "page_size": 50, "pages": 1, "count": len(rows)}, "results": list(rows)}
+
+    client.get = get
+    return client
+
+
+def test_changes_are_merged_and_watermark_advances(tmp_path):
+    rows = [_row(1, "2025-01-01T10:00:00Z"), _row(2, "2025-01-02T10:00:00Z"), _row(3, "2025-01-03T10:00:00")]
+    client = _server(rows)
+    store = SyncStore(tmp_path / "sync.sqlite")
+    component = ObservationsComponent(client)
+
+    result = component.sync(33, store=store)
+
+    assert (result.fetched, result.inserted, result.updated) == (3, 3, 0)
+    assert result.watermark == datetime(2025, 1, 3, 10, tzinfo=timezone.utc)
+    assert client.calls[0]["project"] == 33
+
+    rows[1] = _row(2, "2025-01-04T10:00:00Z", "Cervus elaphus")
+    result = component.sync(33, store=store, since_param="updated_after")
+
+    assert (result.inserted, result.updated, result.unchanged) == (0, 1, 2)
+    assert client.calls[-1]["updated_after"] == "2025-01-03T10:00:00+00:00"
+    assert store.watermark(result.scope) == datetime(2025, 1, 4, 10, tzinfo=timezone.utc)
+    stored = {r["pk"]: r["static_attrs"]["species"] for r in store.records(result.scope)}
+    assert stored == {1: "Sus scrofa", 2: "Cervus elaphus", 3: "Sus scrofa"}
+
+
+def test_scopes_are_kept_apart(tmp_path):
+    client = _server([_row(1, "2025-01-01T10:00:00Z")])
+    store = SyncStore(tmp_path / "sync.sqlite")
+
+    first = ObservationsComponent(client).sync(33, store=store)
+    other = AIObservationsComponent(client).sync(33, store=store)
+    filtered = ObservationsComponent(client).sync(33, store=store, query={"deployment": 5})
+
+    assert len({first.scope, other.scope, filtered.scope}) == 3
+    assert other.inserted == filtered.inserted == 1
+
+    store.reset(first.scope)
+    assert store.count(first.scope) == 0
+    assert store.watermark(first.scope) is None
@@ -0,0 +1,59 @@
+import logging
+from datetime import datetime
+
+import pytest
+
+from trapper_client import Schemas
+from trapper_client.Validation import build_page, results_builder
+from tests.helpers import PAGINATION, RESULT_ROWS, media_row
+
+logger = logging.getLogger(__name__)
+
+#
+# pytest -o log_cli=true --log-cli-level=DEBUG
+#
+
+
+def _page(rows):
+    return {"pagination": PAGINATION, "results": rows}
+
+
+@pytest.mark.parametrize("mode", ["light", "none"])
+def test_fast_modes_build_schema_instances(mode):
+    page = build_page(Schemas.TrapperMediaList, _page([media_row(1), media_row(2)]), mode)
+
+    assert isinstance(page, Schemas.TrapperMediaList)
+    assert isinstance(page.pagination, Schemas.Pagination)
+    assert [type(m) for m in page.results] == [Schemas.TrapperMedia] * 2
+    assert page.results[0].mediaID == 1
+
+
+def test_light_mode_coerces_scalars():
+    media = {**media_row(1), "mediaID": "1", "filePublic": "True", "exifData": ""}
+
+    item = results_builder(Schemas.TrapperMediaList, "light")([media])[0]
+
+    assert item.mediaID == 1
+    assert item.filePublic is True
+    assert item.timestamp == datetime(2025, 1, 1)
+    assert item.exifData is None
+
+
+def test_none_mode_keeps_raw_values():
+    item = results_builder(Schemas.TrapperMediaList, "none")([{**media_row(1), "mediaID": "1"}])[0]
+
+    assert item.mediaID == "1"
+
+
+@pytest.mark.parametrize("row, model", RESULT_ROWS)
+def test_light_mode_uses_discriminator(row, model):
+    item = results_builder(Schemas.TrapperClassificationResultsList, "light")([row])[0]
+
+    assert type(item) is model
+    assert item.mediaID == 7
+    assert item.eventStart == datetime(2025, 1, 1)
+
+
+def test_unknown_mode_is_rejected():
+    with pytest.raises(ValueError):
+        results_builder(Schemas.TrapperMediaList, "quick")
@@ -0,0 +1,91 @@
+import logging
+import threading
+import zipfile
+
+import pytest
+
+from trapper_client.Schemas import TrapperMedia
+from trapper_client.ZipSink import ZipSink
+from trapper_client.components.MediaComponent import MediaComponent
+from tests.helpers import CONTENT, media_row, offline_client
+
+logger = logging.getLogger(__name__)
+
+#
+# pytest -o log_cli=true --log-cli-level=DEBUG
+#
+
+
+def _entries(path):
+    with zipfile.ZipFile(path) as zf:
+        assert zf.testzip() is None
+        return {i.filename: (i.compress_type, i.file_size) for i in zf.infolist()}
+
+
+def test_compression_by_extension(tmp_path):
+    with ZipSink(tmp_path / "media") as sink:
+        sink.write("a/1.jpg", [b"x" * 1000])
+        sink.write("a/notes.txt", [b"y" * 1000])
+
+    assert sink.volumes == [tmp_path / "media.zip"]
+    assert _entries(sink.volumes[0]) == {
+        "a/1.jpg": (zipfile.ZIP_STORED, 1000),
+        "a/notes.txt": (zipfile.ZIP_DEFLATED, 1000),
+    }
+
+
+def test_volumes_are_split_by_size(tmp_path):
+    with ZipSink(tmp_path / "media", max_volume_size=2500) as sink:
+        for i in range(5):
+            sink.write(f"{i}.jpg", [b"z" * 1000])
+
+    assert [v.name for v in sink.volumes] == ["media_001.zip", "media_002.zip", "media_003.zip"]
+    assert [len(_entries(v)) for v in sink.volumes] == [2, 2, 1]
+
+
+def test_failed_entry_is_discarded(tmp_path):
+    def broken():
+        yield b"partial"
+        raise IOError("connection reset")
+
+    with ZipSink(tmp_path / "media") as sink:
+        sink.write("1.jpg", [b"ok"])
+        with pytest.raises(IOError):
+            sink.write("2.jpg", broken())
+        sink.write("3.jpg", [b"ok"])
+
+    assert sorted(_entries(sink.volumes[0])) == ["1.jpg", "3.jpg"]
+
+
+def test_concurrent_writers_are_spooled(tmp_path):
+    sink = ZipSink(tmp_path / "media", spool_size=10)
+    first_started, release = threading.Event(), threading.Event()
+
+    def slow():
+        first_started.set()
+        release.wait(5)
+        yield b"a" * 100
+
+    thread = threading.Thread(target=sink.write, args=("slow.jpg", slow()))
+    thread.start()
+    first_started.wait(5)
+    waiting = threading.Thread(target=sink.write, args=("fast.jpg", [b"b" * 100]))
+    waiting.start()
+    release.set()
+    thread.join()
+    waiting.join()
+    sink.close()
+
+    assert _entries(sink.volumes[0]) == {"slow.jpg": (0, 100), "fast.jpg": (0, 100)}
+
+
+def test_download_many_streams_into_archive(tmp_path, server):
+    medias = [TrapperMedia(**media_row(i)) for i in range(3)]
+
+    archive, report = MediaComponent(offline_client()).download_many(None, medias, tmp_path, compress=True)
+
+    assert report.is_success()
+    assert [p.suffix for p in tmp_path.iterdir()] == [".zip"]
+    entries = _entries(archive)
+    assert sorted(entries) == [f"{archive.stem}/{i}.jpg" for i in range(3)]
+    assert {size for _, size in entries.values()} == {len(CONTENT)}
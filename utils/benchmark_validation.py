@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Benchmark of the validation modes used to build schema instances from API payloads.
+
+Builds synthetic pages of media and classification results rows (as they arrive from
+the JSON and CSV endpoints) and times the "full", "light" and "none" modes.
+
+Usage examples:
+  uv run python utils/benchmark_validation.py
+  uv run python utils/benchmark_validation.py --rows 20000 --repeat 5
+"""
+
+import argparse
+import timeit
+
+from trapper_client import Schemas
+from trapper_client.Validation import VALIDATION_MODES, build_page
+
+
+def media_row(i: int) -> dict:
+    return {
+        "mediaID": i, "deploymentID": f"dep_{i % 50}", "captureMethod": "activityDetection",
+        "timestamp": "2025-01-01T00:00:00", "filePath": f"https://trapper.example.org/media/{i}.jpg",
+        "filePublic": True, "fileName": f"{i}.jpg", "fileMediatype": "image/jpeg", "favorite": False,
+    }
+
+
+def results_row(i: int) -> dict:
+    # Trapper format (camtrapdp=False), as parsed from the CSV export: every value is a string
+    return {
+        "observationID": str(i), "deploymentID": f"dep_{i % 50}", "mediaID": str(i), "eventID": f"ev_{i}",
+        "eventStart": "2025-01-01T00:00:00", "eventEnd": "2025-01-01T00:00:10", "observationLevel": "media",
+        "observationType": "animal", "cameraSetupType": "", "scientificName": "Vulpes vulpes", "count": "1",
+        "lifeStage": "", "sex": "", "behavior": "", "individualID": "", "individualPositionRadius": "",
+        "individualPositionAngle": "", "individualSpeed": "", "classificationMethod": "human",
+        "classifiedBy": "user", "classificationTimestamp": "2025-01-02T00:00:00",
+        "classificationProbability": "0.95", "observationTags": "", "observationComments": "",
+        "_id": f"id_{i}", "countNew": "", "englishName": "Red fox", "bboxes": "[[0.1, 0.2, 0.3, 0.4]]",
+    }
+
+
+def page(rows: list) -> dict:
+    return {"pagination": {"page": 1, "page_size": len(rows), "pages": 1, "count": len(rows)}, "results": rows}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the validation modes")
+    parser.add_argument("--rows", type=int, default=10000, help="Rows per page")
+    parser.add_argument("--repeat", type=int, default=3, help="Repetitions (best time is reported)")
+    args = parser.parse_args()
+
+    cases = [
+        ("TrapperMediaList", Schemas.TrapperMediaList, page([media_row(i) for i in range(args.rows)])),
+        ("TrapperClassificationResultsList", Schemas.TrapperClassificationResultsList,
+         page([results_row(i) for i in range(args.rows)])),
+    ]
+
+    for name, schema, data in cases:
+        print(f"\n{name} ({args.rows} rows)")
+        baseline = None
+        for mode in VALIDATION_MODES:
+            build_page(schema, data, mode)  # warm up caches
+            best = min(timeit.repeat(lambda: build_page(schema, data, mode), number=1, repeat=args.repeat))
+            baseline = baseline or best
+            print(f"  {mode:<6} {best * 1000:9.1f} ms  {baseline / best:5.1f}x")
+
+
+if __name__ == "__main__":
+    main()